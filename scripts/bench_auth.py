@@ -0,0 +1,67 @@
+"""
+Per-request cost of verify_admin_token with and without the verified-token cache.
+
+Reports the median and p99 time of one verification for a cache hit, a cache
+miss (full JWT_BACKEND verification) and a rejected token, cached and uncached.
+
+Usage:
+    PYTHONPATH=src:. uv run python scripts/bench_auth.py
+    PYTHONPATH=src:. uv run python scripts/bench_auth.py --iterations 20000
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable
+
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from tests.conftest import make_token  # noqa: E402  (sets test env vars)
+
+from shared import auth  # noqa: E402
+
+
+def _verify(token: str) -> None:
+    try:
+        auth.verify_admin_token(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token))
+    except HTTPException:
+        pass
+
+
+def _time(fn: Callable[[], None], iterations: int, before: Callable[[], None] | None = None) -> list[float]:
+    samples: list[float] = []
+    for _ in range(iterations):
+        if before:
+            before()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    token = make_token()
+    bad = make_token(email="someone@else.com")
+    cases = {
+        "jwt miss":        (lambda: _verify(token), auth.clear_token_cache),
+        "jwt hit":         (lambda: _verify(token), None),
+        "rejected miss":   (lambda: _verify(bad), auth.clear_token_cache),
+        "rejected hit":    (lambda: _verify(bad), None),
+    }
+
+    _verify(token)  # warm-up: imports python-jose
+    print(f"{'case':<16}{'median µs':>12}{'p99 µs':>12}")
+    for name, (fn, before) in cases.items():
+        samples = sorted(_time(fn, args.iterations, before))
+        median = statistics.median(samples) * 1e6
+        p99 = samples[int(len(samples) * 0.99) - 1] * 1e6
+        print(f"{name:<16}{median:>12.1f}{p99:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Per-request latency: fresh boto3 resource per call vs. the pooled shared.aws client.
+
+Runs against moto in-process by default, or against DynamoDB Local when an
+endpoint is given (start it with `docker compose up -d` and create the tables
+first — see tests/test_integration.py).
+
+Usage:
+    PYTHONPATH=src:. uv run python scripts/bench_clients.py
+    PYTHONPATH=src:. uv run python scripts/bench_clients.py --endpoint http://localhost:8002
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import time
+
+os.environ.setdefault("ENV", "test")
+
+from tests.conftest import create_aws_resources  # noqa: E402  (sets test env vars)
+
+
+def _percentiles(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000, 3),
+        "p99_ms": round(ordered[int(len(ordered) * 0.99) - 1] * 1000, 3),
+    }
+
+
+def _bench(get_table, iterations: int) -> dict:
+    key = {"PK": "BENCH#item", "SK": "METADATA"}
+    get_table().put_item(Item={**key, "title": "bench"})
+    samples: list[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        get_table().get_item(Key=key)
+        samples.append(time.perf_counter() - start)
+    return _percentiles(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--endpoint", help="DynamoDB Local URL; moto is used when omitted")
+    args = parser.parse_args()
+
+    if args.endpoint:
+        os.environ["ENV"] = "local"
+        os.environ["DYNAMODB_ENDPOINT"] = args.endpoint
+        mock = contextlib.nullcontext()
+    else:
+        from moto import mock_aws  # noqa: PLC0415
+
+        mock = mock_aws()
+
+    import boto3  # noqa: PLC0415
+
+    from shared import aws, db  # noqa: PLC0415
+    from shared.config import AWS_REGION, BLOG_TABLE, DYNAMODB_KWARGS  # noqa: PLC0415
+
+    def fresh_table():
+        # The pre-registry behaviour: a new resource (and connection pool) per call.
+        return boto3.resource("dynamodb", region_name=AWS_REGION, **DYNAMODB_KWARGS).Table(BLOG_TABLE)
+
+    with mock:
+        if not args.endpoint:
+            create_aws_resources()
+        aws.reset_clients()
+        results = {
+            "backend": args.endpoint or "moto",
+            "iterations": args.iterations,
+            "fresh_resource_per_call": _bench(fresh_table, args.iterations),
+            "pooled_client": _bench(db.get_blog_table, args.iterations),
+        }
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Cold-start benchmark for the admin Lambda entry point (admin.handler.handler).
+
+Every run starts a fresh interpreter and measures, in that interpreter:
+  import_ms      import of admin.handler (FastAPI app, routers and their deps)
+  first_ms       first invocation through Mangum with a synthetic API Gateway
+                 HTTP API (payload v2) event — includes lazily created clients
+  steady_ms      median of the following warm invocations
+
+The route is /health by default; pass --path/--method/--body to exercise an
+authenticated route (an admin JWT is attached automatically). AWS calls are
+not mocked, so pick a route that stays local, e.g. POST /api/upload-url,
+which only presigns a URL.
+
+Results are emitted as JSON tagged with the git commit, so runs can be saved
+and compared across commits:
+
+    PYTHONPATH=src uv run python scripts/bench_cold_start.py --output before.json
+    git checkout <other> && PYTHONPATH=src uv run python scripts/bench_cold_start.py --compare before.json
+
+    PYTHONPATH=src uv run python scripts/bench_cold_start.py --method POST --path /api/upload-url \\
+        --body '{"filename":"a.jpg","content_type":"image/jpeg","entity_type":"blog","entity_slug":"x"}'
+"""
+
+import argparse
+import base64
+import hashlib
+import hmac
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_CHILD_ENV = {
+    "ENV": "test",
+    "AWS_ACCESS_KEY_ID": "testing",
+    "AWS_SECRET_ACCESS_KEY": "testing",
+    "AWS_REGION": "us-west-2",
+    "ADMIN_EMAIL": "admin@example.com",
+    "NEXTAUTH_SECRET": "bench-secret-32-chars-exactly-ok",
+    "RATE_LIMIT_RATE": "0",   # --warm may exceed the default burst
+}
+
+# Runs in the fresh interpreter. Reads the request from BENCH_* env vars and
+# prints one JSON object.
+_CHILD = r"""
+import json, os, statistics, time
+
+t0 = time.perf_counter()
+import admin.handler
+import_s = time.perf_counter() - t0
+
+class _Context:
+    function_name = "bench"
+    aws_request_id = "bench"
+
+def _event():
+    method, path, body = os.environ["BENCH_METHOD"], os.environ["BENCH_PATH"], os.environ["BENCH_BODY"]
+    headers = {"host": "bench.example.com", "content-type": "application/json"}
+    if os.environ.get("BENCH_TOKEN"):
+        headers["authorization"] = "Bearer " + os.environ["BENCH_TOKEN"]
+    return {
+        "version": "2.0",
+        "routeKey": "$default",
+        "rawPath": path,
+        "rawQueryString": "",
+        "headers": headers,
+        "requestContext": {
+            "accountId": "123456789012",
+            "apiId": "bench",
+            "domainName": "bench.example.com",
+            "domainPrefix": "bench",
+            "http": {"method": method, "path": path, "protocol": "HTTP/1.1",
+                     "sourceIp": "127.0.0.1", "userAgent": "bench"},
+            "requestId": "bench",
+            "routeKey": "$default",
+            "stage": "$default",
+            "time": "01/Jan/2026:00:00:00 +0000",
+            "timeEpoch": 0,
+        },
+        "body": body or None,
+        "isBase64Encoded": False,
+    }
+
+def _invoke():
+    start = time.perf_counter()
+    response = admin.handler.handler(_event(), _Context())
+    return time.perf_counter() - start, response["statusCode"]
+
+first_s, status = _invoke()
+steady = [_invoke()[0] for _ in range(int(os.environ["BENCH_WARM"]))]
+print(json.dumps({
+    "import_ms": import_s * 1000,
+    "first_ms": first_s * 1000,
+    "steady_ms": statistics.median(steady) * 1000 if steady else None,
+    "status": status,
+}))
+"""
+
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _admin_token(email: str, secret: str) -> str:
+    """HS256 JWT built with the stdlib, so the parent never imports a JOSE library."""
+    header = _b64url(json.dumps({"alg": "HS256", "typ": "JWT"}).encode())
+    payload = _b64url(json.dumps({"email": email, "exp": int(time.time()) + 3600}).encode())
+    signing_input = f"{header}.{payload}".encode()
+    signature = hmac.new(secret.encode(), signing_input, hashlib.sha256).digest()
+    return f"{header}.{payload}.{_b64url(signature)}"
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _run_once(env: dict) -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-c", _CHILD], env=env, capture_output=True, text=True, check=False
+    )
+    if proc.returncode != 0:
+        raise SystemExit(f"benchmark child failed:\n{proc.stderr}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def _summarize(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "median": round(statistics.median(ordered), 2),
+        "min": round(ordered[0], 2),
+        "max": round(ordered[-1], 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10, help="fresh interpreters to start")
+    parser.add_argument("--warm", type=int, default=20, help="warm invocations per run")
+    parser.add_argument("--method", default="GET")
+    parser.add_argument("--path", default="/health")
+    parser.add_argument("--body", default="")
+    parser.add_argument("--output", help="also write the JSON result to this file")
+    parser.add_argument("--compare", help="JSON result of a previous run to diff against")
+    args = parser.parse_args()
+
+    env = {**_CHILD_ENV, **os.environ}
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT / "src"), os.environ.get("PYTHONPATH")]))
+    env.update(BENCH_METHOD=args.method, BENCH_PATH=args.path, BENCH_BODY=args.body, BENCH_WARM=str(args.warm))
+    if args.path != "/health":
+        env["BENCH_TOKEN"] = _admin_token(env["ADMIN_EMAIL"], env["NEXTAUTH_SECRET"])
+
+    runs = [_run_once(env) for _ in range(args.runs)]
+    result = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "request": f"{args.method} {args.path}",
+        "status": runs[-1]["status"],
+        "runs": args.runs,
+        "import_ms": _summarize([r["import_ms"] for r in runs]),
+        "first_invocation_ms": _summarize([r["first_ms"] for r in runs]),
+        "steady_state_ms": _summarize([r["steady_ms"] for r in runs if r["steady_ms"] is not None]),
+    }
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        result["compare"] = {
+            "baseline_commit": baseline.get("commit"),
+            **{
+                f"{metric}_delta": round(result[metric]["median"] - baseline[metric]["median"], 2)
+                for metric in ("import_ms", "first_invocation_ms", "steady_state_ms")
+                if metric in baseline
+            },
+        }
+
+    text = json.dumps(result, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
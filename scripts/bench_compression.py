@@ -0,0 +1,117 @@
+"""
+Size, capacity units and latency of MDX content with and without compression.
+
+For each synthetic post size the script reports the stored attribute size,
+the write/read capacity units of the whole item (1 WCU per 1 KB written,
+1 RCU per 4 KB strongly-consistent read), codec encode/decode time and the
+median put_item/get_item latency against moto for every codec.
+
+Usage:
+    PYTHONPATH=src:. uv run python scripts/bench_compression.py
+    PYTHONPATH=src:. uv run python scripts/bench_compression.py --sizes 4 32 256 --codecs off gzip zstd
+"""
+
+import argparse
+import json
+import math
+import random
+import statistics
+import sys
+import time
+
+from tests.conftest import create_aws_resources  # sets test env vars
+
+_WORDS = (
+    "the pointer moves left right until window shrinks array sorted binary search "
+    "hash map stores index complement return pair dynamic programming memo table "
+    "each state depends previous row column graph edge node visited queue stack"
+).split()
+
+
+def _sample_mdx(kilobytes: int, seed: int = 7) -> str:
+    """Realistic-looking MDX: headings, prose, lists and fenced code blocks."""
+    rng = random.Random(seed)
+    parts: list[str] = []
+    while sum(len(p) for p in parts) < kilobytes * 1024:
+        parts.append(f"## {' '.join(rng.choices(_WORDS, k=4)).title()}\n")
+        parts.append(" ".join(rng.choices(_WORDS, k=rng.randint(40, 90))) + ".\n")
+        parts.append("".join(f"- {' '.join(rng.choices(_WORDS, k=6))}\n" for _ in range(3)))
+        parts.append(
+            "```python\n"
+            + "".join(
+                f"    {rng.choice(_WORDS)} = {rng.choice(_WORDS)}[{rng.randint(0, 9)}]\n"
+                for _ in range(rng.randint(4, 10))
+            )
+            + "```\n"
+        )
+    return "\n".join(parts)
+
+
+def _median_ms(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return round(statistics.median(times) * 1000, 3)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2, 8, 32, 128, 320], help="KB")
+    parser.add_argument("--codecs", nargs="+", default=["off", "gzip", "zstd"])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    from moto import mock_aws  # noqa: PLC0415
+
+    with mock_aws():
+        create_aws_resources()
+
+        from shared import codec as codecs  # noqa: PLC0415
+        from shared.codec import decode_item, encode_item, encode_value  # noqa: PLC0415
+        from shared.db import estimate_item_size, get_blog_table  # noqa: PLC0415
+
+        # A codec that is not installed silently falls back to gzip; measuring it
+        # would report gzip numbers under its name
+        used = {None: "off", codecs._GZIP: "gzip", codecs._ZSTD: "zstd"}
+        available = []
+        for codec in args.codecs:
+            if used[codecs._resolve_codec(codec)] == codec:
+                available.append(codec)
+            else:
+                print(f"skipping {codec}: not available here", file=sys.stderr)
+
+        table = get_blog_table()
+        results = []
+        for kb in args.sizes:
+            text = _sample_mdx(kb)
+            for codec in available:
+                item = encode_item(
+                    {"PK": f"BLOG#bench-{kb}", "SK": "METADATA", "title": "Bench", "content": text},
+                    codec=codec,
+                    min_bytes=0,
+                )
+                key = {"PK": item["PK"], "SK": "METADATA"}
+                size = estimate_item_size(item)
+                stored = item["content"]
+                results.append({
+                    "content_kb": kb,
+                    "codec": codec,
+                    "stored_bytes": len(stored) if isinstance(stored, bytes) else len(stored.encode()),
+                    "item_bytes": size,
+                    "wcu": math.ceil(size / 1024),
+                    "rcu": math.ceil(size / 4096),
+                    "encode_ms": _median_ms(
+                        lambda: encode_value(text, codec=codec, min_bytes=0), args.repeat
+                    ),
+                    "decode_ms": _median_ms(lambda: decode_item(item), args.repeat),
+                    "put_ms": _median_ms(lambda: table.put_item(Item=item), args.repeat),
+                    "get_ms": _median_ms(lambda: table.get_item(Key=key), args.repeat),
+                })
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
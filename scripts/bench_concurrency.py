@@ -0,0 +1,111 @@
+"""
+Admin API throughput at 1, 10 and 100 concurrent clients.
+
+Each client loops create → update → delete of its own blog post against the
+ASGI app in-process (moto-backed), so the numbers reflect how well the routes
+overlap blocking boto3 calls rather than network latency.
+
+Usage:
+    PYTHONPATH=src:. uv run python scripts/bench_concurrency.py
+    PYTHONPATH=src:. uv run python scripts/bench_concurrency.py --requests 600 --levels 1 10 100
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+
+os.environ.setdefault("RATE_LIMIT_RATE", "0")   # measure the routes, not shared.ratelimit's 429s
+
+from tests.conftest import auth_headers, create_aws_resources  # noqa: E402  (sets test env vars)
+
+
+async def _client_loop(http, headers: dict, client_id: int, rounds: int) -> int:
+    done = 0
+    for i in range(rounds):
+        slug = f"bench-{client_id}-{i}"
+        post = {
+            "slug": slug,
+            "title": "Bench",
+            "date": "2026-01-01",
+            "excerpt": "Bench",
+            "tags": ["bench"],
+            "content": "# Bench\n\n" + "x" * 2000,
+            "media": [],
+        }
+        for method, url, body in (
+            ("POST", "/api/blog", post),
+            ("PUT", f"/api/blog/{slug}", {"title": "Bench 2"}),
+            ("DELETE", f"/api/blog/{slug}", None),
+        ):
+            r = await http.request(method, url, json=body, headers=headers)
+            r.raise_for_status()
+            done += 1
+    return done
+
+
+def _serialize_moto() -> None:
+    """
+    Handle one mocked AWS request at a time. moto's backends are not
+    thread-safe: TransactWriteItems deep-copies whole tables for rollback
+    while other threads write to them. moto is GIL-bound anyway, so this
+    hardly changes the overlap measured.
+    """
+    from moto.core.botocore_stubber import BotocoreStubber  # noqa: PLC0415
+
+    lock = threading.Lock()
+    handle = BotocoreStubber.__call__
+
+    def locked(self, *args, **kwargs):
+        with lock:
+            return handle(self, *args, **kwargs)
+
+    BotocoreStubber.__call__ = locked
+
+
+async def _run_level(app, concurrency: int, total_requests: int) -> dict:
+    import httpx  # noqa: PLC0415
+
+    rounds = max(1, total_requests // (3 * concurrency))
+    headers = auth_headers()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        start = time.perf_counter()
+        counts = await asyncio.gather(
+            *(_client_loop(http, headers, c, rounds) for c in range(concurrency))
+        )
+        elapsed = time.perf_counter() - start
+    requests = sum(counts)
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "seconds": round(elapsed, 3),
+        "requests_per_sec": round(requests / elapsed, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=300, help="approximate requests per level")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 10, 100])
+    args = parser.parse_args()
+
+    from moto import mock_aws  # noqa: PLC0415
+
+    _serialize_moto()
+    with mock_aws():
+        create_aws_resources()
+
+        from admin.handler import app  # noqa: PLC0415
+        from shared.aws import reset_clients  # noqa: PLC0415
+
+        reset_clients()
+        results = [asyncio.run(_run_level(app, level, args.requests)) for level in args.levels]
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Cold import time and per-verification cost of each JWT backend.
+
+For every backend in shared.jwt_backend.BACKENDS the script reports:
+  import_ms      importing shared.jwt_backend and building the backend in a
+                 fresh interpreter (best of --runs), i.e. what a cold start pays
+  verify_us      median and p99 of one decode() of a valid admin token
+
+Usage:
+    PYTHONPATH=src:. uv run python scripts/bench_jwt.py
+    PYTHONPATH=src:. uv run python scripts/bench_jwt.py --iterations 50000 --runs 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from tests.conftest import make_token  # noqa: E402  (sets test env vars)
+
+from shared.jwt_backend import BACKENDS, get_jwt_backend  # noqa: E402
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_PROBE = """
+import json, time
+start = time.perf_counter()
+from shared.jwt_backend import get_jwt_backend
+get_jwt_backend({name!r})
+print(json.dumps((time.perf_counter() - start) * 1000))
+"""
+
+
+def _cold_import_ms(name: str, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(name=name)],
+            env={**os.environ, "PYTHONPATH": str(ROOT / "src")},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        samples.append(json.loads(proc.stdout))
+    return min(samples)
+
+
+def _verify_us(name: str, iterations: int) -> tuple[float, float]:
+    backend = get_jwt_backend(name)
+    token, secret = make_token(), os.environ["NEXTAUTH_SECRET"]
+    backend.decode(token, secret)
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        backend.decode(token, secret)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return statistics.median(samples) * 1e6, samples[int(len(samples) * 0.99) - 1] * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per cold-import measurement")
+    args = parser.parse_args()
+
+    print(f"{'backend':<10}{'import ms':>12}{'verify µs':>12}{'p99 µs':>12}")
+    for name in BACKENDS:
+        import_ms = _cold_import_ms(name, args.runs)
+        median, p99 = _verify_us(name, args.iterations)
+        print(f"{name:<10}{import_ms:>12.1f}{median:>12.1f}{p99:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+PUT /api/playbook/{slug} call counts and latency for 1, 50 and 500 problem changes.
+
+Each run seeds a module whose problems carry an S3 image, then sends one
+update that upserts half of the changes and deletes the other half. AWS calls
+are counted on the pooled clients via botocore before-call events.
+
+Usage:
+    PYTHONPATH=src:. uv run python scripts/bench_update_module.py
+    PYTHONPATH=src:. uv run python scripts/bench_update_module.py --changes 1 50 500 --repeat 3
+"""
+
+import argparse
+import collections
+import json
+import os
+import statistics
+import time
+
+os.environ.setdefault("RATE_LIMIT_RATE", "0")   # large --repeat runs would hit shared.ratelimit
+
+from tests.conftest import auth_headers, create_aws_resources  # noqa: E402  (sets test env vars)
+
+
+def _problem(pid: str, slug: str) -> dict:
+    key = f"images/playbook/{slug}/problems/{pid}/diagram.png"
+    return {
+        "id": pid,
+        "title": f"Problem {pid}",
+        "leetcodeUrl": f"https://leetcode.com/problems/{pid}/",
+        "difficulty": "Medium",
+        "pseudocode": "## Approach\n\n" + "step\n" * 50,
+        "media": [{"key": "diagram.png", "s3Key": key, "type": "image"}],
+    }
+
+
+def _run(http, changes: int, attempt: int, calls: collections.Counter) -> dict:
+    slug = f"bench-{changes}-{attempt}"
+    deletes = changes // 2
+    upserts = changes - deletes
+    existing = [_problem(f"old-{i}", slug) for i in range(deletes)]
+    module = {
+        "slug": slug,
+        "title": "Bench",
+        "description": "Bench",
+        "content": "# Bench",
+        "order": 1,
+        "problems": existing,
+    }
+    http.post("/api/playbook", json=module, headers=auth_headers()).raise_for_status()
+
+    body = {
+        "title": "Bench (updated)",
+        "upsert_problems": [_problem(f"new-{i}", slug) for i in range(upserts)],
+        "delete_problem_ids": [p["id"] for p in existing],
+    }
+    calls.clear()
+    start = time.perf_counter()
+    http.put(f"/api/playbook/{slug}", json=body, headers=auth_headers()).raise_for_status()
+    return {"seconds": time.perf_counter() - start, "calls": dict(calls)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--changes", type=int, nargs="+", default=[1, 50, 500])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    from fastapi.testclient import TestClient  # noqa: PLC0415
+    from moto import mock_aws  # noqa: PLC0415
+
+    with mock_aws():
+        create_aws_resources()
+
+        from admin.handler import app  # noqa: PLC0415
+        from shared.aws import get_client, reset_clients  # noqa: PLC0415
+
+        reset_clients()
+        calls: collections.Counter = collections.Counter()
+
+        def _record(model, **_):
+            calls[f"{model.service_model.service_name}:{model.name}"] += 1
+
+        for service in ("dynamodb", "s3"):
+            get_client(service).meta.events.register(f"before-call.{service}", _record)
+
+        http = TestClient(app)
+        results = []
+        for changes in args.changes:
+            runs = [_run(http, changes, i, calls) for i in range(args.repeat)]
+            results.append({
+                "problem_changes": changes,
+                "median_ms": round(statistics.median(r["seconds"] for r in runs) * 1000, 1),
+                "calls": runs[-1]["calls"],
+            })
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
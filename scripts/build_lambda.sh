@@ -29,6 +29,11 @@ mkdir -p "$BUILD_DIR"
 # ── 2. Install prod dependencies ──────────────────────────────────────────────
 # --python-platform and --python-version ensure Linux x86_64 wheels are fetched
 # regardless of the build host (e.g. Apple Silicon). Lambda runs on x86_64 Linux.
+# python-jose is only needed when the function runs with JWT_BACKEND=jose.
+EXTRA_DEPS=()
+if [[ "${JWT_BACKEND:-stdlib}" == "jose" ]]; then
+  EXTRA_DEPS+=("python-jose[cryptography]")
+fi
 info "Installing Python dependencies into $BUILD_DIR ..."
 uv pip install \
   --target "$BUILD_DIR" \
@@ -37,8 +42,9 @@ uv pip install \
   fastapi \
   mangum \
   boto3 \
-  "python-jose[cryptography]" \
-  pydantic
+  httpx \
+  pydantic \
+  ${EXTRA_DEPS[@]+"${EXTRA_DEPS[@]}"}
 
 # ── 3. Copy source ────────────────────────────────────────────────────────────
 info "Copying source (admin + shared)..."
@@ -0,0 +1,37 @@
+"""
+GC Lambda entry point — drains the deferred S3 cleanup queue (shared.gc).
+
+Lambda handler (set in CDK BackendStack, on an EventBridge schedule such as
+rate(5 minutes)):
+    admin.gc.handler
+
+Local run against the configured tables / bucket:
+    PYTHONPATH=src uv run python -m admin.gc
+"""
+
+import json
+import logging
+from dataclasses import asdict
+
+from shared.config import LOG_LEVEL
+from shared.gc import drain
+
+logger = logging.getLogger(__name__)
+logger.setLevel(LOG_LEVEL)
+
+_SAFETY_MARGIN_MS = 10_000   # stop starting new rounds this close to the Lambda timeout
+
+
+def handler(event, context) -> dict:
+    """Drain the queue until it is empty or the invocation is about to time out."""
+    budget = None
+    if context is not None and hasattr(context, "get_remaining_time_in_millis"):
+        budget = max(context.get_remaining_time_in_millis() - _SAFETY_MARGIN_MS, 0) / 1000
+    result = drain(max_records=(event or {}).get("maxRecords"), time_budget=budget)
+    logger.info("GC drained %s", json.dumps(asdict(result)))
+    return asdict(result)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(json.dumps(handler({}, None)))
@@ -6,12 +6,34 @@ Local dev:
 
 Lambda handler (set in CDK BackendStack):
     admin.handler.handler
+
+Heavy dependencies (boto3, httpx and, with JWT_BACKEND=jose, python-jose) are
+imported on first use so that cold starts only pay for what the invocation touches. Set
+PRELOAD_DEPENDENCIES=true to load them during init instead.
 """
 
 from fastapi import FastAPI
 from mangum import Mangum
 
-from admin.routes import blog, leetcode, playbook, upload
+from admin.routes import blog, export, leetcode, metrics, playbook, upload
+from shared.config import PRELOAD_DEPENDENCIES
+from shared.metrics import AwsMetricsMiddleware
+
+
+def _preload() -> None:
+    """Import the lazily loaded dependencies and build the pooled AWS clients now."""
+    import httpx  # noqa: F401, PLC0415
+
+    from shared.aws import get_client, get_resource  # noqa: PLC0415
+    from shared.jwt_backend import get_jwt_backend  # noqa: PLC0415
+
+    get_jwt_backend()
+    get_resource("dynamodb")
+    get_client("s3")
+
+
+if PRELOAD_DEPENDENCIES:
+    _preload()
 
 app = FastAPI(
     title="botthef Admin API",
@@ -21,8 +43,13 @@ app = FastAPI(
     redoc_url="/redoc",
 )
 
+# Per-request AWS call count/latency → Server-Timing header + one log line
+app.add_middleware(AwsMetricsMiddleware)
+
 app.include_router(blog.router)
+app.include_router(export.router)
 app.include_router(leetcode.router)
+app.include_router(metrics.router)
 app.include_router(playbook.router)
 app.include_router(upload.router)
 
@@ -1,13 +1,56 @@
-"""Admin write routes for blog posts — POST / PUT / DELETE /api/blog."""
+"""Admin routes for blog posts — GET / POST / PUT / PATCH / DELETE /api/blog, POST /api/blog/bulk."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import json
+from typing import Literal
 
-from shared.auth import verify_admin_token
-from shared.db import build_update_expression, get_blog_table, now_iso
-from shared.models import PostCreate, PostUpdate
-from shared.s3 import delete_s3_objects
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from pydantic import ValidationError
 
-router = APIRouter()
+from shared.aio import run_sync
+from shared.auth import Identity, require_scope
+from shared.codec import encode_item
+from shared.config import BLOG_BULK_MAX_POSTS
+from shared.cursor import decode_cursor, encode_cursor
+from shared.db import (
+    batch_get,
+    cancellation_codes,
+    get_blog_table,
+    get_gc_table,
+    get_item_cached,
+    invalidate_cached,
+    now_iso,
+    transact_write,
+)
+from shared.gc import enqueue, pending_records
+from shared.models import (
+    BulkPostResponse,
+    BulkPostResult,
+    ContentPatch,
+    ContentPatchResponse,
+    Post,
+    PostCreate,
+    PostListResponse,
+    PostSummary,
+    PostUpdate,
+)
+from shared.offload import content_prefix, offload_item, offloaded_keys
+from shared.patch import patch_attribute
+from shared.ratelimit import enforce_rate_limit
+from shared.s3 import media_prefix
+from shared.versioning import (
+    VERSION_FIELD,
+    etag,
+    next_version,
+    parse_if_match,
+    raise_condition_failed,
+    version_condition,
+    versioned_update,
+)
+
+router = APIRouter(dependencies=[Depends(enforce_rate_limit)])
+
+_DATE_INDEX = "date-index"   # GSI: SK (hash) + date (range)
+_SUMMARY_FIELDS = ["PK", "SK", "title", "date", "excerpt", "tags", "media", "createdAt", "updatedAt"]
 
 
 # ── Helpers ────────────────────────────────────────────────────────────────────
@@ -16,49 +59,216 @@ def _pk(slug: str) -> str:
     return f"BLOG#{slug}"
 
 
-def _get_or_404(table, slug: str) -> dict:
-    item = table.get_item(Key={"PK": _pk(slug), "SK": "METADATA"}).get("Item")
-    if not item:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
-    return item
+def _scope(slug: str) -> str:
+    """shared.offload scope for a post's S3-offloaded content."""
+    return f"blog/{slug}"
+
+
+def _post_item(post: PostCreate, ts: str) -> dict:
+    """Build the DynamoDB item for a new post (large content compressed per shared.codec)."""
+    return encode_item({
+        "PK": _pk(post.slug),
+        "SK": "METADATA",
+        "title": post.title,
+        "date": post.date,
+        "excerpt": post.excerpt,
+        "tags": post.tags,
+        "content": post.content,
+        "media": [m.model_dump() for m in post.media],
+        "createdAt": ts,
+        "updatedAt": ts,
+        VERSION_FIELD: 1,
+    })
 
 
 # ── Routes ─────────────────────────────────────────────────────────────────────
 
+@router.get("/api/blog", response_model=PostListResponse)
+async def list_posts(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+    order: Literal["desc", "asc"] = "desc",
+    _: Identity = Depends(require_scope("blog:read")),
+):
+    """
+    Page through posts by date via the date-index GSI (newest first by default).
+
+    Only summary attributes are read — never `content` — and each page is a
+    single Query, so latency does not depend on how many posts exist. Pass
+    the returned `cursor` back to get the next page.
+    """
+    table = get_blog_table()
+    params: dict = {
+        "IndexName": _DATE_INDEX,
+        "KeyConditionExpression": "#sk = :sk",
+        "ExpressionAttributeValues": {":sk": "METADATA"},
+        "ScanIndexForward": order == "asc",
+        "Limit": limit,
+    }
+    names = {f"#f{i}": attr for i, attr in enumerate(_SUMMARY_FIELDS)}
+    params["ProjectionExpression"] = ", ".join(names)
+    params["ExpressionAttributeNames"] = {**names, "#sk": "SK"}
+
+    if cursor:
+        try:
+            params["ExclusiveStartKey"] = decode_cursor(cursor, scope=order)
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    response = await run_sync(table.query, **params)
+    last_key = response.get("LastEvaluatedKey")
+    return PostListResponse(
+        posts=[
+            PostSummary(slug=item["PK"].removeprefix("BLOG#"), **item)
+            for item in response.get("Items", [])
+        ],
+        cursor=encode_cursor(last_key, scope=order) if last_key else None,
+    )
+
+
 @router.post("/api/blog", status_code=status.HTTP_201_CREATED)
-def create_post(post: PostCreate, _: str = Depends(verify_admin_token)):
+async def create_post(
+    post: PostCreate,
+    response: Response,
+    _: Identity = Depends(require_scope("blog:write")),
+):
     table = get_blog_table()
 
-    # Guard against duplicate slugs
-    existing = table.get_item(Key={"PK": _pk(post.slug), "SK": "METADATA"}).get("Item")
-    if existing:
+    ts = now_iso()
+    item = await run_sync(offload_item, _post_item(post, ts), _scope(post.slug))
+    try:
+        # The condition guards against duplicate slugs in the same round trip
+        await run_sync(
+            table.put_item,
+            Item=item,
+            ConditionExpression="attribute_not_exists(PK)",
+        )
+    except table.meta.client.exceptions.ConditionalCheckFailedException:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=f"Post with slug '{post.slug}' already exists",
         )
-
-    ts = now_iso()
-    table.put_item(
-        Item={
-            "PK": _pk(post.slug),
-            "SK": "METADATA",
-            "title": post.title,
-            "date": post.date,
-            "excerpt": post.excerpt,
-            "tags": post.tags,
-            "content": post.content,
-            "media": [m.model_dump() for m in post.media],
-            "createdAt": ts,
-            "updatedAt": ts,
-        }
-    )
+    finally:
+        invalidate_cached(table, _pk(post.slug))
+    response.headers["ETag"] = etag(1)
     return {"slug": post.slug, "message": "Post created"}
 
 
+def _parse_bulk_body(body: bytes, content_type: str) -> list:
+    """Split a bulk request into raw entries: a JSON array, or one JSON object per line (NDJSON)."""
+    try:
+        if content_type.startswith("application/x-ndjson"):
+            entries = []
+            for line in body.decode("utf-8").splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    entries.append(None)   # reported as invalid, the rest still import
+            return entries
+        entries = json.loads(body)
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Body is not valid JSON")
+    if not isinstance(entries, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Body must be a JSON array of posts"
+        )
+    return entries
+
+
+def _import_posts(table, posts: list[PostCreate], ts: str) -> set[str]:
+    """Write every post whose slug is not taken yet. Returns the slugs that already existed."""
+    keys = [{"PK": _pk(p.slug), "SK": "METADATA"} for p in posts]
+    existing = {item["PK"] for item in batch_get(table, keys, projection=["PK"])}
+
+    # batch_writer re-sends UnprocessedItems until every put is accepted
+    with table.batch_writer() as batch:
+        for post in posts:
+            if _pk(post.slug) not in existing:
+                batch.put_item(Item=offload_item(_post_item(post, ts), _scope(post.slug)))
+    return {pk.removeprefix("BLOG#") for pk in existing}
+
+
+@router.post("/api/blog/bulk", response_model=BulkPostResponse)
+async def bulk_create_posts(request: Request, _: Identity = Depends(require_scope("blog:write"))):
+    """
+    Import many posts in one request — a JSON array of PostCreate objects, or
+    NDJSON with Content-Type: application/x-ndjson.
+
+    Every entry is validated up front; existing slugs are found with one
+    batched read and the rest are written through batch_writer. Each entry
+    gets a result: created, conflict (slug exists or repeats earlier in the
+    request) or invalid. Unlike POST /api/blog, the existence check and the
+    write are not atomic — a post created concurrently with the import may be
+    overwritten.
+    """
+    entries = _parse_bulk_body(await request.body(), request.headers.get("content-type", ""))
+    if len(entries) > BLOG_BULK_MAX_POSTS:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"At most {BLOG_BULK_MAX_POSTS} posts per request",
+        )
+
+    results: list[BulkPostResult] = []
+    valid: dict[str, PostCreate] = {}
+    for entry in entries:
+        slug = entry.get("slug") if isinstance(entry, dict) else None
+        try:
+            post = PostCreate.model_validate(entry)
+        except ValidationError as exc:
+            results.append(BulkPostResult(
+                slug=slug if isinstance(slug, str) else None,
+                status="invalid",
+                detail="; ".join(
+                    f"{'.'.join(map(str, e['loc'])) or 'entry'}: {e['msg']}" for e in exc.errors()
+                ),
+            ))
+            continue
+        if post.slug in valid:
+            results.append(BulkPostResult(
+                slug=post.slug, status="conflict", detail="Slug repeated in request"
+            ))
+            continue
+        valid[post.slug] = post
+        results.append(BulkPostResult(slug=post.slug, status="created"))
+
+    table = get_blog_table()
+    existing = await run_sync(_import_posts, table, list(valid.values()), now_iso()) if valid else set()
+
+    for result in results:
+        if result.status == "created" and result.slug in existing:
+            result.status = "conflict"
+            result.detail = f"Post with slug '{result.slug}' already exists"
+
+    counts = {s: sum(r.status == s for r in results) for s in ("created", "conflict", "invalid")}
+    return BulkPostResponse(**counts, results=results)
+
+
+@router.get("/api/blog/{slug}", response_model=Post)
+async def get_post(slug: str, response: Response, _: Identity = Depends(require_scope("blog:read"))):
+    """Full post including content. Served from the warm-container read cache when possible."""
+    item = await run_sync(get_item_cached, get_blog_table(), {"PK": _pk(slug), "SK": "METADATA"})
+    if not item:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
+    response.headers["ETag"] = etag(item.get(VERSION_FIELD))
+    return Post(slug=slug, **item)
+
+
 @router.put("/api/blog/{slug}")
-def update_post(slug: str, update: PostUpdate, _: str = Depends(verify_admin_token)):
+async def update_post(
+    slug: str,
+    update: PostUpdate,
+    response: Response,
+    if_match: str | None = Header(None),
+    _: Identity = Depends(require_scope("blog:write")),
+):
+    """
+    Partial update in one conditional write — no existence pre-read. With
+    If-Match, 412 unless the post is still at that ETag's version.
+    """
     table = get_blog_table()
-    _get_or_404(table, slug)
+    expected = parse_if_match(if_match)
 
     data = update.model_dump(exclude_none=True)
     if not data:
@@ -72,24 +282,87 @@ def update_post(slug: str, update: PostUpdate, _: str = Depends(verify_admin_tok
 
     data["updatedAt"] = now_iso()
 
-    expr, names, values = build_update_expression(data)
-    table.update_item(
-        Key={"PK": _pk(slug), "SK": "METADATA"},
-        UpdateExpression=expr,
-        ExpressionAttributeNames=names,
-        ExpressionAttributeValues=values,
-    )
+    data = await run_sync(offload_item, encode_item(data), _scope(slug))
+    try:
+        result = await run_sync(
+            table.update_item,
+            Key={"PK": _pk(slug), "SK": "METADATA"},
+            **versioned_update(data, expected),
+            ReturnValues="UPDATED_OLD",
+        )
+    except table.meta.client.exceptions.ConditionalCheckFailedException as exc:
+        raise_condition_failed(exc, "Post not found")
+    finally:
+        invalidate_cached(table, _pk(slug))
+
+    # Queue the S3 body the update replaced, if the old content was offloaded
+    old = result.get("Attributes", {})
+    replaced = set(offloaded_keys(old)) - set(offloaded_keys(data))
+    if replaced:
+        await run_sync(enqueue, sorted(replaced), _pk(slug))
+    response.headers["ETag"] = etag(next_version(old))
     return {"slug": slug, "message": "Post updated"}
 
 
+@router.patch("/api/blog/{slug}", response_model=ContentPatchResponse)
+async def patch_post(
+    slug: str,
+    patch: ContentPatch,
+    response: Response,
+    if_match: str | None = Header(None),
+    _: Identity = Depends(require_scope("blog:write")),
+):
+    """
+    Edit the post's content with range edits or a unified diff instead of
+    re-sending the whole body. 412 if `baseSha256` is not the current content
+    (or If-Match is stale).
+    """
+    sha, version = await run_sync(
+        patch_attribute,
+        get_blog_table(),
+        {"PK": _pk(slug), "SK": "METADATA"},
+        "content",
+        patch,
+        _scope(slug),
+        "Post not found",
+        parse_if_match(if_match),
+    )
+    response.headers["ETag"] = etag(version)
+    return ContentPatchResponse(slug=slug, sha256=sha, message="Post patched")
+
+
 @router.delete("/api/blog/{slug}")
-def delete_post(slug: str, _: str = Depends(verify_admin_token)):
+async def delete_post(
+    slug: str,
+    if_match: str | None = Header(None),
+    _: Identity = Depends(require_scope("blog:write")),
+):
     table = get_blog_table()
-    item = _get_or_404(table, slug)
+    condition, names, values = version_condition(parse_if_match(if_match))
 
-    # Clean up S3 assets first
-    s3_keys = [m["s3Key"] for m in item.get("media", []) if "s3Key" in m]
-    delete_s3_objects(s3_keys)
+    # The GC record commits with the delete, so a deleted post's assets are
+    # always queued. It names the post's prefixes rather than keys, so nothing
+    # is pre-read; the drain only takes objects older than the record, which
+    # leaves a post re-created under the same slug alone.
+    [record] = pending_records(
+        [], _pk(slug), [media_prefix("blog", slug), content_prefix(_scope(slug))]
+    )
+    try:
+        await run_sync(transact_write, table, [
+            {"Delete": {
+                "Key": {"PK": _pk(slug), "SK": "METADATA"},
+                "ConditionExpression": condition,
+                "ExpressionAttributeNames": names,
+                **({"ExpressionAttributeValues": values} if values else {}),
+                "ReturnValuesOnConditionCheckFailure": "ALL_OLD",
+            }},
+            {"Put": {"TableName": get_gc_table().name, "Item": record}},
+        ])
+    except table.meta.client.exceptions.TransactionCanceledException as exc:
+        if cancellation_codes(exc)[:1] == ["ConditionalCheckFailed"]:
+            raise_condition_failed(exc, "Post not found")
+        raise
+    finally:
+        invalidate_cached(table, _pk(slug))
 
-    table.delete_item(Key={"PK": _pk(slug), "SK": "METADATA"})
     return {"slug": slug, "message": "Post deleted"}
@@ -0,0 +1,98 @@
+"""Admin export route — GET /api/export.
+
+Streams every item of the blog or playbook table as NDJSON (one JSON object
+per line), optionally as a gzip file (gzip=true: Content-Type application/gzip).
+Items are read with a segmented parallel Scan and written out page by page,
+so the table is never held in memory. Line order is unspecified.
+
+Used for backups and to feed the static site build:
+    curl -H "Authorization: Bearer $TOKEN" \\
+        "https://<api>/api/export?table=blog&gzip=true" -o blog.ndjson.gz
+
+Note: under Mangum the response is buffered before API Gateway returns it, so
+Lambda's 6 MB response limit applies there — prefer gzip=true.
+"""
+
+import base64
+import json
+import zlib
+from decimal import Decimal
+from typing import AsyncIterator, Literal
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from shared.aio import run_sync
+from shared.auth import Identity, require_scope
+from shared.codec import decode_item
+from shared.config import EXPORT_MAX_SEGMENTS, EXPORT_SCAN_SEGMENTS
+from shared.db import ParallelScan, get_blog_table, get_playbook_table, parallel_scan
+from shared.offload import load_offloaded
+from shared.ratelimit import enforce_rate_limit
+
+router = APIRouter(dependencies=[Depends(enforce_rate_limit)])
+
+_TABLES = {"blog": get_blog_table, "playbook": get_playbook_table}
+
+
+def _json_default(value):
+    """Encode the DynamoDB types json can't: numbers, sets and binary."""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    if hasattr(value, "value") and isinstance(value.value, bytes):   # boto3 Binary
+        return base64.b64encode(value.value).decode("ascii")
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _render_page(pages: ParallelScan) -> bytes | None:
+    """Next page as NDJSON, with offloaded and compressed MDX restored. None when exhausted."""
+    page = next(pages, None)
+    if page is None:
+        return None
+    return "".join(
+        json.dumps(decode_item(load_offloaded(item)), default=_json_default) + "\n"
+        for item in page
+        # shared.gc / shared.ratelimit bookkeeping and the shared.apikeys registry are not content
+        if not item["PK"].startswith(("GC#", "AUTH#", "RATELIMIT#"))
+    ).encode()
+
+
+async def _ndjson(pages: ParallelScan) -> AsyncIterator[bytes]:
+    try:
+        # Scan, S3 pointer reads and decompression all stay off the event loop
+        while (chunk := await run_sync(_render_page, pages)) is not None:
+            if chunk:
+                yield chunk
+    finally:
+        # On a client disconnect a worker thread may still be inside next(pages);
+        # ParallelScan.close() is thread-safe and ends that call too
+        pages.close()
+
+
+async def _gzip(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)   # 31 = gzip container
+    async for chunk in chunks:
+        if out := compressor.compress(chunk):
+            yield out
+    yield compressor.flush()
+
+
+@router.get("/api/export")
+async def export_table(
+    table: Literal["blog", "playbook"],
+    segments: int = Query(EXPORT_SCAN_SEGMENTS, ge=1, le=EXPORT_MAX_SEGMENTS),
+    gzip: bool = False,
+    _: Identity = Depends(require_scope("export")),
+):
+    pages = parallel_scan(_TABLES[table](), total_segments=segments)
+    body = _ndjson(pages)
+    filename, media_type = f"{table}.ndjson", "application/x-ndjson"
+    if gzip:
+        # The .gz file is the payload, not a transfer encoding: no Content-Encoding,
+        # so clients save it as sent rather than decoding it under a .gz name
+        body = _gzip(body)
+        filename, media_type = f"{filename}.gz", "application/gzip"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    return StreamingResponse(body, media_type=media_type, headers=headers)
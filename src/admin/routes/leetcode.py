@@ -1,23 +1,25 @@
 """LeetCode sync route — POST /api/leetcode/sync.
 
-Fetches solved counts from LeetCode's public GraphQL API and persists them
-to the blog DynamoDB table. Protected by admin token (btf_ API key or JWT).
+Fetches solved counts from LeetCode's public GraphQL API through the pooled,
+retrying client in shared.leetcode and persists them to the blog DynamoDB
+table. Requires the leetcode:sync scope (btf_ API key or admin JWT).
 
 Triggered by the botthef MCP server tool `sync_leetcode_stats` or a local cron job.
 """
 
-import json
-import urllib.request
+import math
 
 from fastapi import APIRouter, Depends, HTTPException, status
 
-from shared.auth import verify_admin_token
+from shared.aio import run_sync
+from shared.auth import Identity, require_scope
 from shared.db import get_blog_table, now_iso
+from shared.leetcode import CircuitOpen, LeetCodeError, get_leetcode_client
 from shared.models import LeetCodeSyncRequest, LeetCodeSyncResponse
+from shared.ratelimit import enforce_rate_limit
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(enforce_rate_limit)])
 
-_GRAPHQL_URL = "https://leetcode.com/graphql"
 _QUERY = """
 query getUserStats($username: String!) {
   matchedUser(username: $username) {
@@ -32,34 +34,23 @@ query getUserStats($username: String!) {
 """
 
 
-def _fetch_leetcode_stats(username: str) -> dict:
+async def _fetch_leetcode_stats(username: str) -> dict:
     """Call LeetCode GraphQL and return {easy, medium, hard, total} counts."""
-    payload = json.dumps({
-        "query": _QUERY,
-        "variables": {"username": username},
-    }).encode("utf-8")
-
-    req = urllib.request.Request(
-        _GRAPHQL_URL,
-        data=payload,
-        headers={
-            "Content-Type": "application/json",
-            "Referer": "https://leetcode.com",
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        },
-        method="POST",
-    )
-
     try:
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            body = json.loads(resp.read().decode("utf-8"))
-    except Exception as exc:
+        body = await get_leetcode_client().query(_QUERY, {"username": username})
+    except CircuitOpen as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="LeetCode is failing; sync paused",
+            headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
+        )
+    except LeetCodeError as exc:
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail=f"LeetCode request failed: {exc}",
         )
 
-    matched_user = body.get("data", {}).get("matchedUser")
+    matched_user = (body.get("data") or {}).get("matchedUser")
     if matched_user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -79,19 +70,20 @@ def _fetch_leetcode_stats(username: str) -> dict:
 
 
 @router.post("/api/leetcode/sync", response_model=LeetCodeSyncResponse)
-def sync_leetcode(req: LeetCodeSyncRequest, _: str = Depends(verify_admin_token)):
+async def sync_leetcode(req: LeetCodeSyncRequest, _: Identity = Depends(require_scope("leetcode:sync"))):
     """
     Fetch solved counts from LeetCode and write LEETCODE#stats to the blog table.
 
     Called by the botthef MCP server tool or a local cron script.
     No EventBridge or sync Lambda needed — sync is driven locally.
     """
-    stats = _fetch_leetcode_stats(req.username)
+    stats = await _fetch_leetcode_stats(req.username)
 
     table = get_blog_table()
     synced_at = now_iso()
 
-    table.put_item(
+    await run_sync(
+        table.put_item,
         Item={
             "PK": "LEETCODE#stats",
             "SK": "METADATA",
@@ -101,7 +93,7 @@ def sync_leetcode(req: LeetCodeSyncRequest, _: str = Depends(verify_admin_token)
             "total": stats["total"],
             "syncedAt": synced_at,
             "username": req.username,
-        }
+        },
     )
 
     return LeetCodeSyncResponse(
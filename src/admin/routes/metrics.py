@@ -0,0 +1,21 @@
+"""Admin metrics route — GET /api/metrics.
+
+Process-level counters for the Lambda container serving the request. Each
+warm container keeps its own counters, so numbers reset on cold start and
+differ between concurrent containers.
+"""
+
+from dataclasses import asdict
+
+from fastapi import APIRouter, Depends
+
+from shared.auth import Identity, require_scope
+from shared.db import item_cache_stats
+from shared.ratelimit import enforce_rate_limit
+
+router = APIRouter(dependencies=[Depends(enforce_rate_limit)])
+
+
+@router.get("/api/metrics")
+async def get_metrics(_: Identity = Depends(require_scope("metrics"))):
+    return {"itemCache": asdict(item_cache_stats())}
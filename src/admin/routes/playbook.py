@@ -1,4 +1,4 @@
-"""Admin write routes for playbook modules — POST / PUT / DELETE /api/playbook.
+"""Admin routes for playbook modules — GET / POST / PUT / PATCH / DELETE /api/playbook.
 
 DynamoDB key design:
   Module:  PK=PLAYBOOK#<slug>  SK=METADATA
@@ -7,15 +7,48 @@ DynamoDB key design:
 Both items carry collection="PLAYBOOK" for the playbook-collection-gsi.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from boto3.dynamodb.conditions import Key as DynamoKey
-
-from shared.auth import verify_admin_token
-from shared.db import build_update_expression, get_playbook_table, now_iso
-from shared.models import ModuleCreate, ModuleUpdate, ProblemCreate
-from shared.s3 import delete_s3_objects
-
-router = APIRouter()
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+
+from shared.aio import run_sync
+from shared.auth import Identity, require_scope
+from shared.codec import encode_item
+from shared.db import (
+    batch_get,
+    cancellation_codes,
+    get_gc_table,
+    get_playbook_table,
+    invalidate_cached,
+    now_iso,
+    query_collection_cached,
+    query_pages,
+    transact_write,
+    write_actions,
+)
+from shared.gc import enqueue, pending_records
+from shared.models import (
+    ContentPatchResponse,
+    Module,
+    ModuleCreate,
+    ModulePatch,
+    ModuleUpdate,
+    ProblemCreate,
+)
+from shared.offload import content_prefix, offload_item
+from shared.patch import patch_attribute
+from shared.ratelimit import enforce_rate_limit
+from shared.s3 import media_prefix
+from shared.versioning import (
+    DELETING_FIELD,
+    VERSION_FIELD,
+    delete_claim,
+    etag,
+    next_version,
+    parse_if_match,
+    raise_condition_failed,
+    versioned_update,
+)
+
+router = APIRouter(dependencies=[Depends(enforce_rate_limit)])
 
 
 # ── Helpers ────────────────────────────────────────────────────────────────────
@@ -28,15 +61,24 @@ def _problem_sk(problem_id: str) -> str:
     return f"PROBLEM#{problem_id}"
 
 
-def _get_module_or_404(table, slug: str) -> dict:
-    item = table.get_item(Key={"PK": _pk(slug), "SK": "METADATA"}).get("Item")
-    if not item:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Module not found")
-    return item
+def _scope(slug: str, sk: str = "METADATA") -> str:
+    """shared.offload scope for a module's or problem's S3-offloaded MDX."""
+    if sk == "METADATA":
+        return f"playbook/{slug}"
+    return f"playbook/{slug}/problems/{sk.removeprefix('PROBLEM#')}"
+
+
+def _offload_puts(slug: str, actions: list[dict]) -> list[dict]:
+    """Move oversized MDX out of every Put item. Uploads to S3 — call off the event loop."""
+    for action in actions:
+        if "Put" in action:
+            item = action["Put"]["Item"]
+            action["Put"]["Item"] = offload_item(item, _scope(slug, item["SK"]))
+    return actions
 
 
 def _problem_item(slug: str, problem: ProblemCreate, ts: str) -> dict:
-    """Build the DynamoDB item for a problem."""
+    """Build the DynamoDB item for a problem (large pseudocode compressed per shared.codec)."""
     item: dict = {
         "PK": _pk(slug),
         "SK": _problem_sk(problem.id),
@@ -56,15 +98,29 @@ def _problem_item(slug: str, problem: ProblemCreate, ts: str) -> dict:
         item["lastSolved"] = problem.lastSolved
     if problem.nextReview is not None:
         item["nextReview"] = problem.nextReview
-    return item
+    return encode_item(item)
 
 
-def _all_module_items(table, slug: str) -> list[dict]:
-    """Query all DynamoDB items for a module (METADATA + all PROBLEM# items)."""
-    response = table.query(
-        KeyConditionExpression=DynamoKey("PK").eq(_pk(slug))
+def _unique_problems(problems: list[ProblemCreate]) -> list[ProblemCreate]:
+    """Drop repeated ids (last one wins) — batch and transaction writes reject duplicate keys."""
+    return list({problem.id: problem for problem in problems}.values())
+
+
+def _module_item_pages(table, slug: str, projection: list[str] | None = None):
+    """Page through all DynamoDB items for a module (METADATA + all PROBLEM# items)."""
+    return query_pages(
+        table,
+        projection=projection,
+        KeyConditionExpression="#pk = :pk",
+        ExpressionAttributeNames={"#pk": "PK"},
+        ExpressionAttributeValues={":pk": _pk(slug)},
     )
-    return response.get("Items", [])
+
+
+def _delete_items(table, items: list[dict]) -> None:
+    with table.batch_writer() as batch:
+        for item in items:
+            batch.delete_item(Key={"PK": item["PK"], "SK": item["SK"]})
 
 
 def _collect_s3_keys(items: list[dict]) -> list[str]:
@@ -78,110 +134,285 @@ def _collect_s3_keys(items: list[dict]) -> list[str]:
 
 # ── Routes ─────────────────────────────────────────────────────────────────────
 
+@router.get("/api/playbook/{slug}", response_model=Module)
+async def get_module(slug: str, response: Response, _: Identity = Depends(require_scope("playbook:read"))):
+    """Module with all of its problems. Served from the warm-container read cache when possible."""
+    items = await run_sync(query_collection_cached, get_playbook_table(), _pk(slug))
+    metadata = next((item for item in items if item["SK"] == "METADATA"), None)
+    if metadata is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Module not found")
+
+    problems = [
+        {**item, "id": item["SK"].removeprefix("PROBLEM#")}
+        for item in items
+        if item["SK"].startswith("PROBLEM#")
+    ]
+    response.headers["ETag"] = etag(metadata.get(VERSION_FIELD))
+    return Module(slug=slug, **{**metadata, "problems": problems})
+
+
 @router.post("/api/playbook", status_code=status.HTTP_201_CREATED)
-def create_module(module: ModuleCreate, _: str = Depends(verify_admin_token)):
+async def create_module(
+    module: ModuleCreate,
+    response: Response,
+    _: Identity = Depends(require_scope("playbook:write")),
+):
     table = get_playbook_table()
 
-    existing = table.get_item(Key={"PK": _pk(module.slug), "SK": "METADATA"}).get("Item")
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=f"Module with slug '{module.slug}' already exists",
-        )
-
     ts = now_iso()
 
-    with table.batch_writer() as batch:
-        # Module metadata item
-        batch.put_item(
-            Item={
-                "PK": _pk(module.slug),
-                "SK": "METADATA",
-                "collection": "PLAYBOOK",
-                "title": module.title,
-                "description": module.description,
-                "content": module.content,
-                "order": module.order,
-                "media": [m.model_dump() for m in module.media],
-                "createdAt": ts,
-                "updatedAt": ts,
+    # Module metadata item, guarded against duplicate slugs
+    actions: list[dict] = [
+        {
+            "Put": {
+                "Item": encode_item({
+                    "PK": _pk(module.slug),
+                    "SK": "METADATA",
+                    "collection": "PLAYBOOK",
+                    "title": module.title,
+                    "description": module.description,
+                    "content": module.content,
+                    "order": module.order,
+                    "media": [m.model_dump() for m in module.media],
+                    "createdAt": ts,
+                    "updatedAt": ts,
+                    VERSION_FIELD: 1,
+                }),
+                "ConditionExpression": "attribute_not_exists(PK)",
             }
-        )
-        # Initial problems (if any)
-        for problem in module.problems:
-            batch.put_item(Item=_problem_item(module.slug, problem, ts))
-
+        }
+    ]
+    # Initial problems (if any)
+    actions += [
+        {"Put": {"Item": _problem_item(module.slug, problem, ts)}}
+        for problem in _unique_problems(module.problems)
+    ]
+
+    actions = await run_sync(_offload_puts, module.slug, actions)
+
+    # The guard sits in the first chunk, so a duplicate slug writes nothing
+    try:
+        await run_sync(transact_write, table, actions)
+    except table.meta.client.exceptions.TransactionCanceledException as exc:
+        if cancellation_codes(exc)[:1] == ["ConditionalCheckFailed"]:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Module with slug '{module.slug}' already exists",
+            )
+        raise
+    finally:
+        invalidate_cached(table, _pk(module.slug))
+
+    response.headers["ETag"] = etag(1)
     return {"slug": module.slug, "message": "Module created"}
 
 
-@router.put("/api/playbook/{slug}")
-def update_module(slug: str, update: ModuleUpdate, _: str = Depends(verify_admin_token)):
-    table = get_playbook_table()
-    _get_module_or_404(table, slug)
-
-    ts = now_iso()
+def _plan_module_update(
+    slug: str, update: ModuleUpdate, existing: dict[str, dict], ts: str, expected: int | None
+) -> tuple[list[dict], list[str]]:
+    """
+    Turn a ModuleUpdate into write actions plus the S3 keys to clean up.
 
-    # ── 1. Update module metadata ──────────────────────────────────────────────
+    `existing` maps SK → current item (SK, createdAt, media) for every problem
+    the update touches. The first action is always the metadata Update: it
+    bumps the module version (problem changes included) and carries the
+    module-exists / If-Match guard. Oversized MDX is uploaded to S3 here;
+    bodies superseded by the update stay under the module's offload prefix
+    until the module is deleted.
+    """
     module_fields = update.model_dump(
         exclude_none=True,
         exclude={"upsert_problems", "delete_problem_ids"},
     )
-
-    if module_fields:
-        if "media" in module_fields and update.media is not None:
-            module_fields["media"] = [m.model_dump() for m in update.media]
-        module_fields["updatedAt"] = ts
-
-        expr, names, values = build_update_expression(module_fields)
-        table.update_item(
-            Key={"PK": _pk(slug), "SK": "METADATA"},
-            UpdateExpression=expr,
-            ExpressionAttributeNames=names,
-            ExpressionAttributeValues=values,
+    if "media" in module_fields and update.media is not None:
+        module_fields["media"] = [m.model_dump() for m in update.media]
+    module_fields["updatedAt"] = ts
+
+    fields = offload_item(encode_item(module_fields), _scope(slug))
+    actions: list[dict] = [{
+        "Update": {"Key": {"PK": _pk(slug), "SK": "METADATA"}, **versioned_update(fields, expected)}
+    }]
+
+    # An id that is both upserted and deleted ends up deleted
+    delete_ids = set(update.delete_problem_ids or [])
+    for problem in _unique_problems(update.upsert_problems or []):
+        if problem.id in delete_ids:
+            continue
+        current = existing.get(_problem_sk(problem.id), {})
+        item = _problem_item(slug, problem, current.get("createdAt", ts))
+        item["updatedAt"] = ts
+        actions.append({"Put": {"Item": item}})
+
+    # Deleting a problem id that doesn't exist is a no-op
+    removed = [existing[_problem_sk(pid)] for pid in delete_ids if _problem_sk(pid) in existing]
+    for item in removed:
+        actions.append({"Delete": {"Key": {"PK": _pk(slug), "SK": item["SK"]}}})
+
+    _offload_puts(slug, actions)
+    return actions, _collect_s3_keys(removed)
+
+
+def _current_version(table, slug: str, expected: int | None) -> int:
+    """Version of an untouched module — the empty-update path, which writes nothing."""
+    item = table.get_item(
+        Key={"PK": _pk(slug), "SK": "METADATA"},
+        ProjectionExpression="PK, #ver",
+        ExpressionAttributeNames={"#ver": VERSION_FIELD},
+    ).get("Item")
+    if not item:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Module not found")
+    version = int(item.get(VERSION_FIELD, 0))
+    if expected is not None and expected != version:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Modified since the given ETag; re-fetch and retry",
         )
+    return version
 
-    # ── 2. Upsert problems ────────────────────────────────────────────────────
-    if update.upsert_problems:
-        with table.batch_writer() as batch:
-            for problem in update.upsert_problems:
-                # Check if the problem already exists to preserve createdAt
-                existing = table.get_item(
-                    Key={"PK": _pk(slug), "SK": _problem_sk(problem.id)}
-                ).get("Item")
-                created_at = existing["createdAt"] if existing else ts
-                item = _problem_item(slug, problem, created_at)
-                item["updatedAt"] = ts
-                batch.put_item(Item=item)
-
-    # ── 3. Delete problems ────────────────────────────────────────────────────
-    if update.delete_problem_ids:
-        for problem_id in update.delete_problem_ids:
-            existing = table.get_item(
-                Key={"PK": _pk(slug), "SK": _problem_sk(problem_id)}
-            ).get("Item")
-            if existing:
-                # Clean up S3 assets for this problem
-                s3_keys = _collect_s3_keys([existing])
-                delete_s3_objects(s3_keys)
-                table.delete_item(Key={"PK": _pk(slug), "SK": _problem_sk(problem_id)})
 
-    return {"slug": slug, "message": "Module updated"}
+def _update_module(table, slug: str, update: ModuleUpdate, expected: int | None) -> int | None:
+    """Apply `update` and return the new module version, or None when the write path can't report it."""
+    if not update.model_dump(exclude_none=True):
+        return _current_version(table, slug, expected)
+
+    ts = now_iso()
 
+    # Existence is enforced by the metadata guard; the batched read only fetches
+    # createdAt for upserts and media for deletes, and is skipped without them
+    ids = {p.id for p in update.upsert_problems or []} | set(update.delete_problem_ids or [])
+    keys = [{"PK": _pk(slug), "SK": _problem_sk(pid)} for pid in ids]
+    existing = {
+        item["SK"]: item
+        for item in batch_get(table, keys, projection=["SK", "createdAt", "media"])
+    } if keys else {}
+
+    actions, s3_keys = _plan_module_update(slug, update, existing, ts, expected)
+
+    client = table.meta.client
+    try:
+        if len(actions) == 1:
+            # Module fields only: one update_item, which also reports the version
+            result = table.update_item(**actions[0]["Update"], ReturnValues="UPDATED_OLD")
+            version = next_version(result.get("Attributes", {}))
+        else:
+            write_actions(table, actions)
+            version = None if expected is None else expected + 1
+    except client.exceptions.TransactionCanceledException as exc:
+        if cancellation_codes(exc)[:1] == ["ConditionalCheckFailed"]:
+            raise_condition_failed(exc, "Module not found")
+        raise
+    except client.exceptions.ConditionalCheckFailedException as exc:
+        raise_condition_failed(exc, "Module not found")
+    finally:
+        invalidate_cached(table, _pk(slug))
+
+    # Media of every removed problem is deleted later by the GC drain
+    enqueue(s3_keys, _pk(slug))
+    return version
 
-@router.delete("/api/playbook/{slug}")
-def delete_module(slug: str, _: str = Depends(verify_admin_token)):
+
+@router.put("/api/playbook/{slug}")
+async def update_module(
+    slug: str,
+    update: ModuleUpdate,
+    response: Response,
+    if_match: str | None = Header(None),
+    _: Identity = Depends(require_scope("playbook:write")),
+):
+    """
+    Update module fields and upsert / delete problems in one guarded write.
+    With If-Match, 412 unless the module is still at that ETag's version. The
+    new ETag is returned whenever it is known without a re-read.
+    """
     table = get_playbook_table()
-    items = _all_module_items(table, slug)
+    version = await run_sync(_update_module, table, slug, update, parse_if_match(if_match))
+    if version is not None:
+        response.headers["ETag"] = etag(version)
 
-    if not items:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Module not found")
+    return {"slug": slug, "message": "Module updated"}
 
-    # Delete all S3 assets (module + all problems)
-    delete_s3_objects(_collect_s3_keys(items))
 
-    # Batch delete all DynamoDB items (METADATA + all PROBLEM# items)
-    with table.batch_writer() as batch:
-        for item in items:
-            batch.delete_item(Key={"PK": item["PK"], "SK": item["SK"]})
+@router.patch("/api/playbook/{slug}", response_model=ContentPatchResponse)
+async def patch_module(
+    slug: str,
+    patch: ModulePatch,
+    response: Response,
+    if_match: str | None = Header(None),
+    _: Identity = Depends(require_scope("playbook:write")),
+):
+    """
+    Edit the module content — or with `problemId`, that problem's pseudocode —
+    with range edits or a unified diff. 412 if `baseSha256` (or If-Match) is
+    stale. Either way the module version is bumped.
+    """
+    if patch.problemId is None:
+        sk, field, not_found = "METADATA", "content", "Module not found"
+    else:
+        sk, field, not_found = _problem_sk(patch.problemId), "pseudocode", "Problem not found"
+
+    sha, version = await run_sync(
+        patch_attribute,
+        get_playbook_table(),
+        {"PK": _pk(slug), "SK": sk},
+        field,
+        patch,
+        _scope(slug, sk),
+        not_found,
+        parse_if_match(if_match),
+        {"PK": _pk(slug), "SK": "METADATA"},
+        "Module not found",
+    )
+    if version is not None:
+        response.headers["ETag"] = etag(version)
+    return ContentPatchResponse(slug=slug, sha256=sha, message="Module patched")
+
+
+@router.delete("/api/playbook/{slug}")
+async def delete_module(
+    slug: str,
+    if_match: str | None = Header(None),
+    _: Identity = Depends(require_scope("playbook:write")),
+):
+    table = get_playbook_table()
+    metadata_key = {"PK": _pk(slug), "SK": "METADATA"}
+
+    try:
+        # Claim the module first: this settles 404 / 412 before anything is
+        # deleted, and every guarded write to the module fails from here on.
+        # An interrupted delete leaves the claimed module for a retry to finish.
+        try:
+            await run_sync(table.update_item, Key=metadata_key, **delete_claim(parse_if_match(if_match)))
+        except table.meta.client.exceptions.ConditionalCheckFailedException as exc:
+            raise_condition_failed(exc, "Module not found")
+
+        # Stream the problems page by page — only keys are needed, and memory
+        # stays flat however many problems the module has
+        pages = _module_item_pages(table, slug, projection=["PK", "SK"])
+        while (page := await run_sync(next, pages, None)) is not None:
+            await run_sync(_delete_items, table, [item for item in page if item["SK"] != "METADATA"])
+
+        # The GC record commits with the metadata delete and names the module's
+        # prefixes, so its media (problems' included) and offloaded MDX are
+        # always queued, and nothing needs collecting
+        [record] = pending_records(
+            [], _pk(slug), [media_prefix("playbook", slug), content_prefix(_scope(slug))]
+        )
+        try:
+            await run_sync(transact_write, table, [
+                {"Delete": {
+                    "Key": metadata_key,
+                    "ConditionExpression": "#deleting = :true",
+                    "ExpressionAttributeNames": {"#deleting": DELETING_FIELD},
+                    "ExpressionAttributeValues": {":true": True},
+                }},
+                {"Put": {"TableName": get_gc_table().name, "Item": record}},
+            ])
+        except table.meta.client.exceptions.TransactionCanceledException as exc:
+            # Only a concurrent retry of this delete can have removed the claimed metadata
+            if cancellation_codes(exc)[:1] == ["ConditionalCheckFailed"]:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Module not found")
+            raise
+    finally:
+        invalidate_cached(table, _pk(slug))
 
     return {"slug": slug, "message": "Module deleted"}
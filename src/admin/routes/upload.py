@@ -9,11 +9,13 @@ Flow:
 
 from fastapi import APIRouter, Depends, HTTPException, status
 
-from shared.auth import verify_admin_token
+from shared.aio import run_sync
+from shared.auth import Identity, require_scope
 from shared.models import UploadUrlRequest, UploadUrlResponse
+from shared.ratelimit import enforce_rate_limit
 from shared.s3 import build_s3_key, generate_presigned_upload_url
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(enforce_rate_limit)])
 
 _ALLOWED_ENTITY_TYPES = {"blog", "playbook"}
 _ALLOWED_CONTENT_TYPES = {
@@ -26,7 +28,7 @@ _ALLOWED_CONTENT_TYPES = {
 
 
 @router.post("/api/upload-url", response_model=UploadUrlResponse)
-def get_upload_url(req: UploadUrlRequest, _: str = Depends(verify_admin_token)):
+async def get_upload_url(req: UploadUrlRequest, _: Identity = Depends(require_scope("upload"))):
     if req.entity_type not in _ALLOWED_ENTITY_TYPES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -46,6 +48,6 @@ def get_upload_url(req: UploadUrlRequest, _: str = Depends(verify_admin_token)):
         problem_id=req.problem_id,
     )
 
-    url = generate_presigned_upload_url(s3_key=s3_key, content_type=req.content_type)
+    url = await run_sync(generate_presigned_upload_url, s3_key=s3_key, content_type=req.content_type)
 
     return UploadUrlResponse(url=url, s3Key=s3_key, key=req.filename)
@@ -0,0 +1,45 @@
+"""Async facade over the blocking boto3 data layer.
+
+boto3 is synchronous. Rather than letting FastAPI run sync routes on AnyIO's
+shared worker threads (40 by default, also used by sync dependencies and
+streaming bodies), async routes hand each blocking call to a dedicated,
+bounded executor sized to the boto3 connection pool:
+
+    item = await run_sync(table.get_item, Key=key)
+
+Independent calls can then be awaited concurrently with asyncio.gather.
+The caller's contextvars are propagated into the worker thread.
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from shared.config import AWS_EXECUTOR_WORKERS
+
+T = TypeVar("T")
+
+_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=AWS_EXECUTOR_WORKERS, thread_name_prefix="aws"
+                )
+    return _executor
+
+
+async def run_sync(func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """Run a blocking call on the bounded AWS executor and await its result."""
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, func, *args, **kwargs)
+    return await loop.run_in_executor(_get_executor(), call)
@@ -0,0 +1,195 @@
+"""
+Registry of hashed, scoped API keys for automation clients.
+
+Keys look like "btf_" + 43 url-safe characters. Only their SHA-256 is stored,
+next to the first API_KEY_PREFIX_CHARS characters, which index the registry so
+a lookup is one dict access plus a constant-time digest compare per entry
+sharing that prefix (normally one). Entries come from two places, merged:
+
+    API_KEYS            JSON list in the environment, read once per process
+    API_KEYS_ITEM       PK of an item in the blog table (SK="METADATA") whose
+                        "keys" attribute holds the same list; re-read every
+                        API_KEYS_REFRESH_SECONDS so keys can be added or
+                        revoked without a deploy
+
+Each entry: {"name": "mcp-server", "prefix": "btf_a1B2c3D4", "sha256": "<hex>",
+"scopes": ["leetcode:sync"]}. Mint one with:
+
+    PYTHONPATH=src uv run python -m shared.apikeys <name> <scope> [<scope> ...]
+
+The legacy single MCP_API_KEY, if set, is registered as "mcp-server" with
+every scope.
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import secrets
+import sys
+import threading
+import time
+from dataclasses import dataclass
+
+from shared.config import (
+    API_KEYS,
+    API_KEYS_ITEM,
+    API_KEYS_REFRESH_SECONDS,
+    LOG_LEVEL,
+    MCP_API_KEY,
+)
+
+logger = logging.getLogger(__name__)
+logger.setLevel(LOG_LEVEL)
+
+API_KEY_MARKER = "btf_"
+API_KEY_PREFIX_CHARS = 12  # "btf_" + 8 random characters
+
+ALL_SCOPES = "*"
+SCOPES = (
+    "blog:read",
+    "blog:write",
+    "playbook:read",
+    "playbook:write",
+    "upload",
+    "leetcode:sync",
+    "export",
+    "metrics",
+)
+
+
+@dataclass(frozen=True)
+class ApiKey:
+    name: str
+    prefix: str
+    digest: bytes
+    scopes: frozenset[str]
+
+
+def _digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+def _parse_entry(entry: dict) -> ApiKey:
+    scopes = frozenset(entry.get("scopes", ()))
+    unknown = scopes - set(SCOPES) - {ALL_SCOPES}
+    if unknown:
+        raise ValueError(f"API key {entry['name']!r} has unknown scopes: {sorted(unknown)}")
+    return ApiKey(
+        name=entry["name"],
+        prefix=entry["prefix"],
+        digest=bytes.fromhex(entry["sha256"]),
+        scopes=scopes,
+    )
+
+
+def _static_keys() -> list[ApiKey]:
+    keys = [_parse_entry(entry) for entry in json.loads(API_KEYS)] if API_KEYS else []
+    if MCP_API_KEY:
+        keys.append(ApiKey(
+            name="mcp-server",
+            prefix=MCP_API_KEY[:API_KEY_PREFIX_CHARS],
+            digest=_digest(MCP_API_KEY),
+            scopes=frozenset({ALL_SCOPES}),
+        ))
+    return keys
+
+
+def _stored_keys() -> list[ApiKey]:
+    from shared.db import get_blog_table  # noqa: PLC0415  (boto3 only when a DynamoDB source is configured)
+
+    item = get_blog_table().get_item(
+        Key={"PK": API_KEYS_ITEM, "SK": "METADATA"},
+        ProjectionExpression="#k",
+        ExpressionAttributeNames={"#k": "keys"},
+    ).get("Item", {})
+    return [_parse_entry(entry) for entry in item.get("keys", [])]
+
+
+# ── Registry ─────────────────────────────────────────────────────────────────────
+
+
+class _Registry:
+    def __init__(self):
+        self._by_prefix: dict[str, list[ApiKey]] | None = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def _stale(self) -> bool:
+        if self._by_prefix is None:
+            return True
+        return bool(API_KEYS_ITEM) and time.monotonic() - self._loaded_at >= API_KEYS_REFRESH_SECONDS
+
+    def _load(self) -> None:
+        keys = _static_keys()
+        if API_KEYS_ITEM:
+            try:
+                keys += _stored_keys()
+            except Exception:
+                if self._by_prefix is not None:
+                    # Keep serving the previous keys; try again after the next refresh interval.
+                    logger.exception("API key refresh failed; keeping %d cached prefixes", len(self._by_prefix))
+                    self._loaded_at = time.monotonic()
+                    return
+                raise
+        by_prefix: dict[str, list[ApiKey]] = {}
+        for key in keys:
+            by_prefix.setdefault(key.prefix, []).append(key)
+        self._by_prefix = by_prefix
+        self._loaded_at = time.monotonic()
+
+    def keys(self) -> dict[str, list[ApiKey]]:
+        if self._stale():
+            with self._lock:
+                if self._stale():
+                    self._load()
+        return self._by_prefix
+
+    def clear(self) -> None:
+        with self._lock:
+            self._by_prefix = None
+
+
+_registry = _Registry()
+
+
+def has_api_keys() -> bool:
+    return bool(_registry.keys())
+
+
+def lookup_api_key(token: str) -> ApiKey | None:
+    """The registered key matching `token`, or None."""
+    candidates = _registry.keys().get(token[:API_KEY_PREFIX_CHARS], ())
+    digest = _digest(token)
+    match = None
+    for key in candidates:
+        # No early exit: the time taken must not depend on which candidate matched.
+        if hmac.compare_digest(key.digest, digest):
+            match = key
+    return match
+
+
+def reload_api_keys() -> None:
+    """Drop the loaded registry; the next lookup reads config and DynamoDB again. Test hook."""
+    _registry.clear()
+
+
+def new_api_key(name: str, scopes: list[str]) -> tuple[str, dict]:
+    """Mint a key. Returns the plaintext (shown once) and the registry entry to store."""
+    token = API_KEY_MARKER + secrets.token_urlsafe(32)
+    entry = {
+        "name": name,
+        "prefix": token[:API_KEY_PREFIX_CHARS],
+        "sha256": _digest(token).hex(),
+        "scopes": sorted(scopes),
+    }
+    _parse_entry(entry)  # validates the scopes
+    return token, entry
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        sys.exit(f"usage: python -m shared.apikeys <name> <scope> [<scope> ...]\nscopes: {', '.join(SCOPES)}, *")
+    token, entry = new_api_key(sys.argv[1], sys.argv[2:])
+    print(f"key:   {token}")
+    print(f"entry: {json.dumps(entry)}")
@@ -1,5 +1,5 @@
 """
-JWT validation for admin routes.
+JWT and API key validation for admin routes.
 
 The frontend (NextAuth.js) must send an HS256-signed JWT in the Authorization header:
 
@@ -13,62 +13,139 @@ Frontend reference (Next.js API route or server action):
         .setProtectedHeader({ alg: "HS256" })
         .setExpirationTime("1h")
         .sign(new TextEncoder().encode(process.env.NEXTAUTH_SECRET))
+
+The admin UI reuses one token for its whole lifetime, so verification results
+are cached per warm container, keyed by the token's SHA-256: accepted tokens
+until their "exp", rejected ones (401/403) for AUTH_CACHE_NEGATIVE_TTL_SECONDS.
+
+Automation clients send a "btf_" API key instead (see shared.apikeys). Routes
+declare what they need with require_scope("blog:write"); the admin JWT carries
+every scope, an API key only those it was registered with.
 """
 
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Callable
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import ExpiredSignatureError, JWTError, jwt
-
-from shared.config import ADMIN_EMAIL, NEXTAUTH_SECRET, MCP_API_KEY
+from shared.apikeys import ALL_SCOPES, API_KEY_MARKER, has_api_keys, lookup_api_key
+from shared.cache import CacheStats, TTLCache
+from shared.config import (
+    ADMIN_EMAIL,
+    AUTH_CACHE_MAX_ENTRIES,
+    AUTH_CACHE_NEGATIVE_TTL_SECONDS,
+    NEXTAUTH_SECRET,
+)
+from shared.jwt_backend import InvalidToken, TokenExpired, get_jwt_backend
 
 _security = HTTPBearer()
 
+# Accepted tokens without an "exp" claim are re-verified after this long
+_NO_EXP_TTL_SECONDS = 300.0
 
-def verify_admin_token(
+# sha256(token) -> verified email, or the HTTPException it was rejected with
+_token_cache = TTLCache(AUTH_CACHE_MAX_ENTRIES)
+
+
+@dataclass(frozen=True)
+class Identity:
+    name: str                 # admin email, or the API key's registered name
+    scopes: frozenset[str]
+    api_key: bool = False
+
+    def allows(self, scope: str) -> bool:
+        return ALL_SCOPES in self.scopes or scope in self.scopes
+
+
+def authenticate(
     credentials: HTTPAuthorizationCredentials = Depends(_security),
-) -> str:
+) -> Identity:
     """
-    Dependency injected into every admin route. Returns the verified admin email.
+    Resolve the bearer token to an Identity.
 
     Supports two authentication methods:
-    1. JWT tokens from NextAuth (for frontend)
-    2. Long-lived API keys (for MCP server and automation)
+    1. JWT tokens from NextAuth (for frontend) — every scope
+    2. Long-lived API keys (for MCP server and automation) — their registered scopes
     """
     token = credentials.credentials
 
-    # Check if it's an API key (starts with "btf_")
-    if token.startswith("btf_"):
-        if not MCP_API_KEY:
+    if token.startswith(API_KEY_MARKER):
+        if not has_api_keys():
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="MCP_API_KEY not configured",
+                detail="API keys not configured",
             )
-
-        if token == MCP_API_KEY:
-            return "mcp-server"  # Return a synthetic identity for API key auth
-        else:
+        key = lookup_api_key(token)
+        if key is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid API key",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+        return Identity(key.name, key.scopes, api_key=True)
+
+    return Identity(_verify_admin_jwt(token), frozenset({ALL_SCOPES}))
+
+
+def require_scope(scope: str) -> Callable[..., Identity]:
+    """Route dependency: the caller's Identity, or 403 if it lacks `scope`."""
+
+    def dependency(identity: Identity = Depends(authenticate)) -> Identity:
+        if not identity.allows(scope):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Missing scope: {scope}",
+            )
+        return identity
 
-    # Otherwise, validate as JWT
+    return dependency
+
+
+def verify_admin_token(
+    credentials: HTTPAuthorizationCredentials = Depends(_security),
+) -> str:
+    """Authenticate without a scope check. Returns the admin email or the API key's name."""
+    return authenticate(credentials).name
+
+
+def _verify_admin_jwt(token: str) -> str:
+    """The admin email from a NextAuth JWT, served from the token cache when possible."""
     if not NEXTAUTH_SECRET:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="NEXTAUTH_SECRET not configured",
         )
 
+    cache_key = hashlib.sha256(token.encode()).digest()
+    cached = _token_cache.get(cache_key)
+    if isinstance(cached, HTTPException):
+        raise HTTPException(cached.status_code, cached.detail, cached.headers)
+    if cached is not None:
+        return cached
+
     try:
-        payload = jwt.decode(token, NEXTAUTH_SECRET, algorithms=["HS256"])
-    except ExpiredSignatureError:
+        email, exp = _verify_jwt(token)
+    except HTTPException as exc:
+        _token_cache.set(cache_key, exc, AUTH_CACHE_NEGATIVE_TTL_SECONDS)
+        raise
+    ttl = exp - time.time() if exp is not None else _NO_EXP_TTL_SECONDS
+    _token_cache.set(cache_key, email, ttl)
+    return email
+
+
+def _verify_jwt(token: str) -> tuple[str, float | None]:
+    """Full signature and claim check. Returns the admin email and the token's exp, if any."""
+    try:
+        payload = get_jwt_backend().decode(token, NEXTAUTH_SECRET)
+    except TokenExpired:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token expired",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    except JWTError:
+    except InvalidToken:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token",
@@ -82,4 +159,14 @@ def verify_admin_token(
             detail="Not authorized",
         )
 
-    return email
+    exp = payload.get("exp")
+    return email, float(exp) if isinstance(exp, (int, float)) else None
+
+
+def token_cache_stats() -> CacheStats:
+    return _token_cache.stats()
+
+
+def clear_token_cache() -> None:
+    """Forget every verified and rejected token. Test hook."""
+    _token_cache.clear()
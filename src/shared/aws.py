@@ -0,0 +1,112 @@
+"""Process-wide registry of pooled boto3 clients and resources.
+
+Lambda keeps the execution environment alive between warm invocations, so
+each service gets exactly one tuned client per process: session construction,
+endpoint resolution and the TLS connection pool are paid on first use only.
+
+boto3/botocore are imported on first use rather than at module load: they
+are the largest part of the Lambda's import time, and routes such as /health
+never touch AWS.
+
+Tests must call reset_clients() whenever the mocked AWS backend changes, so the
+next caller builds a fresh client inside the active mock.
+"""
+
+import threading
+from typing import TYPE_CHECKING
+
+from shared.config import (
+    AWS_CONNECT_TIMEOUT,
+    AWS_MAX_ATTEMPTS,
+    AWS_MAX_POOL_CONNECTIONS,
+    AWS_READ_TIMEOUT,
+    AWS_REGION,
+    AWS_RETRY_MODE,
+    AWS_TCP_KEEPALIVE,
+    DYNAMODB_KWARGS,
+)
+from shared.metrics import instrument_client
+
+if TYPE_CHECKING:
+    import boto3
+    from botocore.config import Config
+
+# Services whose client is taken from the resource, so both share one pool.
+_RESOURCE_SERVICES = {"dynamodb"}
+
+_lock = threading.Lock()
+_session: "boto3.session.Session | None" = None
+_clients: dict[str, object] = {}
+_resources: dict[str, object] = {}
+
+
+def botocore_config() -> "Config":
+    """The botocore Config shared by every pooled client."""
+    from botocore.config import Config  # noqa: PLC0415
+
+    return Config(
+        region_name=AWS_REGION,
+        max_pool_connections=AWS_MAX_POOL_CONNECTIONS,
+        tcp_keepalive=AWS_TCP_KEEPALIVE,
+        connect_timeout=AWS_CONNECT_TIMEOUT,
+        read_timeout=AWS_READ_TIMEOUT,
+        retries={"mode": AWS_RETRY_MODE, "max_attempts": AWS_MAX_ATTEMPTS},
+    )
+
+
+def _service_kwargs(service: str) -> dict:
+    if service == "dynamodb":
+        return DYNAMODB_KWARGS
+    return {}
+
+
+def _get_session() -> "boto3.session.Session":
+    # Caller holds _lock — boto3 sessions are not safe to build clients from concurrently.
+    global _session
+    if _session is None:
+        import boto3.session  # noqa: PLC0415
+
+        _session = boto3.session.Session(region_name=AWS_REGION)
+    return _session
+
+
+def get_resource(service: str):
+    """Return the process-wide boto3 resource for `service`, creating it on first use."""
+    resource = _resources.get(service)
+    if resource is None:
+        with _lock:
+            resource = _resources.get(service)
+            if resource is None:
+                resource = _get_session().resource(
+                    service, config=botocore_config(), **_service_kwargs(service)
+                )
+                instrument_client(resource.meta.client)
+                _resources[service] = resource
+    return resource
+
+
+def get_client(service: str):
+    """Return the process-wide boto3 client for `service`, creating it on first use."""
+    if service in _RESOURCE_SERVICES:
+        return get_resource(service).meta.client
+
+    client = _clients.get(service)
+    if client is None:
+        with _lock:
+            client = _clients.get(service)
+            if client is None:
+                client = _get_session().client(
+                    service, config=botocore_config(), **_service_kwargs(service)
+                )
+                instrument_client(client)
+                _clients[service] = client
+    return client
+
+
+def reset_clients() -> None:
+    """Drop every pooled client/resource (and the session). Test hook."""
+    global _session
+    with _lock:
+        _clients.clear()
+        _resources.clear()
+        _session = None
@@ -0,0 +1,89 @@
+"""
+Bounded in-process LRU cache with per-entry TTL.
+
+Lambda keeps module state alive across warm invocations, so caches living
+here survive between requests served by the same container (and are simply
+empty after a cold start). Bounded by entry count and, optionally, by the
+total of caller-supplied entry sizes; the least recently used entries are
+evicted first. Thread-safe: routes run blocking work on shared.aio threads.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0      # dropped to respect max_entries / max_bytes
+    expirations: int = 0    # dropped because their TTL passed
+    invalidations: int = 0  # dropped explicitly by a writer
+    entries: int = 0
+    bytes: int = 0
+
+
+class TTLCache:
+    def __init__(self, max_entries: int, max_bytes: int | None = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, tuple[Any, float, int]] = OrderedDict()
+        self._bytes = 0
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats.misses += 1
+                return default
+            value, expires_at, _ = entry
+            if expires_at <= time.monotonic():
+                self._drop(key)
+                self._stats.expirations += 1
+                self._stats.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float, size: int = 0) -> None:
+        """Store `value` for `ttl` seconds. Entries larger than max_bytes are not cached."""
+        if ttl <= 0 or (self.max_bytes is not None and size > self.max_bytes):
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, time.monotonic() + ttl, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                self._drop(next(iter(self._entries)))
+                self._stats.evictions += 1
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+                self._stats.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._stats = CacheStats()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(**{
+                **self._stats.__dict__, "entries": len(self._entries), "bytes": self._bytes
+            })
+
+    def _drop(self, key: Hashable) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
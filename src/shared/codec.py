@@ -0,0 +1,115 @@
+"""
+Transparent compression of large MDX attributes.
+
+Post/module `content` and problem `pseudocode` can be long enough to cost
+many WCUs per write and to approach DynamoDB's 400 KB item limit. With
+CONTENT_COMPRESSION set to "gzip" or "zstd", values of at least
+CONTENT_COMPRESSION_MIN_BYTES are stored as Binary:
+
+    b"\\x00MDX" + <codec id: b"g" gzip | b"z" zstd> + <compressed UTF-8>
+
+Plain strings are left untouched, so existing items keep working and the
+setting can be switched off at any time — decode_item() reads both forms.
+zstd uses the stdlib `compression.zstd` (Python 3.14+) or the optional
+`zstandard` package, and falls back to gzip when neither is installed.
+"""
+
+import functools
+import gzip
+import logging
+
+from shared.config import CONTENT_COMPRESSION, CONTENT_COMPRESSION_MIN_BYTES
+
+logger = logging.getLogger(__name__)
+
+COMPRESSED_FIELDS = ("content", "pseudocode")
+
+_MAGIC = b"\x00MDX"
+_GZIP = b"g"
+_ZSTD = b"z"
+
+
+@functools.cache
+def _zstd_module():
+    try:
+        from compression import zstd  # noqa: PLC0415  (Python 3.14+)
+
+        return zstd
+    except ImportError:
+        pass
+    try:
+        import zstandard  # noqa: PLC0415
+
+        return zstandard
+    except ImportError:
+        return None
+
+
+def _zstd_compress(data: bytes) -> bytes:
+    # One-shot module-level call: a reused ZstdCompressor().compress() in
+    # compression.zstd only flushes on FLUSH_FRAME and would return a truncated frame
+    return _zstd_module().compress(data)
+
+
+def _zstd_decompress(data: bytes) -> bytes:
+    zstd = _zstd_module()
+    if zstd is None:
+        raise RuntimeError("Item is zstd-compressed but no zstd implementation is installed")
+    return zstd.decompress(data)
+
+
+@functools.cache
+def _warn_zstd_fallback() -> None:
+    logger.warning("CONTENT_COMPRESSION=zstd but no zstd implementation found; using gzip")
+
+
+def _resolve_codec(name: str) -> bytes | None:
+    if name == "gzip":
+        return _GZIP
+    if name == "zstd":
+        if _zstd_module() is not None:
+            return _ZSTD
+        _warn_zstd_fallback()
+        return _GZIP
+    return None
+
+
+def encode_value(text: str, codec: str | None = None, min_bytes: int | None = None):
+    """Compress `text` to marked bytes if the codec is on and it is big enough; else return it unchanged."""
+    codec_id = _resolve_codec(CONTENT_COMPRESSION if codec is None else codec)
+    min_bytes = CONTENT_COMPRESSION_MIN_BYTES if min_bytes is None else min_bytes
+    raw = text.encode("utf-8")
+    if codec_id is None or len(raw) < min_bytes:
+        return text
+    body = _zstd_compress(raw) if codec_id == _ZSTD else gzip.compress(raw, compresslevel=6, mtime=0)
+    if len(body) + len(_MAGIC) + 1 >= len(raw):
+        return text   # incompressible — keep the readable form
+    return _MAGIC + codec_id + body
+
+
+def is_encoded(data: bytes) -> bool:
+    """True if `data` is a value produced by encode_value."""
+    return data.startswith(_MAGIC)
+
+
+def decode_value(value):
+    """Inverse of encode_value. Strings (and any non-marked value) pass through."""
+    data = getattr(value, "value", value)   # boto3 returns Binary wrappers
+    if not isinstance(data, (bytes, bytearray)) or not data.startswith(_MAGIC):
+        return value
+    codec_id, body = data[len(_MAGIC):len(_MAGIC) + 1], data[len(_MAGIC) + 1:]
+    raw = _zstd_decompress(body) if codec_id == _ZSTD else gzip.decompress(body)
+    return raw.decode("utf-8")
+
+
+def encode_item(item: dict, **options) -> dict:
+    """Copy of `item` with COMPRESSED_FIELDS encoded. Works on full items and update dicts alike."""
+    return {
+        k: encode_value(v, **options) if k in COMPRESSED_FIELDS and isinstance(v, str) else v
+        for k, v in item.items()
+    }
+
+
+def decode_item(item: dict) -> dict:
+    """Copy of `item` with any compressed COMPRESSED_FIELDS restored to strings."""
+    return {k: decode_value(v) if k in COMPRESSED_FIELDS else v for k, v in item.items()}
@@ -5,15 +5,99 @@ AWS_REGION = os.getenv("AWS_REGION", "us-west-2")
 
 BLOG_TABLE = os.getenv("DYNAMODB_BLOG_TABLE", "blog")
 PLAYBOOK_TABLE = os.getenv("DYNAMODB_PLAYBOOK_TABLE", "playbook")
+# Pending S3 deletions (shared.gc) live under PK="GC#QUEUE" in this table
+GC_TABLE = os.getenv("DYNAMODB_GC_TABLE", BLOG_TABLE)
+# Shared rate-limit windows (shared.ratelimit) live under PK="RATELIMIT#<identity>"
+RATE_LIMIT_TABLE = os.getenv("DYNAMODB_RATE_LIMIT_TABLE", BLOG_TABLE)
 S3_BUCKET = os.getenv("S3_BUCKET", "botthef-content-bucket")
 
 DYNAMODB_ENDPOINT = os.getenv("DYNAMODB_ENDPOINT")  # local only (http://localhost:8002)
 
 ADMIN_EMAIL = os.getenv("ADMIN_EMAIL", "")
 NEXTAUTH_SECRET = os.getenv("NEXTAUTH_SECRET", "")
-MCP_API_KEY = os.getenv("MCP_API_KEY", "")
+MCP_API_KEY = os.getenv("MCP_API_KEY", "")  # legacy single key; registered with every scope
+
+# Hashed, scoped API keys (shared.apikeys): a JSON list in the environment and/or
+# the "keys" attribute of PK=API_KEYS_ITEM, SK="METADATA" in the blog table
+API_KEYS = os.getenv("API_KEYS", "")
+API_KEYS_ITEM = os.getenv("API_KEYS_ITEM", "")  # e.g. "AUTH#APIKEYS"; empty disables
+API_KEYS_REFRESH_SECONDS = float(os.getenv("API_KEYS_REFRESH_SECONDS", "300"))
 
 # Injected into boto3 calls when running locally
 DYNAMODB_KWARGS: dict = {}
 if ENV == "local" and DYNAMODB_ENDPOINT:
     DYNAMODB_KWARGS["endpoint_url"] = DYNAMODB_ENDPOINT
+
+# botocore client tuning — applied once to the pooled clients in shared.aws
+AWS_MAX_POOL_CONNECTIONS = int(os.getenv("AWS_MAX_POOL_CONNECTIONS", "50"))
+AWS_TCP_KEEPALIVE = os.getenv("AWS_TCP_KEEPALIVE", "true").lower() == "true"
+AWS_CONNECT_TIMEOUT = float(os.getenv("AWS_CONNECT_TIMEOUT", "3"))
+AWS_READ_TIMEOUT = float(os.getenv("AWS_READ_TIMEOUT", "10"))
+AWS_RETRY_MODE = os.getenv("AWS_RETRY_MODE", "standard")  # "legacy" | "standard" | "adaptive"
+AWS_MAX_ATTEMPTS = int(os.getenv("AWS_MAX_ATTEMPTS", "3"))
+
+# Worker threads backing shared.aio — bounds in-flight blocking boto3 calls per process
+AWS_EXECUTOR_WORKERS = int(os.getenv("AWS_EXECUTOR_WORKERS", str(AWS_MAX_POOL_CONNECTIONS)))
+
+# Bulk S3 deletes — chunks of 1000 keys dispatched in parallel, failed keys retried
+S3_DELETE_CONCURRENCY = int(os.getenv("S3_DELETE_CONCURRENCY", "4"))
+S3_DELETE_MAX_ATTEMPTS = int(os.getenv("S3_DELETE_MAX_ATTEMPTS", "3"))
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+
+# Heavy dependencies (boto3, httpx, python-jose) load on first use. Set to "true"
+# to import them during Lambda init instead, e.g. with provisioned concurrency.
+PRELOAD_DEPENDENCIES = os.getenv("PRELOAD_DEPENDENCIES", "false").lower() == "true"
+
+# Upper bound on posts accepted by one POST /api/blog/bulk request
+BLOG_BULK_MAX_POSTS = int(os.getenv("BLOG_BULK_MAX_POSTS", "1000"))
+
+# GET /api/export — parallel Scan segments (default and upper bound)
+EXPORT_SCAN_SEGMENTS = int(os.getenv("EXPORT_SCAN_SEGMENTS", "4"))
+EXPORT_MAX_SEGMENTS = int(os.getenv("EXPORT_MAX_SEGMENTS", "16"))
+
+# HMAC key for opaque pagination cursors (falls back to NEXTAUTH_SECRET)
+CURSOR_SECRET = os.getenv("CURSOR_SECRET", "") or NEXTAUTH_SECRET
+
+# Warm-container read cache for posts/modules (shared.db); TTL 0 disables it
+ITEM_CACHE_TTL_SECONDS = float(os.getenv("ITEM_CACHE_TTL_SECONDS", "60"))
+ITEM_CACHE_MAX_ENTRIES = int(os.getenv("ITEM_CACHE_MAX_ENTRIES", "1000"))
+ITEM_CACHE_MAX_BYTES = int(os.getenv("ITEM_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+
+# HS256 verifier for admin JWTs (shared.jwt_backend): "stdlib" | "jose" (needs the jose extra)
+JWT_BACKEND = os.getenv("JWT_BACKEND", "stdlib").lower()
+
+# Verified-JWT cache (shared.auth): accepted tokens are kept until their exp,
+# rejected ones for the negative TTL; 0 entries disables it
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "256"))
+AUTH_CACHE_NEGATIVE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_NEGATIVE_TTL_SECONDS", "30"))
+
+# Opt-in compression of large MDX attributes (shared.codec): "off" | "gzip" | "zstd"
+CONTENT_COMPRESSION = os.getenv("CONTENT_COMPRESSION", "off").lower()
+CONTENT_COMPRESSION_MIN_BYTES = int(os.getenv("CONTENT_COMPRESSION_MIN_BYTES", "4096"))
+
+# Attributes that would push an item past this size are moved to S3 (shared.offload);
+# DynamoDB's hard item limit is 400 KB
+CONTENT_OFFLOAD_BYTES = int(os.getenv("CONTENT_OFFLOAD_BYTES", str(350 * 1024)))
+
+# Deferred S3 cleanup queue (shared.gc, drained by admin.gc.handler)
+GC_DRAIN_BATCH_KEYS = int(os.getenv("GC_DRAIN_BATCH_KEYS", "5000"))   # keys per drain round
+GC_MAX_ATTEMPTS = int(os.getenv("GC_MAX_ATTEMPTS", "10"))             # then moved to GC#DEAD
+
+# Per-identity token buckets (shared.ratelimit): RATE_LIMIT_RATE cost units refill per
+# second up to RATE_LIMIT_BURST; a rate of 0 disables limiting
+RATE_LIMIT_RATE = float(os.getenv("RATE_LIMIT_RATE", "10"))
+RATE_LIMIT_BURST = float(os.getenv("RATE_LIMIT_BURST", "100"))
+RATE_LIMIT_IDENTITIES = os.getenv("RATE_LIMIT_IDENTITIES", "")  # {"mcp-server": {"rate": 2, "burst": 20}}
+RATE_LIMIT_COSTS = os.getenv("RATE_LIMIT_COSTS", "")            # {"POST /api/blog/bulk": 50}
+# Also enforce limits across Lambda instances with DynamoDB window counters
+RATE_LIMIT_SHARED = os.getenv("RATE_LIMIT_SHARED", "false").lower() == "true"
+RATE_LIMIT_WINDOW_SECONDS = int(os.getenv("RATE_LIMIT_WINDOW_SECONDS", "60"))
+
+# LeetCode GraphQL client (shared.leetcode)
+LEETCODE_GRAPHQL_URL = os.getenv("LEETCODE_GRAPHQL_URL", "https://leetcode.com/graphql")
+LEETCODE_TIMEOUT_SECONDS = float(os.getenv("LEETCODE_TIMEOUT_SECONDS", "5"))     # per attempt
+LEETCODE_DEADLINE_SECONDS = float(os.getenv("LEETCODE_DEADLINE_SECONDS", "10"))  # all attempts
+LEETCODE_MAX_RETRIES = int(os.getenv("LEETCODE_MAX_RETRIES", "3"))               # on 429 / 5xx / network
+LEETCODE_BREAKER_THRESHOLD = int(os.getenv("LEETCODE_BREAKER_THRESHOLD", "5"))   # failed syncs in a row
+LEETCODE_BREAKER_COOLDOWN_SECONDS = float(os.getenv("LEETCODE_BREAKER_COOLDOWN_SECONDS", "30"))
@@ -0,0 +1,55 @@
+"""
+Opaque, signed pagination cursors.
+
+A cursor wraps a DynamoDB LastEvaluatedKey so clients can page without
+seeing (or forging) key values:
+
+    <base64url(json payload)>.<base64url(HMAC-SHA256 tag)>
+
+The payload also carries a scope string (e.g. the sort order) so a cursor
+issued for one query is rejected by another. Key values must be strings,
+which holds for every table key in this project.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+
+from shared.config import CURSOR_SECRET
+
+_TAG_BYTES = 16
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _tag(payload: bytes) -> bytes:
+    return hmac.new(CURSOR_SECRET.encode(), payload, hashlib.sha256).digest()[:_TAG_BYTES]
+
+
+def encode_cursor(key: dict[str, str], scope: str = "") -> str:
+    """Sign a LastEvaluatedKey into an opaque cursor string."""
+    payload = json.dumps({"k": key, "s": scope}, separators=(",", ":"), sort_keys=True).encode()
+    return f"{_b64encode(payload)}.{_b64encode(_tag(payload))}"
+
+
+def decode_cursor(cursor: str, scope: str = "") -> dict[str, str]:
+    """Verify a cursor and return its ExclusiveStartKey. Raises ValueError if tampered or out of scope."""
+    try:
+        payload_text, tag_text = cursor.split(".")
+        payload = _b64decode(payload_text)
+        tag = _b64decode(tag_text)
+    except ValueError:
+        raise ValueError("Malformed cursor")
+    if not hmac.compare_digest(tag, _tag(payload)):
+        raise ValueError("Invalid cursor signature")
+    data = json.loads(payload)
+    if data.get("s") != scope:
+        raise ValueError("Cursor does not belong to this query")
+    return data["k"]
@@ -1,14 +1,31 @@
-"""DynamoDB resource helpers and update expression builder."""
+"""DynamoDB resource helpers, read cache, update expression builder and transaction writer."""
 
+import contextvars
+import copy
+import queue
+import threading
 from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Iterator
 
-import boto3
-
-from shared.config import AWS_REGION, BLOG_TABLE, DYNAMODB_KWARGS, PLAYBOOK_TABLE
+from shared.aws import get_resource
+from shared.cache import CacheStats, TTLCache
+from shared.codec import decode_item
+from shared.config import (
+    BLOG_TABLE,
+    GC_TABLE,
+    ITEM_CACHE_MAX_BYTES,
+    ITEM_CACHE_MAX_ENTRIES,
+    ITEM_CACHE_TTL_SECONDS,
+    PLAYBOOK_TABLE,
+    RATE_LIMIT_TABLE,
+)
+from shared.metrics import record_cache_lookup
+from shared.offload import load_offloaded
 
 
 def _dynamodb():
-    return boto3.resource("dynamodb", region_name=AWS_REGION, **DYNAMODB_KWARGS)
+    return get_resource("dynamodb")
 
 
 def get_blog_table():
@@ -19,6 +36,14 @@ def get_playbook_table():
     return _dynamodb().Table(PLAYBOOK_TABLE)
 
 
+def get_gc_table():
+    return _dynamodb().Table(GC_TABLE)
+
+
+def get_rate_limit_table():
+    return _dynamodb().Table(RATE_LIMIT_TABLE)
+
+
 def now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
@@ -44,3 +69,346 @@ def build_update_expression(data: dict) -> tuple[str, dict, dict]:
         values[val_ph] = value
 
     return "SET " + ", ".join(parts), names, values
+
+
+def estimate_item_size(item: dict) -> int:
+    """
+    Approximate DynamoDB item size in bytes (attribute names + values), per
+    the published sizing rules. Pure Python, no serialization — cheap enough
+    to run on every write.
+    """
+    return sum(len(name.encode()) + _value_size(value) for name, value in item.items())
+
+
+def _value_size(value) -> int:
+    if isinstance(value, str):
+        return len(value.encode())
+    if isinstance(value, bool) or value is None:
+        return 1
+    if isinstance(value, (int, float, Decimal)):
+        return (len(str(value).lstrip("-").replace(".", "")) + 1) // 2 + 1
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if hasattr(value, "value") and isinstance(value.value, bytes):   # boto3 Binary
+        return len(value.value)
+    if isinstance(value, dict):
+        return 3 + sum(len(k.encode()) + 1 + _value_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return 3 + sum(1 + _value_size(v) for v in value)
+    return len(str(value).encode())
+
+
+# ── Reads ──────────────────────────────────────────────────────────────────────
+
+def _projection_params(projection: list[str] | None) -> dict:
+    """ProjectionExpression kwargs with every attribute aliased (avoids reserved words)."""
+    if not projection:
+        return {}
+    names = {f"#p{i}": attr for i, attr in enumerate(projection)}
+    return {"ProjectionExpression": ", ".join(names), "ExpressionAttributeNames": names}
+
+
+def query_pages(table, projection: list[str] | None = None, **kwargs) -> Iterator[list[dict]]:
+    """
+    Yield the items of a Query one page at a time, following LastEvaluatedKey.
+
+    Only one page (at most 1 MB of data, or `Limit` items) is held at a time,
+    so callers can process arbitrarily large item collections in flat memory.
+    """
+    params = _projection_params(projection)
+    if params:
+        kwargs["ProjectionExpression"] = params["ProjectionExpression"]
+        kwargs["ExpressionAttributeNames"] = {
+            **kwargs.get("ExpressionAttributeNames", {}),
+            **params["ExpressionAttributeNames"],
+        }
+    while True:
+        response = table.query(**kwargs)
+        yield response.get("Items", [])
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            return
+        kwargs["ExclusiveStartKey"] = last_key
+
+
+_SCAN_FINISHED = object()
+
+
+def _scan_segment(table, segment: int, total_segments: int, pages: queue.Queue, stop: threading.Event) -> None:
+    def _put(entry) -> bool:
+        while not stop.is_set():
+            try:
+                pages.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    kwargs = {"Segment": segment, "TotalSegments": total_segments}
+    try:
+        while not stop.is_set():
+            response = table.scan(**kwargs)
+            if not _put(response.get("Items", [])):
+                return
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                return
+            kwargs["ExclusiveStartKey"] = last_key
+    except Exception as exc:  # surfaced to the consumer by __next__
+        _put(exc)
+    finally:
+        _put(_SCAN_FINISHED)
+
+
+class ParallelScan:
+    """
+    Iterator over the pages of a segmented parallel Scan, as they arrive (in no particular order).
+
+    One worker thread per segment feeds a bounded queue, so at most
+    `max_buffered_pages` pages plus one in-flight page per worker are held in
+    memory. A worker's exception is re-raised here. close() stops all workers;
+    unlike a generator's, it may be called from any thread, even while another
+    thread is blocked in next() — which then ends the iteration.
+    """
+
+    def __init__(self, table, total_segments: int, max_buffered_pages: int = 8):
+        # Workers only share the queue and the event, so an abandoned iterator
+        # is still collected (and its workers stopped)
+        self._pages: queue.Queue = queue.Queue(maxsize=max_buffered_pages)
+        self._stop = threading.Event()
+        self._running = total_segments
+        for segment in range(total_segments):
+            threading.Thread(
+                target=contextvars.copy_context().run,
+                args=(_scan_segment, table, segment, total_segments, self._pages, self._stop),
+                name=f"scan-{segment}",
+                daemon=True,
+            ).start()
+
+    def __iter__(self) -> "ParallelScan":
+        return self
+
+    def __next__(self) -> list[dict]:
+        while self._running and not self._stop.is_set():
+            try:
+                entry = self._pages.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if entry is _SCAN_FINISHED:
+                self._running -= 1
+            elif isinstance(entry, Exception):
+                self.close()
+                raise entry
+            else:
+                return entry
+        self.close()
+        raise StopIteration
+
+    def close(self) -> None:
+        self._stop.set()
+
+    __del__ = close
+
+
+def parallel_scan(table, total_segments: int, max_buffered_pages: int = 8) -> ParallelScan:
+    """Start a ParallelScan of `table` over `total_segments` segments."""
+    return ParallelScan(table, total_segments, max_buffered_pages)
+
+
+# ── Read cache ─────────────────────────────────────────────────────────────────
+#
+# Posts and modules change rarely and a warm container serves many requests,
+# so single-item reads (METADATA) and whole-module reads are cached per
+# process by (table, PK, SK) — "*" stands for a module's full item
+# collection. Every route that writes an entity calls invalidate_cached()
+# for its PK. Other containers only see the change once their TTL expires.
+
+_item_cache = TTLCache(ITEM_CACHE_MAX_ENTRIES, ITEM_CACHE_MAX_BYTES)
+_COLLECTION = "*"
+
+
+def _cached(cache_key: tuple, load, size) -> object:
+    value = _item_cache.get(cache_key)
+    record_cache_lookup(hit=value is not None)
+    if value is None:
+        value = load()
+        if value:
+            _item_cache.set(cache_key, value, ITEM_CACHE_TTL_SECONDS, size=size(value))
+    # Callers get their own copy so they can't corrupt the cached entry
+    return copy.deepcopy(value)
+
+
+def _decoded(item: dict | None) -> dict | None:
+    """Resolve S3 pointers and decompress — the stored form back to plain attributes."""
+    return decode_item(load_offloaded(item)) if item else item
+
+
+def get_item_cached(table, key: dict) -> dict | None:
+    """get_item through the read cache. Missing items are not cached."""
+    return _cached(
+        (table.name, key["PK"], key["SK"]),
+        lambda: _decoded(table.get_item(Key=key).get("Item")),
+        estimate_item_size,
+    )
+
+
+def query_collection_cached(table, pk: str) -> list[dict]:
+    """Every item under `pk` (e.g. a module's METADATA + PROBLEM# items) through the read cache."""
+    def load() -> list[dict]:
+        pages = query_pages(
+            table,
+            KeyConditionExpression="#pk = :pk",
+            ExpressionAttributeNames={"#pk": "PK"},
+            ExpressionAttributeValues={":pk": pk},
+        )
+        return [_decoded(item) for page in pages for item in page]
+
+    return _cached(
+        (table.name, pk, _COLLECTION),
+        load,
+        lambda items: sum(estimate_item_size(i) for i in items),
+    )
+
+
+def invalidate_cached(table, pk: str) -> None:
+    """Drop every cached read of `pk` — call after any write to that entity."""
+    _item_cache.pop((table.name, pk, "METADATA"))
+    _item_cache.pop((table.name, pk, _COLLECTION))
+
+
+def item_cache_stats() -> CacheStats:
+    return _item_cache.stats()
+
+
+def clear_item_cache() -> None:
+    """Empty the read cache and reset its counters. Test hook."""
+    _item_cache.clear()
+
+
+BATCH_GET_MAX_KEYS = 100  # DynamoDB hard limit per BatchGetItem call
+
+
+def batch_get(table, keys: list[dict], projection: list[str] | None = None) -> list[dict]:
+    """
+    Fetch many items from `table` by key with chunked BatchGetItem calls.
+
+    UnprocessedKeys are retried until drained. Missing items are simply absent
+    from the result, which is unordered. `projection` limits the attributes
+    returned; key attributes must be listed if the caller needs them.
+    """
+    client = table.meta.client
+    request = _projection_params(projection)
+
+    items: list[dict] = []
+    for start in range(0, len(keys), BATCH_GET_MAX_KEYS):
+        pending = {table.name: {**request, "Keys": keys[start:start + BATCH_GET_MAX_KEYS]}}
+        while pending:
+            response = client.batch_get_item(RequestItems=pending)
+            items.extend(response.get("Responses", {}).get(table.name, []))
+            pending = response.get("UnprocessedKeys") or {}
+    return items
+
+
+# ── Transactions ───────────────────────────────────────────────────────────────
+
+TRANSACT_MAX_ACTIONS = 100         # DynamoDB hard limit per TransactWriteItems call
+TRANSACT_MAX_BYTES = 4_000_000     # under the 4 MB aggregate limit, with room for estimate error
+
+
+def _with_table_name(table_name: str, action: dict) -> dict:
+    # The resource's client serializes plain Python values itself, so only
+    # the table name needs to be filled in. An explicit TableName wins, so
+    # one transaction can span tables.
+    (op, params), = action.items()
+    return {op: {"TableName": table_name, **params}}
+
+
+def _transaction_chunks(actions: list[dict]) -> list[list[dict]]:
+    """Split `actions` into runs that each fit one TransactWriteItems, by count and size."""
+    chunks: list[list[dict]] = []
+    chunk: list[dict] = []
+    size = 0
+    for action in actions:
+        # Counts keys, values and expressions alike: an overestimate, which is the safe side
+        (params,) = action.values()
+        action_size = estimate_item_size(params)
+        if chunk and (len(chunk) == TRANSACT_MAX_ACTIONS or size + action_size > TRANSACT_MAX_BYTES):
+            chunks.append(chunk)
+            chunk, size = [], 0
+        chunk.append(action)
+        size += action_size
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def transact_write(table, actions: list[dict]) -> None:
+    """
+    Write `actions` against `table` with TransactWriteItems.
+
+    Each action is a single-key dict in resource form, e.g.
+        {"Put": {"Item": {...}, "ConditionExpression": "attribute_not_exists(PK)"}}
+    An action may name another table with its own "TableName".
+
+    Past TRANSACT_MAX_ACTIONS actions or TRANSACT_MAX_BYTES (estimated) the
+    actions are committed in consecutive chunks: each chunk is atomic, but the
+    whole list is not. Put guard conditions first so a failed guard cancels
+    before anything is written.
+    """
+    client = table.meta.client
+    for chunk in _transaction_chunks(actions):
+        client.transact_write_items(
+            TransactItems=[_with_table_name(table.name, a) for a in chunk]
+        )
+
+
+def write_actions(table, actions: list[dict]) -> None:
+    """
+    Commit resource-style write actions in as few round trips as possible.
+
+    Actions that fit one transaction (TRANSACT_MAX_ACTIONS, TRANSACT_MAX_BYTES)
+    go out as one atomic TransactWriteItems. Past that, Update actions and
+    conditional Put/Delete actions run first as individual calls (so a failed
+    guard stops the write early), then plain Put/Delete actions go through
+    batch_writer at 25 items per call. An action's own "TableName" is honoured
+    on both paths. ConditionCheck actions have no single-item equivalent, so
+    they raise ValueError there (before anything is written); use
+    transact_write instead.
+    """
+    if len(_transaction_chunks(actions)) <= 1:
+        if actions:
+            transact_write(table, actions)
+        return
+    if any("ConditionCheck" in action for action in actions):
+        raise ValueError("ConditionCheck actions cannot be enforced past one transaction")
+
+    tables = {table.name: table}
+    batched: dict[str, list[tuple[str, dict]]] = {}
+    for action in actions:
+        (op, params), = action.items()
+        # Honour an action's own TableName, as transact_write does
+        name = params.get("TableName", table.name)
+        if name not in tables:
+            tables[name] = _dynamodb().Table(name)
+        target = tables[name]
+        params = {k: v for k, v in params.items() if k != "TableName"}
+        if op == "Update":
+            target.update_item(**params)
+        elif "ConditionExpression" in params:
+            getattr(target, f"{op.lower()}_item")(**params)
+        else:
+            batched.setdefault(name, []).append((op, params))
+
+    for name, writes in batched.items():
+        with tables[name].batch_writer() as batch:
+            for op, params in writes:
+                if op == "Put":
+                    batch.put_item(Item=params["Item"])
+                else:
+                    batch.delete_item(Key=params["Key"])
+
+
+def cancellation_codes(exc: Exception) -> list[str]:
+    """Per-action reason codes from a TransactionCanceledException ("None" = action was fine)."""
+    reasons = getattr(exc, "response", {}).get("CancellationReasons", [])
+    return [r.get("Code", "None") for r in reasons]
@@ -0,0 +1,171 @@
+"""
+Deferred S3 garbage collection.
+
+Requests never delete S3 objects inline. Routes enqueue the keys (media,
+offloaded bodies) or key prefixes (an entity's whole offload area) they
+orphan as records in GC_TABLE — the blog table unless configured:
+
+    PK="GC#QUEUE"  SK="<ISO timestamp>#<uuid4 hex>"
+    s3Keys=[...]  s3Prefixes=[...]  source="BLOG#<slug>"  attempts=0  createdAt=<ISO>
+
+Enqueueing is one PutItem however many assets an entity has (records split
+at GC_RECORD_MAX_KEYS keys), so request latency no longer depends on asset
+count or S3 health. drain() — run by the admin.gc Lambda on a schedule —
+pages through the queue, deletes up to GC_DRAIN_BATCH_KEYS keys per round
+with shared.s3's parallel, retrying delete_objects, then removes the drained
+records. Keys that still fail are re-enqueued with attempts + 1, and after
+GC_MAX_ATTEMPTS they move to PK="GC#DEAD" for inspection.
+
+Prefixes only match objects last written before the record was created, so
+an entity recreated under the same slug keeps its new objects. Deletes are
+idempotent, so overlapping drains are harmless.
+"""
+
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import chain
+
+from shared.config import GC_DRAIN_BATCH_KEYS, GC_MAX_ATTEMPTS
+from shared.db import get_gc_table, now_iso, query_pages
+from shared.s3 import delete_s3_objects, list_s3_keys
+
+logger = logging.getLogger(__name__)
+
+QUEUE_PK = "GC#QUEUE"
+DEAD_PK = "GC#DEAD"
+GC_RECORD_MAX_KEYS = 1000   # ~100 KB of keys, well under the 400 KB item limit
+
+
+def _record(pk: str, source: str, attempts: int, keys: list[str], prefixes: list[str]) -> dict:
+    ts = now_iso()
+    record: dict = {
+        "PK": pk,
+        "SK": f"{ts}#{uuid.uuid4().hex}",
+        "source": source,
+        "attempts": attempts,
+        "createdAt": ts,
+    }
+    if keys:
+        record["s3Keys"] = keys
+    if prefixes:
+        record["s3Prefixes"] = prefixes
+    return record
+
+
+def pending_records(
+    s3_keys: list[str], source: str, s3_prefixes: list[str] = (), attempts: int = 0
+) -> list[dict]:
+    """Queue records for `s3_keys` / `s3_prefixes`, split to stay within the item size limit."""
+    keys = list(dict.fromkeys(s3_keys))
+    prefixes = list(dict.fromkeys(s3_prefixes))
+    if not keys and not prefixes:
+        return []
+    pk = QUEUE_PK if attempts < GC_MAX_ATTEMPTS else DEAD_PK
+    chunks = [keys[i:i + GC_RECORD_MAX_KEYS] for i in range(0, len(keys), GC_RECORD_MAX_KEYS)]
+    return [
+        _record(pk, source, attempts, chunk, prefixes if i == 0 else [])
+        for i, chunk in enumerate(chunks or [[]])
+    ]
+
+
+def enqueue(s3_keys: list[str], source: str, s3_prefixes: list[str] = ()) -> None:
+    """
+    Queue S3 objects for deletion. No-op if there is nothing to delete.
+    `source` names the entity they belonged to, e.g. "BLOG#<slug>". Blocking.
+    """
+    records = pending_records(s3_keys, source, s3_prefixes)
+    table = get_gc_table()
+    if len(records) == 1:
+        table.put_item(Item=records[0])
+    elif records:
+        with table.batch_writer() as batch:
+            for record in records:
+                batch.put_item(Item=record)
+
+
+# ── Drain ──────────────────────────────────────────────────────────────────────
+
+@dataclass
+class DrainResult:
+    records: int = 0    # queue records processed
+    deleted: int = 0    # S3 keys confirmed deleted
+    requeued: int = 0   # keys re-enqueued for another attempt
+    dead: int = 0       # keys moved to GC#DEAD
+
+
+def _expand(record: dict) -> list[str]:
+    """The record's keys plus whatever its prefixes matched when it was enqueued."""
+    keys = list(record.get("s3Keys", []))
+    if record.get("s3Prefixes"):
+        # S3 reports LastModified in whole seconds: objects from the enqueue's own
+        # second are spared (a possible leak) rather than risked
+        cutoff = datetime.fromisoformat(record["createdAt"]).replace(microsecond=0)
+        for prefix in record["s3Prefixes"]:
+            keys += list_s3_keys(prefix, modified_before=cutoff)
+    return keys
+
+
+def _drain_batch(table, records: list[dict], expanded: dict[str, list[str]], result: DrainResult) -> None:
+    keys = [key for record in records for key in expanded[record["SK"]]]
+    failed = set(delete_s3_objects(keys).failed)
+    result.records += len(records)
+    result.deleted += len(set(keys) - failed)
+
+    with table.batch_writer() as batch:
+        for record in records:
+            retry = [key for key in expanded[record["SK"]] if key in failed]
+            for new in pending_records(retry, record["source"], attempts=int(record.get("attempts", 0)) + 1):
+                batch.put_item(Item=new)
+                if new["PK"] == DEAD_PK:
+                    result.dead += len(new["s3Keys"])
+                    logger.error("Giving up on %d S3 keys from %s", len(new["s3Keys"]), record["source"])
+                else:
+                    result.requeued += len(new["s3Keys"])
+            batch.delete_item(Key={"PK": record["PK"], "SK": record["SK"]})
+
+
+def drain(
+    max_records: int | None = None,
+    batch_keys: int = GC_DRAIN_BATCH_KEYS,
+    time_budget: float | None = None,
+) -> DrainResult:
+    """
+    Delete queued S3 objects, oldest records first. Stops after `max_records`
+    records or once `time_budget` seconds have passed (checked between rounds).
+    Only records queued before the drain started are visited: retries it
+    re-enqueues sort later and wait for the next run. Blocking.
+    """
+    table = get_gc_table()
+    started = now_iso()
+    deadline = None if time_budget is None else time.monotonic() + time_budget
+    result = DrainResult()
+    batch: list[dict] = []
+    expanded: dict[str, list[str]] = {}
+    batch_size = 0
+
+    pages = query_pages(
+        table,
+        KeyConditionExpression="#pk = :pk AND #sk < :started",
+        ExpressionAttributeNames={"#pk": "PK", "#sk": "SK"},
+        ExpressionAttributeValues={":pk": QUEUE_PK, ":started": started},
+    )
+    try:
+        for record in chain.from_iterable(pages):
+            if max_records is not None and result.records + len(batch) >= max_records:
+                break
+            expanded[record["SK"]] = _expand(record)
+            batch.append(record)
+            batch_size += len(expanded[record["SK"]])
+            if batch_size >= batch_keys:
+                _drain_batch(table, batch, expanded, result)
+                batch, expanded, batch_size = [], {}, 0
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
+        if batch:
+            _drain_batch(table, batch, expanded, result)
+    finally:
+        pages.close()
+    return result
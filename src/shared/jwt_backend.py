@@ -0,0 +1,134 @@
+"""
+Pluggable HS256 JWT verification for shared.auth.
+
+Two backends, picked by JWT_BACKEND:
+
+    stdlib   (default) hmac/hashlib/json only — no import cost beyond the
+             standard library, and a few microseconds per verification
+    jose     python-jose, for parity checks; install the "jose" extra
+
+Both accept exactly the tokens python-jose's jwt.decode(token, key,
+algorithms=["HS256"]) accepts with default options: the header must say
+HS256, "exp" and "nbf" are checked in whole seconds without leeway, "iat",
+"sub" and "jti" must be well-formed when present, and any "aud" claim is
+rejected because no audience is configured.
+"""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import time
+from functools import cache
+from typing import Protocol
+
+from shared.config import JWT_BACKEND
+
+
+class InvalidToken(Exception):
+    """Malformed token, bad signature or invalid claim."""
+
+
+class TokenExpired(InvalidToken):
+    """Well-formed, correctly signed token past its "exp"."""
+
+
+class JWTBackend(Protocol):
+    def decode(self, token: str, secret: str) -> dict:
+        """Verified claims of an HS256 `token`. Raises TokenExpired or InvalidToken."""
+        ...
+
+
+# ── stdlib ──────────────────────────────────────────────────────────────────────
+
+
+def _b64decode(segment: str) -> bytes:
+    try:
+        return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+    except (binascii.Error, ValueError) as exc:
+        raise InvalidToken("Invalid base64 segment") from exc
+
+
+def _json_object(segment: str) -> dict:
+    try:
+        value = json.loads(_b64decode(segment))
+    except (UnicodeDecodeError, ValueError) as exc:
+        raise InvalidToken("Invalid JSON segment") from exc
+    if not isinstance(value, dict):
+        raise InvalidToken("Segment is not a JSON object")
+    return value
+
+
+def _numeric_claim(claims: dict, name: str) -> int | None:
+    if name not in claims:
+        return None
+    try:
+        return int(claims[name])
+    except (TypeError, ValueError) as exc:
+        raise InvalidToken(f"Claim {name!r} must be an integer") from exc
+
+
+def _validate_claims(claims: dict) -> None:
+    now = int(time.time())
+    _numeric_claim(claims, "iat")
+    nbf = _numeric_claim(claims, "nbf")
+    if nbf is not None and nbf > now:
+        raise InvalidToken("The token is not yet valid (nbf)")
+    exp = _numeric_claim(claims, "exp")
+    if exp is not None and exp < now:
+        raise TokenExpired("Signature has expired")
+    if "aud" in claims:
+        raise InvalidToken("Invalid audience")
+    for name in ("sub", "jti"):
+        if name in claims and not isinstance(claims[name], str):
+            raise InvalidToken(f"Claim {name!r} must be a string")
+
+
+class StdlibHS256:
+    def decode(self, token: str, secret: str) -> dict:
+        parts = token.split(".")
+        if len(parts) != 3:
+            raise InvalidToken("Not enough segments")
+        header_b64, payload_b64, signature_b64 = parts
+        if _json_object(header_b64).get("alg") != "HS256":
+            raise InvalidToken("The specified alg value is not allowed")
+        expected = hmac.new(secret.encode(), f"{header_b64}.{payload_b64}".encode(), hashlib.sha256).digest()
+        if not hmac.compare_digest(expected, _b64decode(signature_b64)):
+            raise InvalidToken("Signature verification failed")
+        claims = _json_object(payload_b64)
+        _validate_claims(claims)
+        return claims
+
+
+# ── python-jose ─────────────────────────────────────────────────────────────────
+
+
+class JoseHS256:
+    def __init__(self):
+        # Imported here, not at module level: jose pulls in cryptography
+        from jose import ExpiredSignatureError, JWTError, jwt  # noqa: PLC0415
+
+        self._jwt = jwt
+        self._expired = ExpiredSignatureError
+        self._error = JWTError
+
+    def decode(self, token: str, secret: str) -> dict:
+        try:
+            return self._jwt.decode(token, secret, algorithms=["HS256"])
+        except self._expired as exc:
+            raise TokenExpired(str(exc)) from exc
+        except self._error as exc:
+            raise InvalidToken(str(exc)) from exc
+
+
+BACKENDS: dict[str, type] = {"stdlib": StdlibHS256, "jose": JoseHS256}
+
+
+@cache
+def get_jwt_backend(name: str | None = None) -> JWTBackend:
+    """The configured backend (JWT_BACKEND), built once per process."""
+    name = name or JWT_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown JWT_BACKEND {name!r}; expected one of {sorted(BACKENDS)}")
+    return BACKENDS[name]()
@@ -0,0 +1,179 @@
+"""
+Async client for LeetCode's public GraphQL API.
+
+One httpx.AsyncClient per event loop keeps a keep-alive connection to
+LEETCODE_GRAPHQL_URL between syncs in a warm container (Mangum reuses its
+loop across invocations; a new loop gets a new client, as pooled
+connections cannot cross loops). httpx is imported on first use.
+
+A query is retried on 429, 5xx and network errors with full-jitter
+exponential backoff (or the server's Retry-After), each attempt bounded by
+LEETCODE_TIMEOUT_SECONDS and all of them by LEETCODE_DEADLINE_SECONDS.
+
+A process-wide circuit breaker opens after LEETCODE_BREAKER_THRESHOLD
+queries in a row fail and then rejects queries with CircuitOpen for
+LEETCODE_BREAKER_COOLDOWN_SECONDS, after which one trial query is let
+through: success closes the circuit, failure re-opens it.
+"""
+
+import asyncio
+import logging
+import random
+import time
+
+from shared.config import (
+    LEETCODE_BREAKER_COOLDOWN_SECONDS,
+    LEETCODE_BREAKER_THRESHOLD,
+    LEETCODE_DEADLINE_SECONDS,
+    LEETCODE_GRAPHQL_URL,
+    LEETCODE_MAX_RETRIES,
+    LEETCODE_TIMEOUT_SECONDS,
+    LOG_LEVEL,
+)
+
+logger = logging.getLogger(__name__)
+logger.setLevel(LOG_LEVEL)
+
+BACKOFF_BASE_SECONDS = 0.25
+BACKOFF_MAX_SECONDS = 4.0
+
+_HEADERS = {
+    "Content-Type": "application/json",
+    "Referer": "https://leetcode.com",
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+}
+
+
+class LeetCodeError(Exception):
+    """The query failed: network error, bad status or malformed response."""
+
+
+class CircuitOpen(LeetCodeError):
+    def __init__(self, retry_after: float):
+        super().__init__(f"LeetCode circuit open; retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+# ── Circuit breaker ─────────────────────────────────────────────────────────────
+
+
+class CircuitBreaker:
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: float | None = None
+
+    def check(self) -> None:
+        """Raise CircuitOpen while open. After the cooldown, let one trial through."""
+        if self.opened_at is None:
+            return
+        remaining = self.opened_at + self.cooldown - time.monotonic()
+        if remaining > 0:
+            raise CircuitOpen(remaining)
+        self.opened_at = time.monotonic()   # concurrent callers wait for the trial's outcome
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.threshold:
+            if self.opened_at is None:
+                logger.warning("LeetCode circuit opened after %d failed queries", self.failures)
+            self.opened_at = time.monotonic()
+
+    def reset(self) -> None:
+        self.record_success()
+
+
+_breaker = CircuitBreaker(LEETCODE_BREAKER_THRESHOLD, LEETCODE_BREAKER_COOLDOWN_SECONDS)
+
+
+# ── Client ──────────────────────────────────────────────────────────────────────
+
+
+def _retry_after(response) -> float | None:
+    try:
+        return min(float(response.headers["Retry-After"]), BACKOFF_MAX_SECONDS)
+    except (KeyError, ValueError):
+        return None
+
+
+class LeetCodeClient:
+    def __init__(self, url: str | None = None, breaker: CircuitBreaker | None = None):
+        import httpx  # noqa: PLC0415  (deferred: only the sync route needs it)
+
+        self.url = url or LEETCODE_GRAPHQL_URL
+        self.breaker = breaker or _breaker
+        self._httpx = httpx
+        self._client = httpx.AsyncClient(
+            headers=_HEADERS,
+            timeout=LEETCODE_TIMEOUT_SECONDS,
+            limits=httpx.Limits(max_connections=4, max_keepalive_connections=2),
+        )
+
+    async def query(self, query: str, variables: dict) -> dict:
+        """POST a GraphQL query and return the decoded JSON body."""
+        self.breaker.check()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + LEETCODE_DEADLINE_SECONDS
+        attempt = 0
+        while True:
+            retry_after = None
+            try:
+                response = await self._client.post(
+                    self.url,
+                    json={"query": query, "variables": variables},
+                    timeout=min(LEETCODE_TIMEOUT_SECONDS, max(deadline - loop.time(), 0.001)),
+                )
+                if response.status_code == 429 or response.status_code >= 500:
+                    error = LeetCodeError(f"HTTP {response.status_code}")
+                    retry_after = _retry_after(response)
+                elif response.status_code >= 400:
+                    self.breaker.record_failure()
+                    raise LeetCodeError(f"HTTP {response.status_code}")
+                else:
+                    body = response.json()
+                    self.breaker.record_success()
+                    return body
+            except self._httpx.TransportError as exc:
+                error = LeetCodeError(f"{type(exc).__name__}: {exc}".rstrip(": "))
+            except ValueError as exc:
+                self.breaker.record_failure()
+                raise LeetCodeError(f"Invalid JSON response: {exc}") from exc
+
+            attempt += 1
+            delay = retry_after if retry_after is not None else random.uniform(
+                0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** (attempt - 1))
+            )
+            if attempt > LEETCODE_MAX_RETRIES or loop.time() + delay >= deadline:
+                self.breaker.record_failure()
+                raise error
+            logger.info("LeetCode query failed (%s); retry %d in %.2fs", error, attempt, delay)
+            await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+_clients: dict[asyncio.AbstractEventLoop, LeetCodeClient] = {}
+
+
+def get_leetcode_client() -> LeetCodeClient:
+    """The pooled client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        # Clients of finished loops hold no usable connections; drop them.
+        for stale in [other for other in _clients if other.is_closed()]:
+            del _clients[stale]
+        client = _clients[loop] = LeetCodeClient()
+    return client
+
+
+def reset_leetcode_client() -> None:
+    """Forget pooled clients and close the circuit. Test hook."""
+    _clients.clear()
+    _breaker.reset()
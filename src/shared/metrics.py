@@ -0,0 +1,194 @@
+"""
+Per-request AWS call instrumentation via botocore event hooks.
+
+shared.aws calls instrument_client() on every pooled client. While a request
+is being tracked (AwsMetricsMiddleware, or track_aws_calls() in scripts and
+tests), each boto3 call adds its latency, retry count and DynamoDB
+ConsumedCapacity to the current RequestStats. The middleware then adds a
+Server-Timing header to the response and logs a one-line summary:
+
+    PUT /api/playbook/two-pointers 200 total=41.2ms aws=2 calls/35.0ms retries=0 capacity=6 cache=0/0 ops=dynamodb:BatchGetItem,dynamodb:TransactWriteItems
+
+Calls made outside a tracked request are not recorded.
+"""
+
+import contextlib
+import contextvars
+import logging
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from starlette.datastructures import MutableHeaders
+
+from shared.config import LOG_LEVEL
+
+logger = logging.getLogger(__name__)
+logger.setLevel(LOG_LEVEL)
+
+_START_KEY = "metrics_start"
+
+
+@dataclass
+class RequestStats:
+    """AWS activity attributed to one request. Updated from worker threads, so guarded by a lock."""
+
+    calls: int = 0
+    retries: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    consumed_capacity: float = 0.0
+    seconds_by_service: Counter = field(default_factory=Counter)
+    operations: Counter = field(default_factory=Counter)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, service: str, operation: str, seconds: float, retries: int, capacity: float) -> None:
+        with self._lock:
+            self.calls += 1
+            self.retries += retries
+            self.consumed_capacity += capacity
+            self.seconds_by_service[service] += seconds
+            self.operations[f"{service}:{operation}"] += 1
+
+    def record_cache(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+
+    @property
+    def aws_seconds(self) -> float:
+        return sum(self.seconds_by_service.values())
+
+    def server_timing(self, total_seconds: float) -> str:
+        entries = [
+            f'{service};dur={seconds * 1000:.1f};desc="{self._service_calls(service)} calls"'
+            for service, seconds in sorted(self.seconds_by_service.items())
+        ]
+        entries.append(f"total;dur={total_seconds * 1000:.1f}")
+        return ", ".join(entries)
+
+    def summary(self) -> str:
+        ops = ",".join(
+            op if n == 1 else f"{op}x{n}" for op, n in sorted(self.operations.items())
+        )
+        return (
+            f"aws={self.calls} calls/{self.aws_seconds * 1000:.1f}ms "
+            f"retries={self.retries} capacity={self.consumed_capacity:g} "
+            f"cache={self.cache_hits}/{self.cache_hits + self.cache_misses} ops={ops or '-'}"
+        )
+
+    def _service_calls(self, service: str) -> int:
+        return sum(n for op, n in self.operations.items() if op.startswith(f"{service}:"))
+
+
+_current: contextvars.ContextVar[RequestStats | None] = contextvars.ContextVar(
+    "aws_request_stats", default=None
+)
+
+
+@contextlib.contextmanager
+def track_aws_calls() -> Iterator[RequestStats]:
+    """Attribute every AWS call made in this context (and threads it spawns via shared.aio) to one RequestStats."""
+    stats = RequestStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def record_cache_lookup(hit: bool) -> None:
+    """Count a read-cache lookup against the current request, if one is tracked."""
+    stats = _current.get()
+    if stats is not None:
+        stats.record_cache(hit)
+
+
+# ── botocore event handlers ────────────────────────────────────────────────────
+
+def _request_consumed_capacity(params: dict, model, **_) -> None:
+    if "ReturnConsumedCapacity" in model.input_shape.members:
+        params.setdefault("ReturnConsumedCapacity", "TOTAL")
+
+
+def _before_call(model, context: dict, **_) -> None:
+    context[_START_KEY] = (model, time.perf_counter())
+
+
+def _capacity_units(parsed: dict) -> float:
+    consumed = parsed.get("ConsumedCapacity")
+    if isinstance(consumed, dict):
+        consumed = [consumed]
+    return float(sum(c.get("CapacityUnits", 0) for c in consumed or []))
+
+
+def _after_call(context: dict, parsed: dict | None = None, **_) -> None:
+    # after-call-error (the request itself raised) passes neither model nor
+    # parsed, so the model comes from _before_call
+    stats = _current.get()
+    started = context.get(_START_KEY)
+    if stats is None or started is None:
+        return
+    model, start = started
+    parsed = parsed or {}
+    stats.record(
+        service=model.service_model.service_name,
+        operation=model.name,
+        seconds=time.perf_counter() - start,
+        retries=parsed.get("ResponseMetadata", {}).get("RetryAttempts", 0),
+        capacity=_capacity_units(parsed),
+    )
+
+
+def instrument_client(client) -> None:
+    """Register the timing/retry/capacity hooks on a boto3 client."""
+    service = client.meta.service_model.service_name
+    events = client.meta.events
+    if service == "dynamodb":
+        events.register("before-parameter-build.dynamodb", _request_consumed_capacity)
+    events.register(f"before-call.{service}", _before_call)
+    events.register(f"after-call.{service}", _after_call)
+    events.register(f"after-call-error.{service}", _after_call)
+
+
+# ── ASGI middleware ────────────────────────────────────────────────────────────
+
+class AwsMetricsMiddleware:
+    """Track AWS calls per HTTP request, add a Server-Timing header and log a summary line."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        with track_aws_calls() as stats:
+
+            async def send_with_timing(message):
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", stats.server_timing(time.perf_counter() - start))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                logger.info(
+                    "%s %s %d total=%.1fms %s",
+                    scope["method"],
+                    scope["path"],
+                    status_code,
+                    (time.perf_counter() - start) * 1000,
+                    stats.summary(),
+                )
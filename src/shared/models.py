@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 from typing import Optional
 
 
@@ -31,6 +31,41 @@ class PostUpdate(BaseModel):
     media: Optional[list[Media]] = None
 
 
+class PostSummary(BaseModel):
+    """Listing projection of a post — everything except the MDX body."""
+
+    slug: str
+    title: str
+    date: str
+    excerpt: str
+    tags: list[str]
+    media: list[Media] = []
+    createdAt: Optional[str] = None
+    updatedAt: Optional[str] = None
+
+
+class Post(PostSummary):
+    content: str
+
+
+class PostListResponse(BaseModel):
+    posts: list[PostSummary]
+    cursor: Optional[str] = None   # pass back as ?cursor= for the next page; None on the last page
+
+
+class BulkPostResult(BaseModel):
+    slug: Optional[str] = None   # None when the entry could not be parsed at all
+    status: str                  # "created" | "conflict" | "invalid"
+    detail: Optional[str] = None
+
+
+class BulkPostResponse(BaseModel):
+    created: int
+    conflict: int
+    invalid: int
+    results: list[BulkPostResult]   # one per submitted entry, in request order
+
+
 # ── Playbook ───────────────────────────────────────────────────────────────────
 
 class ProblemCreate(BaseModel):
@@ -58,6 +93,11 @@ class ProblemUpdate(BaseModel):
     nextReview: Optional[str] = None
 
 
+class Problem(ProblemCreate):
+    createdAt: Optional[str] = None
+    updatedAt: Optional[str] = None
+
+
 class ModuleCreate(BaseModel):
     slug: str
     title: str
@@ -68,6 +108,20 @@ class ModuleCreate(BaseModel):
     problems: list[ProblemCreate] = []   # optional initial problems
 
 
+class Module(BaseModel):
+    """A module as stored, with all of its problems."""
+
+    slug: str
+    title: str
+    description: str
+    content: str
+    order: int
+    media: list[Media] = []
+    problems: list[Problem] = []
+    createdAt: Optional[str] = None
+    updatedAt: Optional[str] = None
+
+
 class ModuleUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
@@ -79,6 +133,38 @@ class ModuleUpdate(BaseModel):
     delete_problem_ids: Optional[list[str]] = None          # delete by LeetCode id
 
 
+# ── Content patches ────────────────────────────────────────────────────────────
+
+class TextEdit(BaseModel):
+    start: int       # offset into the base content, in Unicode code points
+    end: int         # exclusive; start == end inserts
+    text: str = ""   # replacement; "" deletes the range
+
+
+class ContentPatch(BaseModel):
+    """A change to an MDX body, made against a known version of it. Exactly one of edits / diff."""
+
+    baseSha256: str                          # hex SHA-256 of the UTF-8 base content
+    edits: Optional[list[TextEdit]] = None   # non-overlapping, offsets relative to the base
+    diff: Optional[str] = None               # unified diff (diff -u / difflib.unified_diff)
+
+    @model_validator(mode="after")
+    def _one_format(self):
+        if (self.edits is None) == (self.diff is None):
+            raise ValueError("Provide exactly one of 'edits' or 'diff'")
+        return self
+
+
+class ModulePatch(ContentPatch):
+    problemId: Optional[str] = None   # patch this problem's pseudocode instead of the module content
+
+
+class ContentPatchResponse(BaseModel):
+    slug: str
+    sha256: str      # hash of the new content — the baseSha256 for the next patch
+    message: str
+
+
 # ── LeetCode ───────────────────────────────────────────────────────────────────
 
 class LeetCodeSyncRequest(BaseModel):
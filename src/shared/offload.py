@@ -0,0 +1,91 @@
+"""
+S3 offload of oversized MDX attributes.
+
+DynamoDB rejects items over 400 KB, and every byte of a large `content` is
+paid for again on each read. When an item (after shared.codec compression)
+is estimated above CONTENT_OFFLOAD_BYTES, its largest MDX attributes are
+written to S3 and replaced by a small Binary pointer:
+
+    b"\\x00S3R" + <S3 key, UTF-8>
+
+Keys are unique per write and scoped to the owning entity,
+
+    content/<scope>/<field>/<uuid4 hex>
+
+e.g. content/blog/<slug>/content/<uuid>. A replaced body is queued for deletion
+(shared.gc) and drained later, so keys are never reused: writing the same bytes
+again before the drain runs must not resurrect a key that is about to be
+deleted. Everything an entity ever offloaded can be swept by prefix when it is
+deleted. Pointers are resolved lazily, only by
+reads that need the body (single-item GET, export); listings never see them.
+"""
+
+import uuid
+
+from shared.codec import COMPRESSED_FIELDS, is_encoded
+from shared.config import CONTENT_OFFLOAD_BYTES
+from shared.s3 import get_s3_object, put_s3_object
+
+_POINTER = b"\x00S3R"
+
+
+def content_prefix(scope: str) -> str:
+    """S3 prefix holding every body offloaded for `scope` (e.g. "blog/<slug>")."""
+    return f"content/{scope}/"
+
+
+def _raw(value) -> bytes | None:
+    data = getattr(value, "value", value)   # boto3 returns Binary wrappers
+    return bytes(data) if isinstance(data, (bytes, bytearray)) else None
+
+
+def _pointer_key(value) -> str | None:
+    data = _raw(value)
+    if data is None or not data.startswith(_POINTER):
+        return None
+    return data[len(_POINTER):].decode("utf-8")
+
+
+def offload_item(item: dict, scope: str, limit: int | None = None) -> dict:
+    """
+    Copy of `item` with MDX attributes moved to S3, largest first, until the
+    estimated size fits under `limit`. Works on full items and on the field
+    dicts fed to build_update_expression. Uploads happen before the caller
+    writes to DynamoDB, so a stored pointer never dangles.
+    """
+    from shared.db import estimate_item_size  # noqa: PLC0415  (shared.db reads through this module)
+
+    limit = CONTENT_OFFLOAD_BYTES if limit is None else limit
+    if estimate_item_size(item) <= limit:
+        return item
+
+    result = dict(item)
+    fields = [f for f in COMPRESSED_FIELDS if isinstance(result.get(f), (str, bytes))]
+    for field in sorted(fields, key=lambda f: estimate_item_size({f: result[f]}), reverse=True):
+        if estimate_item_size(result) <= limit:
+            break
+        value = result[field]
+        body = value if isinstance(value, bytes) else value.encode("utf-8")
+        key = f"{content_prefix(scope)}{field}/{uuid.uuid4().hex}"
+        put_s3_object(key, body)
+        result[field] = _POINTER + key.encode("utf-8")
+    return result
+
+
+def load_offloaded(item: dict) -> dict:
+    """Copy of `item` with S3 pointers replaced by the stored values (still codec-encoded)."""
+    result = dict(item)
+    for field in COMPRESSED_FIELDS:
+        key = _pointer_key(result.get(field))
+        if key is None:
+            continue
+        body = get_s3_object(key)
+        result[field] = body if is_encoded(body) else body.decode("utf-8")
+    return result
+
+
+def offloaded_keys(item: dict) -> list[str]:
+    """S3 keys referenced by the pointers in `item`."""
+    keys = (_pointer_key(item.get(field)) for field in COMPRESSED_FIELDS)
+    return [key for key in keys if key is not None]
+
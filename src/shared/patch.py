@@ -0,0 +1,244 @@
+"""
+Server-side application of content patches — PATCH /api/blog/{slug} and
+PATCH /api/playbook/{slug}.
+
+A patch names the SHA-256 of the content it was made against and carries
+either JSON range edits or a unified diff. The current value is read
+(consistently, through the S3 offload and compression layers), its hash is
+checked, the patch is applied, and the result is written back through the
+same encode → offload path as a full PUT. The write is conditional on the
+stored value being unchanged, so two editors patching the same base cannot
+both win: the loser gets 412 and re-fetches.
+"""
+
+import hashlib
+import re
+
+from fastapi import HTTPException, status
+
+from shared.codec import decode_item, encode_item
+from shared.db import (
+    build_update_expression,
+    cancellation_codes,
+    invalidate_cached,
+    now_iso,
+    transact_write,
+)
+from shared.gc import enqueue
+from shared.models import ContentPatch, TextEdit
+from shared.offload import load_offloaded, offload_item, offloaded_keys
+from shared.versioning import (
+    item_existed,
+    next_version,
+    raise_condition_failed,
+    versioned_update,
+)
+
+_HUNK = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+class PatchError(ValueError):
+    """The patch is malformed or does not fit the base content."""
+
+
+def content_sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+# ── Patch formats ──────────────────────────────────────────────────────────────
+
+def apply_edits(text: str, edits: list[TextEdit]) -> str:
+    """Apply range edits whose offsets all refer to the original `text`."""
+    out: list[str] = []
+    cursor = 0
+    for edit in sorted(edits, key=lambda e: (e.start, e.end)):
+        if not 0 <= edit.start <= edit.end <= len(text):
+            raise PatchError(f"Edit range {edit.start}..{edit.end} is outside the content")
+        if edit.start < cursor:
+            raise PatchError(f"Edit at {edit.start} overlaps the previous edit")
+        out += [text[cursor:edit.start], edit.text]
+        cursor = edit.end
+    out.append(text[cursor:])
+    return "".join(out)
+
+
+def _parse_hunks(diff: str) -> list[tuple[int, list[tuple[str, str]]]]:
+    """Split a unified diff into (old start line, [(op, line), ...]) hunks."""
+    lines = diff.splitlines(keepends=True)
+    hunks = []
+    i = 0
+    while i < len(lines):
+        match = _HUNK.match(lines[i])
+        i += 1
+        if not match:
+            continue   # file headers (---/+++), "diff", "index", ...
+        old_start, old_len, _, new_len = (
+            int(g) if g is not None else 1 for g in match.groups()
+        )
+        body: list[tuple[str, str]] = []
+        old_left, new_left = old_len, new_len
+        while old_left > 0 or new_left > 0 or (i < len(lines) and lines[i].startswith("\\")):
+            if i >= len(lines):
+                raise PatchError("Diff ends in the middle of a hunk")
+            line = lines[i]
+            i += 1
+            if line.startswith("\\"):   # "\ No newline at end of file"
+                if body:
+                    op, prev = body[-1]
+                    body[-1] = (op, prev.removesuffix("\n"))
+                continue
+            op, content = (line[0], line[1:]) if line.strip("\r\n") else (" ", line)
+            if op not in " -+":
+                raise PatchError(f"Unexpected line in hunk: {line!r}")
+            old_left -= op in " -"
+            new_left -= op in " +"
+            body.append((op, content))
+        # A pure insertion names the line *after which* it goes
+        hunks.append((old_start - 1 if old_len else old_start, body))
+    if not hunks:
+        raise PatchError("Diff contains no hunks")
+    return hunks
+
+
+def apply_unified_diff(text: str, diff: str) -> str:
+    """Apply a single-file unified diff. Context must match exactly — there is no fuzz."""
+    base = text.splitlines(keepends=True)
+    out: list[str] = []
+    cursor = 0
+    for n, (start, body) in enumerate(_parse_hunks(diff), 1):
+        if start < cursor or start > len(base):
+            raise PatchError(f"Hunk {n} is out of order or past the end of the content")
+        out += base[cursor:start]
+        cursor = start
+        for op, line in body:
+            if op == "+":
+                out.append(line)
+                continue
+            if cursor >= len(base) or base[cursor] != line:
+                raise PatchError(f"Hunk {n} does not apply at line {cursor + 1}")
+            if op == " ":
+                out.append(line)
+            cursor += 1
+    out += base[cursor:]
+    return "".join(out)
+
+
+def apply_patch(text: str, patch: ContentPatch) -> str:
+    if patch.edits is not None:
+        return apply_edits(text, patch.edits)
+    return apply_unified_diff(text, patch.diff)
+
+
+# ── DynamoDB ───────────────────────────────────────────────────────────────────
+
+def _base_guard(item: dict, field: str) -> tuple[str, dict, dict]:
+    """Condition that `field` still holds the value read from `item`.
+
+    Comparing the raw attribute detects any write since the read: inline values
+    are the text itself or its mtime-free gzip, and an offloaded value points
+    at a fresh uuid4 S3 key, so every write of it stores a different pointer.
+    """
+    if field in item:
+        return "#base = :base", {"#base": field}, {":base": item[field]}
+    return "attribute_not_exists(#base)", {"#base": field}, {}
+
+
+def patch_attribute(
+    table,
+    key: dict,
+    field: str,
+    patch: ContentPatch,
+    scope: str,
+    not_found: str,
+    expected_version: int | None = None,
+    version_key: dict | None = None,
+    version_not_found: str | None = None,
+) -> tuple[str, int | None]:
+    """
+    Apply `patch` to the MDX attribute `field` of the item at `key`. Returns
+    the new content hash and the new version, or None for the version when it
+    cannot be known without a re-read.
+
+    `scope` is the shared.offload scope of the item and `expected_version`
+    comes from If-Match. By default the patched item carries its own version.
+    When `version_key` names another item (e.g. a problem inside a module),
+    that item's version is bumped and checked in the same transaction, and
+    `version_not_found` is the 404 detail used when it is missing. Blocking:
+    call through run_sync.
+    """
+    item = table.get_item(
+        Key=key,
+        ConsistentRead=True,
+        ProjectionExpression="#pk, #f",
+        ExpressionAttributeNames={"#pk": "PK", "#f": field},
+    ).get("Item")
+    if not item:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=not_found)
+
+    current = decode_item(load_offloaded(item)).get(field, "")
+    if content_sha256(current) != patch.baseSha256.lower():
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=f"Content has changed; current sha256 is {content_sha256(current)}",
+        )
+    try:
+        text = apply_patch(current, patch)
+    except PatchError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(exc))
+
+    ts = now_iso()
+    data = offload_item(encode_item({field: text, "updatedAt": ts}), scope)
+    guard, guard_names, guard_values = _base_guard(item, field)
+    changed = HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="Content or version changed while the patch was being applied",
+    )
+    client = table.meta.client
+    try:
+        if version_key is None or version_key == key:
+            params = versioned_update(data, expected_version)
+            params["ConditionExpression"] += f" AND {guard}"
+            params["ExpressionAttributeNames"].update(guard_names)
+            params["ExpressionAttributeValues"].update(guard_values)
+            try:
+                response = table.update_item(Key=key, **params, ReturnValues="UPDATED_OLD")
+            except client.exceptions.ConditionalCheckFailedException as exc:
+                if not item_existed(exc):
+                    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=not_found)
+                raise changed
+            version = next_version(response.get("Attributes", {}))
+        else:
+            expr, names, values = build_update_expression(data)
+            actions = [
+                {"Update": {"Key": version_key, **versioned_update({"updatedAt": ts}, expected_version)}},
+                {"Update": {
+                    "Key": key,
+                    "UpdateExpression": expr,
+                    "ConditionExpression": f"attribute_exists(#pk) AND {guard}",
+                    "ExpressionAttributeNames": {**names, **guard_names, "#pk": "PK"},
+                    "ExpressionAttributeValues": {**values, **guard_values},
+                    "ReturnValuesOnConditionCheckFailure": "ALL_OLD",
+                }},
+            ]
+            try:
+                transact_write(table, actions)
+            except client.exceptions.TransactionCanceledException as exc:
+                codes = cancellation_codes(exc)
+                if codes[:1] == ["ConditionalCheckFailed"]:
+                    raise_condition_failed(exc, version_not_found or not_found)
+                if codes[1:2] == ["ConditionalCheckFailed"]:
+                    if "Item" not in exc.response["CancellationReasons"][1]:
+                        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=not_found)
+                    raise changed
+                raise
+            version = None if expected_version is None else expected_version + 1
+    finally:
+        invalidate_cached(table, key["PK"])
+        if version_key is not None:
+            invalidate_cached(table, version_key["PK"])
+
+    # The guard proved the replaced value was the one read above
+    replaced = set(offloaded_keys(item)) - set(offloaded_keys(data))
+    if replaced:
+        enqueue(sorted(replaced), key["PK"])
+    return content_sha256(text), version
@@ -0,0 +1,175 @@
+"""
+Per-identity rate limiting for admin routes.
+
+Every admin router depends on enforce_rate_limit, which charges the route's
+cost to the caller's identity (the admin email, or the API key's name such
+as "mcp-server") and answers 429 with Retry-After once it runs dry, so a
+runaway automation loop cannot starve the human admin of write capacity.
+
+Costs default to 1 for reads and 2 for writes, with ROUTE_COSTS for the
+expensive routes; RATE_LIMIT_COSTS overrides them per "METHOD /path".
+
+Two layers:
+
+    in-process   a token bucket per identity (RATE_LIMIT_RATE per second up to
+                 RATE_LIMIT_BURST, overridable per identity). Free, but each
+                 warm Lambda container has its own.
+    shared       with RATE_LIMIT_SHARED=true, also a fixed-window counter per
+                 identity in RATE_LIMIT_TABLE, bumped with one conditional
+                 UpdateItem (ADD) per request, capped at what the bucket allows
+                 over RATE_LIMIT_WINDOW_SECONDS and expired through the table's
+                 TTL on "expiresAt". Requests the local bucket rejects never
+                 reach DynamoDB. If DynamoDB errors, the request is let through.
+"""
+
+import json
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from functools import cache
+
+from fastapi import Depends, HTTPException, Request, status
+
+from shared.aio import run_sync
+from shared.auth import Identity, authenticate
+from shared.config import (
+    LOG_LEVEL,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_COSTS,
+    RATE_LIMIT_IDENTITIES,
+    RATE_LIMIT_RATE,
+    RATE_LIMIT_SHARED,
+    RATE_LIMIT_WINDOW_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+logger.setLevel(LOG_LEVEL)
+
+READ_COST = 1
+WRITE_COST = 2
+ROUTE_COSTS = {
+    "POST /api/blog/bulk": 25,
+    "GET /api/export": 25,
+    "POST /api/leetcode/sync": 5,
+}
+
+
+@dataclass(frozen=True)
+class Limit:
+    rate: float    # cost units refilled per second
+    burst: float   # bucket size
+
+
+@cache
+def _parse_json(raw: str) -> dict:
+    return json.loads(raw) if raw else {}
+
+
+def limit_for(identity: str) -> Limit | None:
+    """The identity's limit, or None if it is not limited."""
+    override = _parse_json(RATE_LIMIT_IDENTITIES).get(identity, {})
+    limit = Limit(float(override.get("rate", RATE_LIMIT_RATE)), float(override.get("burst", RATE_LIMIT_BURST)))
+    return limit if limit.rate > 0 else None
+
+
+def route_cost(method: str, path: str) -> int:
+    key = f"{method} {path}"
+    configured = _parse_json(RATE_LIMIT_COSTS)
+    if key in configured:
+        return int(configured[key])
+    return ROUTE_COSTS.get(key, READ_COST if method in ("GET", "HEAD") else WRITE_COST)
+
+
+# ── In-process buckets ──────────────────────────────────────────────────────────
+
+
+class TokenBucket:
+    def __init__(self, limit: Limit):
+        self.limit = limit
+        self._tokens = limit.burst
+        self._updated = time.monotonic()
+
+    def take(self, cost: float) -> float:
+        """Spend `cost` tokens. Returns 0 on success, else seconds until they are available."""
+        now = time.monotonic()
+        self._tokens = min(self.limit.burst, self._tokens + (now - self._updated) * self.limit.rate)
+        self._updated = now
+        if self._tokens >= cost:
+            self._tokens -= cost
+            return 0.0
+        return (cost - self._tokens) / self.limit.rate
+
+
+_buckets: dict[str, TokenBucket] = {}
+_lock = threading.Lock()
+
+
+def acquire(identity: str, cost: float, limit: Limit) -> float:
+    """Charge the in-process bucket. Returns 0 if allowed, else the Retry-After in seconds."""
+    cost = min(cost, limit.burst)   # a route costlier than the bucket would never run
+    with _lock:
+        bucket = _buckets.get(identity)
+        if bucket is None or bucket.limit != limit:
+            bucket = _buckets[identity] = TokenBucket(limit)
+        return bucket.take(cost)
+
+
+def clear_rate_limits() -> None:
+    """Forget all in-process buckets. Test hook."""
+    with _lock:
+        _buckets.clear()
+
+
+# ── Shared windows (DynamoDB) ───────────────────────────────────────────────────
+
+
+def acquire_shared(identity: str, cost: float, limit: Limit) -> float:
+    """Charge this window's counter in RATE_LIMIT_TABLE. Returns 0 if allowed, else the Retry-After."""
+    from shared.db import get_rate_limit_table  # noqa: PLC0415
+
+    window = RATE_LIMIT_WINDOW_SECONDS
+    capacity = math.floor(limit.burst + limit.rate * window)
+    cost = min(math.ceil(cost), capacity)
+    now = time.time()
+    start = int(now // window * window)
+    table = get_rate_limit_table()
+    try:
+        table.update_item(
+            Key={"PK": f"RATELIMIT#{identity}", "SK": str(start)},
+            UpdateExpression="ADD #used :cost SET #exp = if_not_exists(#exp, :exp)",
+            ConditionExpression="attribute_not_exists(#used) OR #used <= :room",
+            ExpressionAttributeNames={"#used": "used", "#exp": "expiresAt"},
+            ExpressionAttributeValues={
+                ":cost": Decimal(cost),
+                ":room": Decimal(capacity - cost),
+                ":exp": start + 2 * window,
+            },
+        )
+    except table.meta.client.exceptions.ConditionalCheckFailedException:
+        return start + window - now
+    except Exception:
+        logger.warning("Shared rate limit unavailable for %s; allowing request", identity, exc_info=True)
+    return 0.0
+
+
+# ── Route dependency ────────────────────────────────────────────────────────────
+
+
+async def enforce_rate_limit(request: Request, identity: Identity = Depends(authenticate)) -> None:
+    """Router dependency: 429 with Retry-After when the caller is over its limit."""
+    limit = limit_for(identity.name)
+    if limit is None:
+        return
+    cost = route_cost(request.method, request.scope["route"].path)
+    wait = acquire(identity.name, cost, limit)
+    if not wait and RATE_LIMIT_SHARED:
+        wait = await run_sync(acquire_shared, identity.name, cost, limit)
+    if wait:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded",
+            headers={"Retry-After": str(max(1, math.ceil(wait)))},
+        )
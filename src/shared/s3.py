@@ -1,15 +1,26 @@
-"""S3 client helpers: pre-signed upload URLs and batch object deletion."""
+"""S3 client helpers: pre-signed upload URLs, small object reads/writes and batch object deletion."""
 
-import boto3
+import contextvars
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
 
-from shared.config import AWS_REGION, S3_BUCKET
+from shared.aws import get_client
+from shared.config import S3_BUCKET, S3_DELETE_CONCURRENCY, S3_DELETE_MAX_ATTEMPTS
+
+logger = logging.getLogger(__name__)
+
+S3_DELETE_MAX_KEYS = 1000  # S3 hard limit per DeleteObjects call
 
 # S3 does not support a local endpoint override the same way DynamoDB does.
 # For local dev, moto is used in tests; the real S3 is used in production.
 
 
 def _s3():
-    return boto3.client("s3", region_name=AWS_REGION)
+    return get_client("s3")
 
 
 def generate_presigned_upload_url(
@@ -29,14 +40,103 @@ def generate_presigned_upload_url(
     )
 
 
-def delete_s3_objects(s3_keys: list[str]) -> None:
-    """Batch-delete S3 objects. No-op if the list is empty."""
-    if not s3_keys:
-        return
-    _s3().delete_objects(
-        Bucket=S3_BUCKET,
-        Delete={"Objects": [{"Key": k} for k in s3_keys]},
-    )
+def put_s3_object(s3_key: str, body: bytes) -> None:
+    _s3().put_object(Bucket=S3_BUCKET, Key=s3_key, Body=body)
+
+
+def get_s3_object(s3_key: str) -> bytes:
+    return _s3().get_object(Bucket=S3_BUCKET, Key=s3_key)["Body"].read()
+
+
+def list_s3_keys(prefix: str, modified_before: datetime | None = None) -> list[str]:
+    """
+    Every key under `prefix`, following ListObjectsV2 continuation tokens —
+    optionally only objects last written before `modified_before`.
+    """
+    paginator = _s3().get_paginator("list_objects_v2")
+    return [
+        obj["Key"]
+        for page in paginator.paginate(Bucket=S3_BUCKET, Prefix=prefix)
+        for obj in page.get("Contents", [])
+        if modified_before is None or obj["LastModified"] < modified_before
+    ]
+
+
+@dataclass
+class S3DeleteResult:
+    """Outcome of a bulk delete: keys S3 confirmed, and keys that still failed after retries."""
+
+    deleted: list[str] = field(default_factory=list)
+    failed: list[str] = field(default_factory=list)
+
+
+def _backoff(attempt: int) -> float:
+    # Full jitter on 100 ms, 200 ms, 400 ms, ...
+    return random.uniform(0, 0.1 * 2 ** (attempt - 1))
+
+
+def _delete_chunk(keys: list[str], max_attempts: int) -> S3DeleteResult:
+    """Delete up to S3_DELETE_MAX_KEYS keys, retrying only the keys S3 reported as failed."""
+    from botocore.exceptions import BotoCoreError, ClientError  # noqa: PLC0415
+
+    result = S3DeleteResult()
+    pending = keys
+    for attempt in range(max_attempts):
+        if attempt:
+            time.sleep(_backoff(attempt))
+        try:
+            response = _s3().delete_objects(
+                Bucket=S3_BUCKET,
+                # Quiet mode: the response lists only the keys that failed
+                Delete={"Objects": [{"Key": k} for k in pending], "Quiet": True},
+            )
+        except (BotoCoreError, ClientError) as exc:
+            logger.warning("S3 delete_objects attempt %d failed: %s", attempt + 1, exc)
+            continue
+        errors = {e["Key"] for e in response.get("Errors", [])}
+        result.deleted += [k for k in pending if k not in errors]
+        pending = [k for k in pending if k in errors]
+        if not pending:
+            break
+    result.failed = pending
+    return result
+
+
+def delete_s3_objects(
+    s3_keys: list[str],
+    max_workers: int = S3_DELETE_CONCURRENCY,
+    max_attempts: int = S3_DELETE_MAX_ATTEMPTS,
+) -> S3DeleteResult:
+    """
+    Batch-delete S3 objects. No-op if the list is empty.
+
+    Keys are de-duplicated and split into chunks of S3_DELETE_MAX_KEYS; chunks
+    are sent concurrently on up to `max_workers` threads. Keys reported in the
+    per-key Errors of a response are retried with jittered backoff; whatever is
+    still failing after `max_attempts` is returned in `failed`, never raised.
+    """
+    keys = list(dict.fromkeys(s3_keys))
+    if not keys:
+        return S3DeleteResult()
+
+    chunks = [keys[i:i + S3_DELETE_MAX_KEYS] for i in range(0, len(keys), S3_DELETE_MAX_KEYS)]
+    if len(chunks) == 1:
+        outcomes = [_delete_chunk(chunks[0], max_attempts)]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as pool:
+            futures = [
+                pool.submit(contextvars.copy_context().run, _delete_chunk, chunk, max_attempts)
+                for chunk in chunks
+            ]
+            outcomes = [f.result() for f in futures]
+
+    result = S3DeleteResult()
+    for outcome in outcomes:
+        result.deleted += outcome.deleted
+        result.failed += outcome.failed
+    if result.failed:
+        logger.warning("S3 delete left %d of %d keys undeleted", len(result.failed), len(keys))
+    return result
 
 
 def build_s3_key(
@@ -62,3 +162,8 @@ def build_s3_key(
         return f"images/playbook/{entity_slug}/{filename}"
 
     raise ValueError(f"Unknown entity_type: {entity_type!r}. Must be 'blog' or 'playbook'.")
+
+
+def media_prefix(entity_type: str, entity_slug: str) -> str:
+    """S3 prefix holding every asset uploaded for an entity, e.g. "images/blog/<slug>/"."""
+    return build_s3_key(entity_type, entity_slug, "")
@@ -0,0 +1,123 @@
+"""
+Optimistic concurrency for posts and modules.
+
+Every write bumps a numeric `version` attribute
+(`if_not_exists(version, 0) + 1`) and responses carry it as a strong ETag,
+`"<version>"`. A client that echoes the ETag in If-Match has its PUT / PATCH /
+DELETE applied only if nobody wrote in between. The check lives in the
+write's ConditionExpression, so existence, version and write are one round
+trip. Items written before versioning count as version 0.
+
+Conditional writes ask for ReturnValuesOnConditionCheckFailure=ALL_OLD: when
+the condition fails, whether the old item came back tells 412 (stale
+version) from 404 (no such item) without a second read.
+
+A delete that spans many items first claims the entity with delete_claim(),
+which sets `deleting` and bumps the version. version_condition() excludes
+claimed items, so every later guarded write fails until the delete finishes.
+"""
+
+from typing import NoReturn
+
+from fastapi import HTTPException, status
+
+from shared.db import build_update_expression
+
+VERSION_FIELD = "version"
+DELETING_FIELD = "deleting"
+
+
+def etag(version) -> str:
+    return f'"{int(version or 0)}"'
+
+
+def parse_if_match(value: str | None) -> int | None:
+    """
+    Expected version from an If-Match header. None when the header is absent
+    or "*" (any existing version). Weak or unparseable tags can never match
+    under If-Match's strong comparison, so they fail with 412.
+    """
+    if value is None or value.strip() == "*":
+        return None
+    tag = value.strip()
+    if tag.startswith('"') and tag.endswith('"') and tag[1:-1].isdigit():
+        return int(tag[1:-1])
+    raise HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="If-Match must be a single ETag returned by this API",
+    )
+
+
+def version_condition(expected: int | None) -> tuple[str, dict, dict]:
+    """
+    ConditionExpression (names, values) requiring the item to exist, not be
+    claimed by a delete and, if given, be at `expected`.
+    """
+    condition = "attribute_exists(#pk) AND attribute_not_exists(#deleting)"
+    names = {"#pk": "PK", "#deleting": DELETING_FIELD}
+    values: dict = {}
+    if expected is not None:
+        names["#ver"] = VERSION_FIELD
+    if expected == 0:
+        condition += " AND attribute_not_exists(#ver)"
+    elif expected is not None:
+        condition += " AND #ver = :expected"
+        values[":expected"] = expected
+    return condition, names, values
+
+
+def versioned_update(data: dict, expected: int | None = None) -> dict:
+    """
+    update_item (or transaction Update) parameters that SET `data`, bump the
+    version and carry the existence / If-Match guard.
+    """
+    expr, names, values = build_update_expression(data)
+    condition, cond_names, cond_values = version_condition(expected)
+    return {
+        "UpdateExpression": f"{expr}, #ver = if_not_exists(#ver, :zero) + :one",
+        "ConditionExpression": condition,
+        "ExpressionAttributeNames": {**names, **cond_names, "#ver": VERSION_FIELD},
+        "ExpressionAttributeValues": {**values, **cond_values, ":zero": 0, ":one": 1},
+        "ReturnValuesOnConditionCheckFailure": "ALL_OLD",
+    }
+
+
+def delete_claim(expected: int | None = None) -> dict:
+    """
+    update_item parameters that mark an item as being deleted and bump its
+    version, under the If-Match guard. An item already claimed passes, so a
+    retried delete can finish.
+    """
+    condition, names, values = version_condition(expected)
+    return {
+        "UpdateExpression": "SET #deleting = :true, #ver = if_not_exists(#ver, :zero) + :one",
+        "ConditionExpression": f"({condition}) OR #deleting = :true",
+        "ExpressionAttributeNames": {**names, "#ver": VERSION_FIELD},
+        "ExpressionAttributeValues": {**values, ":true": True, ":zero": 0, ":one": 1},
+        "ReturnValuesOnConditionCheckFailure": "ALL_OLD",
+    }
+
+
+def next_version(old_attributes: dict) -> int:
+    """Version written by versioned_update, given its UPDATED_OLD / ALL_OLD attributes."""
+    return int(old_attributes.get(VERSION_FIELD, 0)) + 1
+
+
+def item_existed(exc: Exception) -> bool:
+    """
+    Whether the item behind a failed conditional write exists. For a cancelled
+    transaction, the guard is taken to be the first action.
+    """
+    response = getattr(exc, "response", {})
+    if "CancellationReasons" in response:
+        return "Item" in (response["CancellationReasons"] or [{}])[0]
+    return "Item" in response
+
+
+def raise_condition_failed(exc: Exception, not_found: str) -> NoReturn:
+    if item_existed(exc):
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Modified since the given ETag; re-fetch and retry",
+        )
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=not_found)
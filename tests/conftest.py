@@ -48,80 +48,108 @@ def auth_headers(email: str = "admin@example.com") -> dict[str, str]:
 
 # ── AWS fixtures ────────────────────────────────────────────────────────────────
 
+def create_aws_resources() -> None:
+    """Create the DynamoDB tables and S3 bucket. Call inside an active mock_aws()."""
+    ddb = boto3.client("dynamodb", region_name="us-west-2")
+
+    # ── blog table ────────────────────────────────────────────────────────────
+    ddb.create_table(
+        TableName="blog",
+        KeySchema=[
+            {"AttributeName": "PK", "KeyType": "HASH"},
+            {"AttributeName": "SK", "KeyType": "RANGE"},
+        ],
+        AttributeDefinitions=[
+            {"AttributeName": "PK", "AttributeType": "S"},
+            {"AttributeName": "SK", "AttributeType": "S"},
+            {"AttributeName": "date", "AttributeType": "S"},
+        ],
+        GlobalSecondaryIndexes=[
+            {
+                "IndexName": "date-index",
+                "KeySchema": [
+                    {"AttributeName": "SK", "KeyType": "HASH"},
+                    {"AttributeName": "date", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            }
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+
+    # ── playbook table ────────────────────────────────────────────────────────
+    ddb.create_table(
+        TableName="playbook",
+        KeySchema=[
+            {"AttributeName": "PK", "KeyType": "HASH"},
+            {"AttributeName": "SK", "KeyType": "RANGE"},
+        ],
+        AttributeDefinitions=[
+            {"AttributeName": "PK", "AttributeType": "S"},
+            {"AttributeName": "SK", "AttributeType": "S"},
+            {"AttributeName": "status", "AttributeType": "S"},
+            {"AttributeName": "nextReview", "AttributeType": "S"},
+            {"AttributeName": "collection", "AttributeType": "S"},
+        ],
+        GlobalSecondaryIndexes=[
+            {
+                "IndexName": "status-review-index",
+                "KeySchema": [
+                    {"AttributeName": "status", "KeyType": "HASH"},
+                    {"AttributeName": "nextReview", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            },
+            {
+                "IndexName": "playbook-collection-gsi",
+                "KeySchema": [
+                    {"AttributeName": "collection", "KeyType": "HASH"},
+                    {"AttributeName": "PK", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            },
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+
+    # ── S3 bucket ─────────────────────────────────────────────────────────────
+    s3 = boto3.client("s3", region_name="us-west-2")
+    s3.create_bucket(
+        Bucket="botthef-content-bucket",
+        CreateBucketConfiguration={"LocationConstraint": "us-west-2"},
+    )
+
+
 @pytest.fixture()
 def aws_env():
     """Start moto mock, create DynamoDB tables + S3 bucket, yield, teardown."""
-    with mock_aws():
-        ddb = boto3.client("dynamodb", region_name="us-west-2")
-
-        # ── blog table ─────────────────────────────────────────────────────────
-        ddb.create_table(
-            TableName="blog",
-            KeySchema=[
-                {"AttributeName": "PK", "KeyType": "HASH"},
-                {"AttributeName": "SK", "KeyType": "RANGE"},
-            ],
-            AttributeDefinitions=[
-                {"AttributeName": "PK", "AttributeType": "S"},
-                {"AttributeName": "SK", "AttributeType": "S"},
-                {"AttributeName": "date", "AttributeType": "S"},
-            ],
-            GlobalSecondaryIndexes=[
-                {
-                    "IndexName": "date-index",
-                    "KeySchema": [
-                        {"AttributeName": "SK", "KeyType": "HASH"},
-                        {"AttributeName": "date", "KeyType": "RANGE"},
-                    ],
-                    "Projection": {"ProjectionType": "ALL"},
-                }
-            ],
-            BillingMode="PAY_PER_REQUEST",
-        )
-
-        # ── playbook table ─────────────────────────────────────────────────────
-        ddb.create_table(
-            TableName="playbook",
-            KeySchema=[
-                {"AttributeName": "PK", "KeyType": "HASH"},
-                {"AttributeName": "SK", "KeyType": "RANGE"},
-            ],
-            AttributeDefinitions=[
-                {"AttributeName": "PK", "AttributeType": "S"},
-                {"AttributeName": "SK", "AttributeType": "S"},
-                {"AttributeName": "status", "AttributeType": "S"},
-                {"AttributeName": "nextReview", "AttributeType": "S"},
-                {"AttributeName": "collection", "AttributeType": "S"},
-            ],
-            GlobalSecondaryIndexes=[
-                {
-                    "IndexName": "status-review-index",
-                    "KeySchema": [
-                        {"AttributeName": "status", "KeyType": "HASH"},
-                        {"AttributeName": "nextReview", "KeyType": "RANGE"},
-                    ],
-                    "Projection": {"ProjectionType": "ALL"},
-                },
-                {
-                    "IndexName": "playbook-collection-gsi",
-                    "KeySchema": [
-                        {"AttributeName": "collection", "KeyType": "HASH"},
-                        {"AttributeName": "PK", "KeyType": "RANGE"},
-                    ],
-                    "Projection": {"ProjectionType": "ALL"},
-                },
-            ],
-            BillingMode="PAY_PER_REQUEST",
-        )
-
-        # ── S3 bucket ──────────────────────────────────────────────────────────
-        s3 = boto3.client("s3", region_name="us-west-2")
-        s3.create_bucket(
-            Bucket="botthef-content-bucket",
-            CreateBucketConfiguration={"LocationConstraint": "us-west-2"},
-        )
+    from shared.aws import reset_clients  # noqa: PLC0415
+    from shared.db import clear_item_cache  # noqa: PLC0415
+    from shared.ratelimit import clear_rate_limits  # noqa: PLC0415
 
+    with mock_aws():
+        # Pooled clients and cached reads from a previous test point at a torn-down mock.
+        reset_clients()
+        clear_item_cache()
+        clear_rate_limits()
+        create_aws_resources()
         yield
+        reset_clients()
+        clear_item_cache()
+
+
+@pytest.fixture()
+def ddb_calls(aws_env) -> list[str]:
+    """Operation names of every call made through the pooled DynamoDB client."""
+    from shared.aws import get_client  # noqa: PLC0415
+
+    calls: list[str] = []
+
+    def _record(model, **_):
+        calls.append(model.name)
+
+    get_client("dynamodb").meta.events.register("before-call.dynamodb", _record)
+    return calls
 
 
 @pytest.fixture()
@@ -0,0 +1,27 @@
+"""Tests for the bounded executor facade in shared.aio."""
+
+import asyncio
+import contextvars
+import threading
+
+from shared.aio import run_sync
+
+_request_id: contextvars.ContextVar[str] = contextvars.ContextVar("request_id", default="")
+
+
+class TestRunSync:
+    async def test_runs_off_the_event_loop_thread(self):
+        loop_thread = threading.get_ident()
+        worker_thread = await run_sync(threading.get_ident)
+        assert worker_thread != loop_thread
+
+    async def test_passes_args_and_kwargs(self):
+        assert await run_sync(lambda a, b=0: a + b, 1, b=2) == 3
+
+    async def test_propagates_contextvars(self):
+        _request_id.set("abc")
+        assert await run_sync(_request_id.get) == "abc"
+
+    async def test_calls_run_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+        await asyncio.gather(run_sync(barrier.wait), run_sync(barrier.wait))
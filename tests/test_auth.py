@@ -0,0 +1,164 @@
+"""Tests for the verified-token cache and API key registry behind shared.auth."""
+
+import json
+import time
+
+import boto3
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from fastapi.testclient import TestClient
+from jose import jwt
+
+from shared import apikeys, auth
+from shared.jwt_backend import get_jwt_backend
+from tests.conftest import auth_headers, make_token
+
+
+def _verify(token: str) -> str:
+    return auth.verify_admin_token(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token))
+
+
+@pytest.fixture(autouse=True)
+def decodes(monkeypatch) -> list[str]:
+    """Fresh token cache; records every full verification by the JWT backend."""
+    calls: list[str] = []
+    backend = get_jwt_backend()
+    real_decode = backend.decode
+
+    def counting_decode(token, *args, **kwargs):
+        calls.append(token)
+        return real_decode(token, *args, **kwargs)
+
+    auth.clear_token_cache()
+    monkeypatch.setattr(backend, "decode", counting_decode)
+    yield calls
+    auth.clear_token_cache()
+
+
+class TestTokenCache:
+    def test_valid_token_is_verified_once(self, decodes):
+        token = make_token()
+        assert _verify(token) == "admin@example.com"
+        assert _verify(token) == "admin@example.com"
+        assert len(decodes) == 1
+        stats = auth.token_cache_stats()
+        assert (stats.hits, stats.entries) == (1, 1)
+
+    def test_cached_until_exp(self, decodes):
+        token = jwt.encode(
+            {"email": "admin@example.com", "exp": int(time.time()) + 1},
+            auth.NEXTAUTH_SECRET,
+            algorithm="HS256",
+        )
+        assert _verify(token) == "admin@example.com"
+        time.sleep(2.1)   # exp is compared in whole seconds
+        with pytest.raises(HTTPException) as exc:
+            _verify(token)
+        assert exc.value.detail == "Token expired"
+        assert len(decodes) == 2
+
+    @pytest.mark.parametrize(
+        ("token", "status_code"),
+        [("not-a-real-jwt", 401), (make_token(expired=True), 401), (make_token(email="x@evil.com"), 403)],
+    )
+    def test_rejections_are_cached(self, decodes, token, status_code):
+        for _ in range(2):
+            with pytest.raises(HTTPException) as exc:
+                _verify(token)
+            assert exc.value.status_code == status_code
+        assert len(decodes) == 1
+
+    def test_negative_entries_expire(self, decodes, monkeypatch):
+        monkeypatch.setattr(auth, "AUTH_CACHE_NEGATIVE_TTL_SECONDS", 0.01)
+        for _ in range(2):
+            with pytest.raises(HTTPException):
+                _verify("not-a-real-jwt")
+            time.sleep(0.02)
+        assert len(decodes) == 2
+
+    def test_keyed_by_hash_not_token(self):
+        token = make_token()
+        _verify(token)
+        assert token not in auth._token_cache._entries
+        assert all(len(key) == 32 for key in auth._token_cache._entries)
+
+
+# ── API keys ────────────────────────────────────────────────────────────────────
+
+
+@pytest.fixture()
+def registry(monkeypatch):
+    """Configure API keys from the environment; returns {name: plaintext key}."""
+    minted = {
+        "sync": apikeys.new_api_key("sync", ["leetcode:sync"]),
+        "writer": apikeys.new_api_key("writer", ["blog:read", "blog:write"]),
+    }
+    monkeypatch.setattr(apikeys, "API_KEYS", json.dumps([entry for _, entry in minted.values()]))
+    monkeypatch.setattr(apikeys, "MCP_API_KEY", "btf_legacy-key-from-env")
+    apikeys.reload_api_keys()
+    yield {name: token for name, (token, _) in minted.items()}
+    apikeys.reload_api_keys()
+
+
+def _bearer(token: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {token}"}
+
+
+class TestApiKeys:
+    def test_registered_key_resolves_to_its_scopes(self, registry):
+        identity = auth.authenticate(HTTPAuthorizationCredentials(scheme="Bearer", credentials=registry["sync"]))
+        assert identity.name == "sync" and identity.api_key
+        assert identity.allows("leetcode:sync") and not identity.allows("blog:write")
+
+    def test_legacy_key_has_every_scope(self, registry):
+        assert _verify("btf_legacy-key-from-env") == "mcp-server"
+        identity = auth.authenticate(
+            HTTPAuthorizationCredentials(scheme="Bearer", credentials="btf_legacy-key-from-env")
+        )
+        assert all(identity.allows(scope) for scope in apikeys.SCOPES)
+
+    def test_wrong_secret_with_known_prefix_is_rejected(self, registry):
+        token = registry["sync"]
+        assert apikeys.lookup_api_key(token[:-1] + ("A" if token[-1] != "A" else "B")) is None
+        with pytest.raises(HTTPException) as exc:
+            _verify(token[: apikeys.API_KEY_PREFIX_CHARS] + "x" * 32)
+        assert exc.value.status_code == 401
+
+    def test_unconfigured_registry_is_a_server_error(self, monkeypatch):
+        monkeypatch.setattr(apikeys, "API_KEYS", "")
+        monkeypatch.setattr(apikeys, "MCP_API_KEY", "")
+        apikeys.reload_api_keys()
+        with pytest.raises(HTTPException) as exc:
+            _verify("btf_anything")
+        assert exc.value.status_code == 500
+        apikeys.reload_api_keys()
+
+    def test_unknown_scope_is_refused_when_minting(self):
+        with pytest.raises(ValueError, match="unknown scopes"):
+            apikeys.new_api_key("x", ["blog:delete-everything"])
+
+    def test_routes_enforce_scopes(self, client: TestClient, registry):
+        assert client.get("/api/blog", headers=_bearer(registry["writer"])).status_code == 200
+        r = client.get("/api/blog", headers=_bearer(registry["sync"]))
+        assert r.status_code == 403
+        assert r.json()["detail"] == "Missing scope: blog:read"
+        assert client.get("/api/metrics", headers=_bearer(registry["writer"])).status_code == 403
+        assert client.get("/api/metrics", headers=auth_headers()).status_code == 200
+
+    def test_dynamodb_item_is_refreshed_after_ttl(self, aws_env, monkeypatch):
+        token, entry = apikeys.new_api_key("stored", ["export"])
+        table = boto3.resource("dynamodb", region_name="us-west-2").Table("blog")
+        table.put_item(Item={"PK": "AUTH#APIKEYS", "SK": "METADATA", "keys": [entry]})
+        monkeypatch.setattr(apikeys, "API_KEYS", "")
+        monkeypatch.setattr(apikeys, "MCP_API_KEY", "")
+        monkeypatch.setattr(apikeys, "API_KEYS_ITEM", "AUTH#APIKEYS")
+        monkeypatch.setattr(apikeys, "API_KEYS_REFRESH_SECONDS", 60)
+        apikeys.reload_api_keys()
+
+        assert apikeys.lookup_api_key(token).name == "stored"
+        table.put_item(Item={"PK": "AUTH#APIKEYS", "SK": "METADATA", "keys": []})
+        assert apikeys.lookup_api_key(token) is not None   # still within the refresh interval
+        monkeypatch.setattr(apikeys, "API_KEYS_REFRESH_SECONDS", 0)
+        assert apikeys.lookup_api_key(token) is None
+        apikeys.reload_api_keys()
@@ -0,0 +1,25 @@
+"""Tests for the pooled boto3 client registry in shared.aws."""
+
+from shared import aws
+from shared.config import AWS_MAX_POOL_CONNECTIONS, AWS_RETRY_MODE
+
+
+class TestClientRegistry:
+    def test_client_is_reused(self, aws_env):
+        assert aws.get_client("s3") is aws.get_client("s3")
+
+    def test_resource_is_reused(self, aws_env):
+        assert aws.get_resource("dynamodb") is aws.get_resource("dynamodb")
+
+    def test_dynamodb_client_shares_resource_pool(self, aws_env):
+        assert aws.get_client("dynamodb") is aws.get_resource("dynamodb").meta.client
+
+    def test_reset_builds_fresh_client(self, aws_env):
+        before = aws.get_client("s3")
+        aws.reset_clients()
+        assert aws.get_client("s3") is not before
+
+    def test_client_carries_tuned_config(self, aws_env):
+        config = aws.get_client("s3").meta.config
+        assert config.max_pool_connections == AWS_MAX_POOL_CONNECTIONS
+        assert config.retries["mode"] == AWS_RETRY_MODE
@@ -75,6 +75,14 @@ class TestCreatePost:
         r = client.post("/api/blog", json=VALID_POST, headers=auth_headers())
         assert r.status_code == 409
 
+    def test_duplicate_slug_does_not_overwrite(self, client: TestClient):
+        from shared.db import get_blog_table  # noqa: PLC0415
+
+        client.post("/api/blog", json=VALID_POST, headers=auth_headers())
+        client.post("/api/blog", json={**VALID_POST, "title": "Overwritten"}, headers=auth_headers())
+        item = get_blog_table().get_item(Key={"PK": "BLOG#hello-world", "SK": "METADATA"})["Item"]
+        assert item["title"] == "Hello World"
+
     def test_missing_required_field_returns_422(self, client: TestClient):
         bad = {k: v for k, v in VALID_POST.items() if k != "title"}
         r = client.post("/api/blog", json=bad, headers=auth_headers())
@@ -157,3 +165,142 @@ class TestDeletePost:
         client.delete("/api/blog/hello-world", headers=auth_headers())
         r = client.delete("/api/blog/hello-world", headers=auth_headers())
         assert r.status_code == 404
+
+
+# ── POST /api/blog/bulk ─────────────────────────────────────────────────────────
+
+class TestBulkCreatePosts:
+    def test_imports_many_posts(self, client: TestClient):
+        posts = [{**VALID_POST, "slug": f"post-{i}"} for i in range(120)]
+        r = client.post("/api/blog/bulk", json=posts, headers=auth_headers())
+        assert r.status_code == 200
+        body = r.json()
+        assert (body["created"], body["conflict"], body["invalid"]) == (120, 0, 0)
+        assert client.post("/api/blog", json=posts[-1], headers=auth_headers()).status_code == 409
+
+    def test_reports_per_slug_results(self, client: TestClient):
+        client.post("/api/blog", json=VALID_POST, headers=auth_headers())
+        posts = [
+            VALID_POST,                                      # already exists
+            {**VALID_POST, "slug": "new-post"},
+            {**VALID_POST, "slug": "new-post"},              # repeated in request
+            {k: v for k, v in VALID_POST.items() if k != "title"} | {"slug": "no-title"},
+        ]
+        r = client.post("/api/blog/bulk", json=posts, headers=auth_headers())
+        results = [(x["slug"], x["status"]) for x in r.json()["results"]]
+        assert results == [
+            ("hello-world", "conflict"),
+            ("new-post", "created"),
+            ("new-post", "conflict"),
+            ("no-title", "invalid"),
+        ]
+        assert "title" in r.json()["results"][3]["detail"]
+
+    def test_accepts_ndjson(self, client: TestClient):
+        import json  # noqa: PLC0415
+
+        lines = [json.dumps({**VALID_POST, "slug": f"nd-{i}"}) for i in range(3)] + ["{not json"]
+        r = client.post(
+            "/api/blog/bulk",
+            content="\n".join(lines),
+            headers={**auth_headers(), "Content-Type": "application/x-ndjson"},
+        )
+        assert r.status_code == 200
+        assert (r.json()["created"], r.json()["invalid"]) == (3, 1)
+
+    def test_non_array_body_returns_400(self, client: TestClient):
+        r = client.post("/api/blog/bulk", json=VALID_POST, headers=auth_headers())
+        assert r.status_code == 400
+
+    def test_too_many_posts_returns_413(self, client: TestClient, monkeypatch: pytest.MonkeyPatch):
+        from admin.routes import blog  # noqa: PLC0415
+
+        monkeypatch.setattr(blog, "BLOG_BULK_MAX_POSTS", 2)
+        posts = [{**VALID_POST, "slug": f"post-{i}"} for i in range(3)]
+        r = client.post("/api/blog/bulk", json=posts, headers=auth_headers())
+        assert r.status_code == 413
+
+
+# ── GET /api/blog ───────────────────────────────────────────────────────────────
+
+class TestListPosts:
+    def _seed(self, client: TestClient, n: int) -> None:
+        posts = [{**VALID_POST, "slug": f"post-{i:02}", "date": f"2026-01-{i + 1:02}"} for i in range(n)]
+        client.post("/api/blog/bulk", json=posts, headers=auth_headers())
+
+    def _all_pages(self, client: TestClient, **params) -> list[list[dict]]:
+        pages, cursor = [], None
+        while True:
+            r = client.get("/api/blog", params={**params, **({"cursor": cursor} if cursor else {})},
+                           headers=auth_headers())
+            assert r.status_code == 200
+            pages.append(r.json()["posts"])
+            cursor = r.json()["cursor"]
+            if not cursor:
+                return pages
+
+    def test_pages_newest_first_without_content(self, client: TestClient):
+        self._seed(client, 25)
+        pages = self._all_pages(client, limit=10)
+        posts = [p for page in pages for p in page]
+        assert [len(p) for p in pages][:3] == [10, 10, 5]
+        assert [p["slug"] for p in posts] == [f"post-{i:02}" for i in reversed(range(25))]
+        assert "content" not in posts[0]
+        assert posts[0]["title"] == VALID_POST["title"]
+
+    def test_ascending_order(self, client: TestClient):
+        self._seed(client, 3)
+        (page, *_) = self._all_pages(client, order="asc")
+        assert [p["slug"] for p in page] == ["post-00", "post-01", "post-02"]
+
+    def test_tampered_cursor_returns_400(self, client: TestClient):
+        self._seed(client, 3)
+        cursor = client.get("/api/blog", params={"limit": 1}, headers=auth_headers()).json()["cursor"]
+        payload, tag = cursor.split(".")
+        forged = payload[:-2] + ("AA" if payload[-2:] != "AA" else "BB") + "." + tag
+        r = client.get("/api/blog", params={"cursor": forged}, headers=auth_headers())
+        assert r.status_code == 400
+
+    def test_cursor_is_bound_to_order(self, client: TestClient):
+        self._seed(client, 3)
+        cursor = client.get("/api/blog", params={"limit": 1}, headers=auth_headers()).json()["cursor"]
+        r = client.get("/api/blog", params={"cursor": cursor, "order": "asc"}, headers=auth_headers())
+        assert r.status_code == 400
+
+    def test_empty_listing(self, client: TestClient):
+        r = client.get("/api/blog", headers=auth_headers())
+        assert r.json() == {"posts": [], "cursor": None}
+
+
+# ── GET /api/blog/{slug} ────────────────────────────────────────────────────────
+
+class TestGetPost:
+    def test_returns_full_post(self, client: TestClient):
+        client.post("/api/blog", json=VALID_POST, headers=auth_headers())
+        r = client.get("/api/blog/hello-world", headers=auth_headers())
+        assert r.status_code == 200
+        assert r.json()["content"] == VALID_POST["content"]
+        assert r.json()["slug"] == "hello-world"
+
+    def test_missing_returns_404(self, client: TestClient):
+        assert client.get("/api/blog/nope", headers=auth_headers()).status_code == 404
+
+    def test_repeat_reads_are_served_from_cache(self, client: TestClient, ddb_calls: list[str]):
+        client.post("/api/blog", json=VALID_POST, headers=auth_headers())
+        ddb_calls.clear()
+        for _ in range(3):
+            client.get("/api/blog/hello-world", headers=auth_headers())
+        assert ddb_calls == ["GetItem"]
+
+    def test_update_invalidates_cache(self, client: TestClient):
+        client.post("/api/blog", json=VALID_POST, headers=auth_headers())
+        client.get("/api/blog/hello-world", headers=auth_headers())
+        client.put("/api/blog/hello-world", json={"title": "Changed"}, headers=auth_headers())
+        r = client.get("/api/blog/hello-world", headers=auth_headers())
+        assert r.json()["title"] == "Changed"
+
+    def test_delete_invalidates_cache(self, client: TestClient):
+        client.post("/api/blog", json=VALID_POST, headers=auth_headers())
+        client.get("/api/blog/hello-world", headers=auth_headers())
+        client.delete("/api/blog/hello-world", headers=auth_headers())
+        assert client.get("/api/blog/hello-world", headers=auth_headers()).status_code == 404
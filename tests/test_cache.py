@@ -0,0 +1,52 @@
+"""Tests for the bounded LRU/TTL cache in shared.cache."""
+
+import time
+
+from shared.cache import TTLCache
+
+
+class TestTTLCache:
+    def test_hit_and_miss_counters(self):
+        cache = TTLCache(max_entries=10)
+        cache.set("a", 1, ttl=60)
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+
+    def test_evicts_least_recently_used(self):
+        cache = TTLCache(max_entries=2)
+        cache.set("a", 1, ttl=60)
+        cache.set("b", 2, ttl=60)
+        cache.get("a")               # "b" is now least recently used
+        cache.set("c", 3, ttl=60)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1 and cache.get("c") == 3
+        assert cache.stats().evictions == 1
+
+    def test_bounded_by_bytes(self):
+        cache = TTLCache(max_entries=100, max_bytes=10)
+        cache.set("a", "x", ttl=60, size=6)
+        cache.set("b", "y", ttl=60, size=6)
+        assert cache.get("a") is None
+        assert cache.stats().bytes == 6
+
+    def test_oversized_entry_is_not_cached(self):
+        cache = TTLCache(max_entries=100, max_bytes=10)
+        cache.set("a", "x", ttl=60, size=11)
+        assert cache.get("a") is None
+
+    def test_expires_after_ttl(self):
+        cache = TTLCache(max_entries=10)
+        cache.set("a", 1, ttl=0.01)
+        time.sleep(0.02)
+        assert cache.get("a") is None
+        assert cache.stats().expirations == 1
+
+    def test_pop_counts_invalidation(self):
+        cache = TTLCache(max_entries=10)
+        cache.set("a", 1, ttl=60)
+        cache.pop("a")
+        cache.pop("missing")
+        assert cache.get("a") is None
+        assert cache.stats().invalidations == 1
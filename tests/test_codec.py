@@ -0,0 +1,86 @@
+"""Tests for transparent MDX compression in shared.codec."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+import shared.codec as codec
+from shared.codec import decode_item, decode_value, encode_item, encode_value
+from shared.db import get_blog_table
+from tests.conftest import auth_headers
+
+MDX = "## Two pointers\n\nMove `left` and `right` inwards until they meet.\n\n" * 200
+
+
+class TestCodec:
+    def test_round_trip_gzip(self):
+        encoded = encode_value(MDX, codec="gzip", min_bytes=1024)
+        assert isinstance(encoded, bytes) and len(encoded) < len(MDX) / 5
+        assert decode_value(encoded) == MDX
+
+    @pytest.mark.skipif(codec._zstd_module() is None, reason="no zstd implementation installed")
+    def test_round_trip_zstd(self):
+        encoded = encode_value(MDX, codec="zstd", min_bytes=1024)
+        assert encoded[:5] == b"\x00MDXz" and len(encoded) < len(MDX) / 5
+        assert decode_value(encoded) == MDX
+
+    def test_off_leaves_text_alone(self):
+        assert encode_value(MDX, codec="off", min_bytes=0) == MDX
+
+    def test_small_values_stay_plain(self):
+        assert encode_value("short", codec="gzip", min_bytes=1024) == "short"
+
+    def test_incompressible_values_stay_plain(self):
+        # gzip framing alone outweighs any saving on a tiny value
+        assert encode_value("tiny", codec="gzip", min_bytes=0) == "tiny"
+
+    def test_zstd_falls_back_to_gzip_when_unavailable(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(codec, "_zstd_module", lambda: None)
+        encoded = encode_value(MDX, codec="zstd", min_bytes=0)
+        assert encoded[:5] == b"\x00MDXg"
+        assert decode_value(encoded) == MDX
+
+    def test_only_mdx_fields_are_touched(self):
+        item = {"PK": "BLOG#x", "title": MDX, "content": MDX}
+        encoded = encode_item(item, codec="gzip", min_bytes=0)
+        assert encoded["title"] == MDX and isinstance(encoded["content"], bytes)
+        assert decode_item(encoded) == item
+
+    def test_plain_items_decode_unchanged(self):
+        item = {"PK": "BLOG#x", "content": "plain", "pseudocode": "also plain"}
+        assert decode_item(item) == item
+
+
+class TestCompressedStorage:
+    @pytest.fixture(autouse=True)
+    def _gzip_on(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(codec, "CONTENT_COMPRESSION", "gzip")
+        monkeypatch.setattr(codec, "CONTENT_COMPRESSION_MIN_BYTES", 1024)
+
+    def test_post_content_is_stored_compressed_and_read_back(self, client: TestClient):
+        post = {"slug": "long", "title": "Long", "date": "2026-03-01", "excerpt": "",
+                "tags": [], "content": MDX, "media": []}
+        client.post("/api/blog", json=post, headers=auth_headers())
+
+        stored = get_blog_table().get_item(Key={"PK": "BLOG#long", "SK": "METADATA"})["Item"]
+        assert stored["content"].value.startswith(b"\x00MDX")
+
+        assert client.get("/api/blog/long", headers=auth_headers()).json()["content"] == MDX
+        client.put("/api/blog/long", json={"content": MDX + "more"}, headers=auth_headers())
+        assert client.get("/api/blog/long", headers=auth_headers()).json()["content"] == MDX + "more"
+
+    def test_problem_pseudocode_round_trips(self, client: TestClient):
+        module = {"slug": "arrays", "title": "Arrays", "description": "", "content": MDX,
+                  "order": 1, "media": [],
+                  "problems": [{"id": "p1", "title": "Two Sum", "leetcodeUrl": "https://x",
+                                "difficulty": "Easy", "status": "solved", "pseudocode": MDX}]}
+        client.post("/api/playbook", json=module, headers=auth_headers())
+        body = client.get("/api/playbook/arrays", headers=auth_headers()).json()
+        assert body["content"] == MDX
+        assert body["problems"][0]["pseudocode"] == MDX
+
+    def test_export_emits_plain_text(self, client: TestClient):
+        post = {"slug": "long", "title": "Long", "date": "2026-03-01", "excerpt": "",
+                "tags": [], "content": MDX, "media": []}
+        client.post("/api/blog", json=post, headers=auth_headers())
+        r = client.get("/api/export", params={"table": "blog"}, headers=auth_headers())
+        assert MDX.splitlines()[0] in r.text
@@ -0,0 +1,54 @@
+"""Import-time budget for the admin Lambda entry point.
+
+Runs `import admin.handler` in a fresh interpreter and fails if heavy
+dependencies are loaded eagerly again, or if the import exceeds the budget
+(ADMIN_IMPORT_BUDGET_MS, default 1500 ms — generous, to absorb slow CI hosts;
+scripts/bench_cold_start.py gives the precise numbers).
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+BUDGET_MS = float(os.getenv("ADMIN_IMPORT_BUDGET_MS", "1500"))
+LAZY_MODULES = ("boto3", "botocore", "jose", "cryptography", "httpx")
+
+_PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+import admin.handler
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({{"ms": elapsed, "loaded": [m for m in {LAZY_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+def _cold_import(**env: str) -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        env={**os.environ, "PYTHONPATH": str(SRC), **env},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+class TestColdImport:
+    def test_heavy_dependencies_are_not_imported(self):
+        assert _cold_import()["loaded"] == []
+
+    def test_import_fits_budget(self):
+        # Best of two, so a first-run bytecode compile doesn't count against the budget
+        best = min(_cold_import()["ms"] for _ in range(2))
+        assert best < BUDGET_MS, f"import admin.handler took {best:.0f} ms (budget {BUDGET_MS:.0f} ms)"
+
+    def test_preload_mode_imports_dependencies_up_front(self):
+        loaded = _cold_import(PRELOAD_DEPENDENCIES="true")["loaded"]
+        assert {"boto3", "httpx"} <= set(loaded)
+        assert "jose" not in loaded   # the default stdlib JWT backend needs no third-party code
+
+    def test_preload_builds_the_configured_jwt_backend(self):
+        assert "jose" in _cold_import(PRELOAD_DEPENDENCIES="true", JWT_BACKEND="jose")["loaded"]
@@ -0,0 +1,144 @@
+"""Tests for the DynamoDB helpers in shared.db."""
+
+import threading
+import time
+
+import pytest
+from boto3.dynamodb.conditions import Key
+
+import shared.db as db
+from shared.db import (
+    batch_get,
+    get_playbook_table,
+    parallel_scan,
+    query_pages,
+    transact_write,
+    write_actions,
+)
+
+
+def _seed(table, n: int) -> None:
+    with table.batch_writer() as batch:
+        for i in range(n):
+            batch.put_item(Item={"PK": "PLAYBOOK#m", "SK": f"PROBLEM#{i:03}", "title": "t", "media": []})
+
+
+class TestQueryPages:
+    def test_follows_last_evaluated_key(self, aws_env):
+        table = get_playbook_table()
+        _seed(table, 5)
+        pages = list(query_pages(table, KeyConditionExpression=Key("PK").eq("PLAYBOOK#m"), Limit=2))
+        assert [len(p) for p in pages] == [2, 2, 1]
+
+    def test_projection_limits_attributes(self, aws_env):
+        table = get_playbook_table()
+        _seed(table, 1)
+        (page,) = query_pages(
+            table, projection=["PK", "SK"], KeyConditionExpression=Key("PK").eq("PLAYBOOK#m")
+        )
+        assert page == [{"PK": "PLAYBOOK#m", "SK": "PROBLEM#000"}]
+
+    def test_empty_collection_yields_one_empty_page(self, aws_env):
+        pages = list(query_pages(get_playbook_table(), KeyConditionExpression=Key("PK").eq("nope")))
+        assert pages == [[]]
+
+
+class TestBatchGet:
+    def test_returns_existing_items_across_chunks(self, aws_env):
+        table = get_playbook_table()
+        _seed(table, 150)
+        keys = [{"PK": "PLAYBOOK#m", "SK": f"PROBLEM#{i:03}"} for i in range(160)]
+        items = batch_get(table, keys, projection=["SK"])
+        assert len(items) == 150
+        assert set(items[0]) == {"SK"}
+
+
+class TestTransactWrite:
+    def test_chunks_stay_under_the_size_limit(self, aws_env, ddb_calls: list[str], monkeypatch):
+        monkeypatch.setattr(db, "TRANSACT_MAX_BYTES", 10_000)
+        table = get_playbook_table()
+        puts = [{"Put": {"Item": {"PK": "PLAYBOOK#m", "SK": f"PROBLEM#{i:03}", "pseudocode": "x" * 3000}}}
+                for i in range(10)]
+        transact_write(table, puts)
+        assert ddb_calls == ["TransactWriteItems"] * 4   # 3 items of ~3 KB per chunk
+        assert len(table.scan()["Items"]) == 10
+
+
+class TestWriteActions:
+    def test_oversized_actions_leave_the_transactional_path(self, aws_env, ddb_calls: list[str], monkeypatch):
+        monkeypatch.setattr(db, "TRANSACT_MAX_BYTES", 10_000)
+        table = get_playbook_table()
+        puts = [{"Put": {"Item": {"PK": "PLAYBOOK#m", "SK": f"PROBLEM#{i:03}", "pseudocode": "x" * 3000}}}
+                for i in range(10)]
+        write_actions(table, puts)
+        assert ddb_calls == ["BatchWriteItem"]
+        assert len(table.scan()["Items"]) == 10
+
+    def test_table_name_is_honoured_past_one_transaction(self, aws_env):
+        table = get_playbook_table()
+        blog = db.get_blog_table()
+        blog.put_item(Item={"PK": "BLOG#x", "SK": "METADATA", "title": "old"})
+        puts = [{"Put": {"Item": {"PK": "PLAYBOOK#m", "SK": f"PROBLEM#{i:03}"}}} for i in range(150)]
+        write_actions(table, [
+            {"Update": {
+                "TableName": blog.name,
+                "Key": {"PK": "BLOG#x", "SK": "METADATA"},
+                "UpdateExpression": "SET title = :t",
+                "ExpressionAttributeValues": {":t": "new"},
+            }},
+            *puts,
+            {"Put": {"TableName": blog.name, "Item": {"PK": "GC#QUEUE", "SK": "1"}}},
+        ])
+        assert blog.get_item(Key={"PK": "BLOG#x", "SK": "METADATA"})["Item"]["title"] == "new"
+        assert blog.get_item(Key={"PK": "GC#QUEUE", "SK": "1"}).get("Item") is not None
+        assert len(table.scan()["Items"]) == 150
+
+    def test_condition_checks_past_one_transaction_are_rejected(self, aws_env):
+        table = get_playbook_table()
+        check = {"ConditionCheck": {
+            "Key": {"PK": "PLAYBOOK#m", "SK": "METADATA"},
+            "ConditionExpression": "attribute_exists(PK)",
+        }}
+        puts = [{"Put": {"Item": {"PK": "PLAYBOOK#m", "SK": f"PROBLEM#{i:03}"}}} for i in range(150)]
+        with pytest.raises(ValueError):
+            write_actions(table, [check, *puts])
+        assert table.scan()["Items"] == []
+
+
+class TestParallelScan:
+    def test_covers_every_item_once(self, aws_env):
+        table = get_playbook_table()
+        _seed(table, 40)
+        items = [i for page in parallel_scan(table, total_segments=4) for i in page]
+        assert sorted(i["SK"] for i in items) == [f"PROBLEM#{i:03}" for i in range(40)]
+
+    def test_early_close_stops_workers(self, aws_env):
+        table = get_playbook_table()
+        _seed(table, 5)
+        before = set(threading.enumerate())
+        pages = parallel_scan(table, total_segments=4, max_buffered_pages=1)
+        workers = [t for t in threading.enumerate() if t not in before and t.name.startswith("scan-")]
+        assert len(workers) == 4
+        next(pages)
+        pages.close()
+        for worker in workers:
+            worker.join(2)
+        assert not any(worker.is_alive() for worker in workers)
+
+    def test_close_from_another_thread_ends_a_blocked_next(self):
+        release = threading.Event()
+
+        class SlowTable:
+            def scan(self, **kwargs):
+                release.wait(5)
+                return {"Items": [{"PK": "x"}]}
+
+        pages = parallel_scan(SlowTable(), total_segments=2)
+        result = []
+        consumer = threading.Thread(target=lambda: result.append(next(pages, None)))
+        consumer.start()
+        time.sleep(0.2)   # the consumer is now waiting inside next()
+        pages.close()     # as export does on a client disconnect
+        consumer.join(2)
+        release.set()
+        assert not consumer.is_alive() and result == [None]
@@ -0,0 +1,59 @@
+"""Tests for GET /api/export."""
+
+import gzip
+import json
+
+from fastapi.testclient import TestClient
+
+from tests.conftest import auth_headers
+from tests.test_blog import VALID_POST
+from tests.test_playbook import VALID_MODULE
+
+
+def _lines(r) -> list[dict]:
+    return [json.loads(line) for line in r.text.splitlines()]
+
+
+class TestExport:
+    def test_streams_every_blog_item_as_ndjson(self, client: TestClient):
+        posts = [{**VALID_POST, "slug": f"post-{i}"} for i in range(30)]
+        client.post("/api/blog/bulk", json=posts, headers=auth_headers())
+
+        r = client.get("/api/export", params={"table": "blog", "segments": 3}, headers=auth_headers())
+        assert r.status_code == 200
+        assert r.headers["content-type"] == "application/x-ndjson"
+        items = _lines(r)
+        assert sorted(i["PK"] for i in items) == sorted(f"BLOG#post-{i}" for i in range(30))
+        assert items[0]["content"] == VALID_POST["content"]
+
+    def test_exports_playbook_with_numbers(self, client: TestClient):
+        client.post("/api/playbook", json=VALID_MODULE, headers=auth_headers())
+        r = client.get("/api/export", params={"table": "playbook"}, headers=auth_headers())
+        items = {i["SK"]: i for i in _lines(r)}
+        assert set(items) == {"METADATA", "PROBLEM#167"}
+        assert items["METADATA"]["order"] == 1
+
+    def test_gzip(self, client: TestClient):
+        client.post("/api/blog", json=VALID_POST, headers=auth_headers())
+        r = client.get("/api/export", params={"table": "blog", "gzip": True}, headers=auth_headers())
+        assert r.headers["content-type"] == "application/gzip"
+        assert "content-encoding" not in r.headers   # saved as sent, still gzipped
+        assert "blog.ndjson.gz" in r.headers["content-disposition"]
+        lines = gzip.decompress(r.content).decode().splitlines()
+        assert [json.loads(line)["PK"] for line in lines] == ["BLOG#hello-world"]
+
+    def test_empty_table(self, client: TestClient):
+        r = client.get("/api/export", params={"table": "blog"}, headers=auth_headers())
+        assert r.status_code == 200
+        assert r.text == ""
+
+    def test_unknown_table_returns_422(self, client: TestClient):
+        r = client.get("/api/export", params={"table": "users"}, headers=auth_headers())
+        assert r.status_code == 422
+
+    def test_too_many_segments_returns_422(self, client: TestClient):
+        r = client.get("/api/export", params={"table": "blog", "segments": 1000}, headers=auth_headers())
+        assert r.status_code == 422
+
+    def test_requires_auth(self, client: TestClient):
+        assert client.get("/api/export", params={"table": "blog"}).status_code == 401
@@ -0,0 +1,140 @@
+"""Tests for the deferred S3 cleanup queue (shared.gc, admin.gc)."""
+
+import time
+
+import boto3
+import pytest
+from fastapi.testclient import TestClient
+
+import shared.gc as gc
+from shared.db import get_gc_table
+from shared.gc import drain, enqueue
+from shared.s3 import S3DeleteResult, list_s3_keys
+from tests.conftest import auth_headers
+
+BUCKET = "botthef-content-bucket"
+KEY = "images/blog/with-media/cover.jpg"
+POST = {
+    "slug": "with-media", "title": "T", "date": "2026-03-01", "excerpt": "", "tags": [],
+    "content": "# T\n", "media": [{"key": "cover.jpg", "s3Key": KEY, "type": "image"}],
+}
+
+
+def _records(pk: str = gc.QUEUE_PK) -> list[dict]:
+    return get_gc_table().query(
+        KeyConditionExpression="PK = :pk", ExpressionAttributeValues={":pk": pk}
+    )["Items"]
+
+
+def _put(*keys: str) -> None:
+    s3 = boto3.client("s3", region_name="us-west-2")
+    for key in keys:
+        s3.put_object(Bucket=BUCKET, Key=key, Body=b"x")
+
+
+class TestRoutesEnqueue:
+    def test_delete_post_only_enqueues(self, client: TestClient, ddb_calls: list[str]):
+        _put(KEY)
+        client.post("/api/blog", json=POST, headers=auth_headers())
+        ddb_calls.clear()
+        assert client.delete("/api/blog/with-media", headers=auth_headers()).status_code == 200
+        assert ddb_calls == ["TransactWriteItems"]
+        assert list_s3_keys("images/") == [KEY]
+        [record] = _records()
+        assert record["s3Prefixes"] == ["images/blog/with-media/", "content/blog/with-media/"]
+        assert record["source"] == "BLOG#with-media"
+
+    def test_deleted_post_assets_are_drained(self, client: TestClient):
+        _put(KEY)
+        client.post("/api/blog", json=POST, headers=auth_headers())
+        time.sleep(1.1)   # the GC prefix sweep spares objects from the delete's own second
+        client.delete("/api/blog/with-media", headers=auth_headers())
+        drain()
+        assert list_s3_keys("images/") == []
+
+    def test_failed_delete_writes_no_record(self, client: TestClient):
+        client.post("/api/blog", json=POST, headers=auth_headers())
+        r = client.delete("/api/blog/with-media", headers={**auth_headers(), "If-Match": '"7"'})
+        assert r.status_code == 412
+        assert client.delete("/api/blog/missing", headers=auth_headers()).status_code == 404
+        assert _records() == []
+
+    def test_request_cost_is_independent_of_asset_count(self, client: TestClient, ddb_calls: list[str]):
+        media = [{"key": f"{i}.png", "s3Key": f"images/blog/with-media/{i}.png"} for i in range(800)]
+        client.post("/api/blog", json={**POST, "media": media}, headers=auth_headers())
+        ddb_calls.clear()
+        client.delete("/api/blog/with-media", headers=auth_headers())
+        assert ddb_calls == ["TransactWriteItems"]
+
+    def test_export_skips_gc_records(self, client: TestClient):
+        client.post("/api/blog", json=POST, headers=auth_headers())
+        client.post("/api/blog", json={**POST, "slug": "kept"}, headers=auth_headers())
+        client.delete("/api/blog/with-media", headers=auth_headers())
+        r = client.get("/api/export", params={"table": "blog"}, headers=auth_headers())
+        assert "GC#" not in r.text and "BLOG#kept" in r.text
+
+
+class TestDrain:
+    def test_deletes_keys_and_records(self, aws_env):
+        keys = [f"images/blog/a/{i}.png" for i in range(2500)]
+        _put(*keys[:10])
+        enqueue(keys, "BLOG#a")
+        assert len(_records()) == 3   # split at GC_RECORD_MAX_KEYS
+
+        result = drain(batch_keys=1000)
+        assert (result.records, result.deleted, result.requeued) == (3, 2500, 0)
+        assert list_s3_keys("images/") == []
+        assert _records() == []
+
+    def test_prefix_spares_objects_written_after_enqueue(self, aws_env):
+        _put("content/blog/a/content/old")
+        time.sleep(1.1)   # LastModified has one-second resolution
+        enqueue([], "BLOG#a", ["content/blog/a/"])
+        _put("content/blog/a/content/new")   # e.g. the slug was recreated
+        drain()
+        assert list_s3_keys("content/") == ["content/blog/a/content/new"]
+
+    def test_failed_keys_are_requeued_then_dead_lettered(
+        self, aws_env, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(gc, "delete_s3_objects", lambda keys: S3DeleteResult(failed=keys))
+        monkeypatch.setattr(gc, "GC_MAX_ATTEMPTS", 2)
+        enqueue(["a", "b"], "BLOG#x")
+
+        assert drain().requeued == 2
+        [record] = _records()
+        assert record["attempts"] == 1 and record["s3Keys"] == ["a", "b"]
+
+        assert drain().dead == 2
+        assert _records() == []
+        assert _records(gc.DEAD_PK)[0]["source"] == "BLOG#x"
+
+    def test_requeued_records_wait_for_the_next_run(self, aws_env, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(gc, "delete_s3_objects", lambda keys: S3DeleteResult(failed=keys))
+        query_pages = gc.query_pages
+        monkeypatch.setattr(gc, "query_pages", lambda table, **kwargs: query_pages(table, Limit=2, **kwargs))
+        for i in range(5):
+            enqueue([f"k{i}"], "BLOG#x")
+
+        result = drain(batch_keys=1)
+        assert (result.records, result.requeued, result.dead) == (5, 5, 0)
+        assert {r["attempts"] for r in _records()} == {1}
+
+    def test_max_records(self, aws_env):
+        for i in range(3):
+            enqueue([f"k{i}"], "BLOG#x")
+        assert drain(max_records=2).records == 2
+        assert len(_records()) == 1
+
+    def test_lambda_handler(self, aws_env):
+        from admin.gc import handler  # noqa: PLC0415
+
+        _put(KEY)
+        enqueue([KEY], "BLOG#with-media")
+
+        class _Context:
+            def get_remaining_time_in_millis(self) -> int:
+                return 60_000
+
+        assert handler({}, _Context())["deleted"] == 1
+        assert list_s3_keys("images/") == []
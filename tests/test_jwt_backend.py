@@ -0,0 +1,86 @@
+"""Tests for the HS256 verifiers in shared.jwt_backend."""
+
+import base64
+import json
+import time
+
+import pytest
+from jose import jwt
+
+from shared.jwt_backend import (
+    InvalidToken,
+    JoseHS256,
+    StdlibHS256,
+    TokenExpired,
+    get_jwt_backend,
+)
+from tests.conftest import make_token
+
+SECRET = "test-secret-32-chars-exactly-ok!"
+
+
+def _sign(claims: dict, secret: str = SECRET, algorithm: str = "HS256") -> str:
+    return jwt.encode(claims, secret, algorithm=algorithm)
+
+
+def _segment(value: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).rstrip(b"=").decode()
+
+
+def _tamper(token: str, **claims) -> str:
+    header, _, signature = token.split(".")
+    return ".".join([header, _segment(claims), signature])
+
+
+_HOUR = int(time.time()) + 3600
+
+TOKENS = {
+    "valid": make_token(),
+    "other email": make_token(email="someone@else.com"),
+    "expired": make_token(expired=True),
+    "wrong secret": make_token(secret="another-secret-entirely-32-chars"),
+    "tampered payload": _tamper(make_token(), email="admin@example.com", exp=_HOUR + 1),
+    "hs512": _sign({"email": "admin@example.com"}, algorithm="HS512"),
+    "alg none": f"{_segment({'alg': 'none', 'typ': 'JWT'})}.{_segment({'email': 'admin@example.com'})}.",
+    "no exp": _sign({"email": "admin@example.com"}),
+    "nbf in future": _sign({"email": "admin@example.com", "nbf": _HOUR}),
+    "exp not numeric": _sign({"email": "admin@example.com", "exp": "soon"}),
+    "with audience": _sign({"email": "admin@example.com", "aud": "someone"}),
+    "numeric sub": _sign({"email": "admin@example.com", "sub": 42}),
+    "two segments": "abc.def",
+    "garbage": "not-a-real-jwt",
+    "bad base64": "a.b!c.d",
+    "payload is a list": f"{_segment({'alg': 'HS256'})}.{base64.urlsafe_b64encode(b'[1]').decode()}.x",
+}
+
+
+def _outcome(backend, token: str):
+    try:
+        return backend.decode(token, SECRET)
+    except TokenExpired:
+        return "expired"
+    except InvalidToken:
+        return "invalid"
+
+
+class TestBackendParity:
+    @pytest.mark.parametrize("name", TOKENS)
+    def test_stdlib_matches_python_jose(self, name):
+        token = TOKENS[name]
+        assert _outcome(StdlibHS256(), token) == _outcome(JoseHS256(), token)
+
+    def test_outcomes(self):
+        stdlib = StdlibHS256()
+        assert stdlib.decode(TOKENS["valid"], SECRET)["email"] == "admin@example.com"
+        assert _outcome(stdlib, TOKENS["expired"]) == "expired"
+        assert _outcome(stdlib, TOKENS["wrong secret"]) == "invalid"
+        assert _outcome(stdlib, TOKENS["alg none"]) == "invalid"
+
+
+class TestBackendSelection:
+    def test_default_is_stdlib(self):
+        assert isinstance(get_jwt_backend(), StdlibHS256)
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError, match="Unknown JWT_BACKEND"):
+            get_jwt_backend("rs256")
@@ -0,0 +1,179 @@
+"""Tests for the LeetCode client (shared.leetcode) and POST /api/leetcode/sync,
+against a local stub GraphQL server."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import boto3
+import pytest
+from fastapi.testclient import TestClient
+
+from shared import leetcode
+from tests.conftest import auth_headers
+
+STATS = {
+    "data": {
+        "matchedUser": {
+            "submitStats": {
+                "acSubmissionNum": [
+                    {"difficulty": "All", "count": 60},
+                    {"difficulty": "Easy", "count": 30},
+                    {"difficulty": "Medium", "count": 25},
+                    {"difficulty": "Hard", "count": 5},
+                ]
+            }
+        }
+    }
+}
+
+
+class StubGraphQL(ThreadingHTTPServer):
+    """Answers POSTs from a script of (status, body, headers); the last entry repeats."""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.script: list[tuple[int, object, dict]] = [(200, STATS, {})]
+        self.requests: list[dict] = []
+        self.connections: set[int] = set()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/graphql"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive
+
+    def do_POST(self):
+        server: StubGraphQL = self.server
+        server.requests.append(json.loads(self.rfile.read(int(self.headers["Content-Length"]))))
+        server.connections.add(self.client_address[1])
+        code, body, headers = server.script.pop(0) if len(server.script) > 1 else server.script[0]
+        payload = body if isinstance(body, bytes) else json.dumps(body).encode()
+        self.send_response(code)
+        for name, value in {"Content-Type": "application/json", **headers}.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def stub(monkeypatch):
+    server = StubGraphQL()
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    monkeypatch.setattr(leetcode, "LEETCODE_GRAPHQL_URL", server.url)
+    monkeypatch.setattr(leetcode, "BACKOFF_BASE_SECONDS", 0.01)
+    leetcode.reset_leetcode_client()
+    yield server
+    leetcode.reset_leetcode_client()
+    server.shutdown()
+    server.server_close()
+
+
+def _client() -> leetcode.LeetCodeClient:
+    return leetcode.LeetCodeClient(breaker=leetcode.CircuitBreaker(threshold=2, cooldown=60))
+
+
+class TestClientRetries:
+    async def test_reuses_one_connection(self, stub):
+        client = _client()
+        for _ in range(3):
+            assert await client.query("q", {"username": "u"}) == STATS
+        await client.aclose()
+        assert len(stub.requests) == 3
+        assert len(stub.connections) == 1
+        assert stub.requests[0] == {"query": "q", "variables": {"username": "u"}}
+
+    async def test_retries_429_and_5xx(self, stub):
+        stub.script = [(503, {}, {}), (429, {}, {"Retry-After": "0"}), (200, STATS, {})]
+        client = _client()
+        assert await client.query("q", {}) == STATS
+        await client.aclose()
+        assert len(stub.requests) == 3
+
+    async def test_gives_up_after_max_retries(self, stub, monkeypatch):
+        monkeypatch.setattr(leetcode, "LEETCODE_MAX_RETRIES", 2)
+        stub.script = [(500, {}, {})]
+        client = _client()
+        with pytest.raises(leetcode.LeetCodeError, match="HTTP 500"):
+            await client.query("q", {})
+        await client.aclose()
+        assert len(stub.requests) == 3
+
+    async def test_client_errors_are_not_retried(self, stub):
+        stub.script = [(400, {"errors": ["bad"]}, {})]
+        client = _client()
+        with pytest.raises(leetcode.LeetCodeError, match="HTTP 400"):
+            await client.query("q", {})
+        await client.aclose()
+        assert len(stub.requests) == 1
+
+    async def test_deadline_bounds_retries(self, stub, monkeypatch):
+        monkeypatch.setattr(leetcode, "LEETCODE_DEADLINE_SECONDS", 0.5)
+        stub.script = [(503, {}, {"Retry-After": "1"})]
+        client = _client()
+        with pytest.raises(leetcode.LeetCodeError):
+            await client.query("q", {})
+        await client.aclose()
+        assert len(stub.requests) == 1   # waiting 1s would overrun the deadline
+
+    async def test_network_errors_are_retried(self, monkeypatch):
+        monkeypatch.setattr(leetcode, "BACKOFF_BASE_SECONDS", 0.01)
+        client = leetcode.LeetCodeClient(
+            url="http://127.0.0.1:9/graphql", breaker=leetcode.CircuitBreaker(threshold=5, cooldown=60)
+        )
+        with pytest.raises(leetcode.LeetCodeError, match="ConnectError"):
+            await client.query("q", {})
+        await client.aclose()
+
+
+class TestCircuitBreaker:
+    async def test_opens_after_consecutive_failures_then_half_opens(self, stub, monkeypatch):
+        monkeypatch.setattr(leetcode, "LEETCODE_MAX_RETRIES", 0)
+        stub.script = [(500, {}, {}), (500, {}, {}), (200, STATS, {})]
+        breaker = leetcode.CircuitBreaker(threshold=2, cooldown=0.2)
+        client = leetcode.LeetCodeClient(breaker=breaker)
+        for _ in range(2):
+            with pytest.raises(leetcode.LeetCodeError):
+                await client.query("q", {})
+        with pytest.raises(leetcode.CircuitOpen):
+            await client.query("q", {})
+        assert len(stub.requests) == 2
+
+        breaker.opened_at -= 0.2   # cooldown elapsed: one trial goes through and closes it
+        assert await client.query("q", {}) == STATS
+        assert (breaker.failures, breaker.opened_at) == (0, None)
+        await client.aclose()
+
+
+class TestSyncRoute:
+    def test_sync_writes_stats(self, client: TestClient, stub):
+        r = client.post("/api/leetcode/sync", json={"username": "someone"}, headers=auth_headers())
+        assert r.status_code == 200
+        assert r.json()["total"] == 60
+        item = boto3.resource("dynamodb", region_name="us-west-2").Table("blog").get_item(
+            Key={"PK": "LEETCODE#stats", "SK": "METADATA"}
+        )["Item"]
+        assert (item["easy"], item["medium"], item["hard"]) == (30, 25, 5)
+
+    def test_unknown_user_is_404(self, client: TestClient, stub):
+        stub.script = [(200, {"data": {"matchedUser": None}}, {})]
+        r = client.post("/api/leetcode/sync", json={"username": "nobody"}, headers=auth_headers())
+        assert r.status_code == 404
+
+    def test_upstream_failure_is_502_then_503_while_open(self, client: TestClient, stub, monkeypatch):
+        monkeypatch.setattr(leetcode._breaker, "threshold", 1)
+        monkeypatch.setattr(leetcode, "LEETCODE_MAX_RETRIES", 0)
+        stub.script = [(500, {}, {})]
+        r = client.post("/api/leetcode/sync", json={"username": "someone"}, headers=auth_headers())
+        assert r.status_code == 502
+        r = client.post("/api/leetcode/sync", json={"username": "someone"}, headers=auth_headers())
+        assert r.status_code == 503
+        assert int(r.headers["Retry-After"]) > 0
+        assert len(stub.requests) == 1
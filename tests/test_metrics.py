@@ -0,0 +1,82 @@
+"""Tests for per-request AWS call instrumentation in shared.metrics."""
+
+import boto3
+import pytest
+from fastapi.testclient import TestClient
+
+from shared.db import get_blog_table
+from shared.metrics import instrument_client, track_aws_calls
+from tests.conftest import auth_headers
+from tests.test_blog import VALID_POST
+
+
+class TestTrackAwsCalls:
+    def test_records_calls_and_operations(self, aws_env):
+        table = get_blog_table()
+        with track_aws_calls() as stats:
+            table.put_item(Item={"PK": "BLOG#x", "SK": "METADATA"})
+            table.get_item(Key={"PK": "BLOG#x", "SK": "METADATA"})
+        assert stats.calls == 2
+        assert stats.operations == {"dynamodb:PutItem": 1, "dynamodb:GetItem": 1}
+        assert stats.aws_seconds > 0
+
+    def test_calls_outside_tracking_are_ignored(self, aws_env):
+        table = get_blog_table()
+        table.get_item(Key={"PK": "BLOG#x", "SK": "METADATA"})
+        with track_aws_calls() as stats:
+            pass
+        assert stats.calls == 0
+
+    def test_failed_calls_are_counted(self, aws_env):
+        table = get_blog_table()
+        table.put_item(Item={"PK": "BLOG#x", "SK": "METADATA"})
+        with track_aws_calls() as stats:
+            try:
+                table.put_item(
+                    Item={"PK": "BLOG#x", "SK": "METADATA"},
+                    ConditionExpression="attribute_not_exists(PK)",
+                )
+            except table.meta.client.exceptions.ConditionalCheckFailedException:
+                pass
+        assert stats.calls == 1
+
+    def test_calls_that_raise_before_a_response_are_counted(self, aws_env):
+        client = boto3.client("dynamodb", region_name="us-west-2")
+        instrument_client(client)
+
+        def fail(**_):
+            raise RuntimeError("connection dropped")
+
+        client.meta.events.register("before-send.dynamodb", fail)
+        with track_aws_calls() as stats, pytest.raises(RuntimeError):
+            client.describe_table(TableName="blog")
+        assert stats.operations == {"dynamodb:DescribeTable": 1}
+
+
+class TestMiddleware:
+    def test_response_has_server_timing(self, client: TestClient):
+        r = client.post("/api/blog", json=VALID_POST, headers=auth_headers())
+        assert r.status_code == 201
+        timing = r.headers["Server-Timing"]
+        assert 'dynamodb;dur=' in timing
+        assert 'desc="1 calls"' in timing
+        assert "total;dur=" in timing
+
+    def test_logs_one_line_summary(self, client: TestClient, caplog):
+        with caplog.at_level("INFO", logger="shared.metrics"):
+            client.delete("/api/blog/missing", headers=auth_headers())
+        (line,) = [r.getMessage() for r in caplog.records if r.name == "shared.metrics"]
+        assert line.startswith("DELETE /api/blog/missing 404 ")
+        assert "ops=dynamodb:TransactWriteItems" in line
+
+
+class TestMetricsRoute:
+    def test_exposes_item_cache_counters(self, client: TestClient):
+        client.post("/api/blog", json=VALID_POST, headers=auth_headers())
+        client.get("/api/blog/hello-world", headers=auth_headers())
+        client.get("/api/blog/hello-world", headers=auth_headers())
+        r = client.get("/api/metrics", headers=auth_headers())
+        assert r.status_code == 200
+        cache = r.json()["itemCache"]
+        assert (cache["hits"], cache["misses"], cache["entries"]) == (1, 1, 1)
+        assert cache["bytes"] > 0
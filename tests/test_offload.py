@@ -0,0 +1,129 @@
+"""Tests for S3 offload of oversized MDX attributes (shared.offload)."""
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import shared.offload as offload
+from shared.codec import decode_item, encode_item
+from shared.db import get_blog_table
+from shared.gc import drain
+from shared.offload import load_offloaded, offload_item, offloaded_keys
+from shared.s3 import get_s3_object, list_s3_keys
+from tests.conftest import auth_headers
+
+BIG = "## Section\n\n" + "A sentence of prose about sliding windows.\n" * 300   # ~13 KB
+POST = {"slug": "big", "title": "Big", "date": "2026-03-01", "excerpt": "", "tags": [],
+        "content": BIG, "media": []}
+
+
+def _stored_post(slug: str = "big") -> dict:
+    return get_blog_table().get_item(Key={"PK": f"BLOG#{slug}", "SK": "METADATA"})["Item"]
+
+
+class TestOffloadItem:
+    def test_small_items_are_untouched(self, aws_env):
+        item = {"PK": "BLOG#x", "content": "short"}
+        assert offload_item(item, "blog/x", limit=1024) is item
+        assert list_s3_keys("content/") == []
+
+    def test_round_trip(self, aws_env):
+        item = {"PK": "BLOG#x", "title": "T", "content": BIG}
+        packed = offload_item(item, "blog/x", limit=1024)
+        [key] = offloaded_keys(packed)
+        assert key.startswith("content/blog/x/content/")
+        assert len(packed["content"]) < 100
+        assert get_s3_object(key) == BIG.encode()
+        assert load_offloaded(packed) == item
+
+    def test_compressed_bodies_stay_compressed_in_s3(self, aws_env):
+        item = {"PK": "BLOG#x", "content": BIG}
+        packed = offload_item(encode_item(item, codec="gzip", min_bytes=0), "blog/x", limit=100)
+        [key] = offloaded_keys(packed)
+        assert len(get_s3_object(key)) < len(BIG) / 5
+        assert decode_item(load_offloaded(packed)) == item
+
+    def test_identical_content_gets_a_fresh_key(self, aws_env):
+        # A queued delete of the first key must not hit the second write
+        first = offload_item({"content": BIG}, "blog/x", limit=1024)
+        second = offload_item({"content": BIG}, "blog/x", limit=1024)
+        assert offloaded_keys(first) != offloaded_keys(second)
+
+
+class TestOffloadRoutes:
+    @pytest.fixture(autouse=True)
+    def _small_limit(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(offload, "CONTENT_OFFLOAD_BYTES", 4096)
+
+    def test_post_content_is_offloaded_and_read_back(self, client: TestClient):
+        assert client.post("/api/blog", json=POST, headers=auth_headers()).status_code == 201
+        assert offloaded_keys(_stored_post())
+        assert client.get("/api/blog/big", headers=auth_headers()).json()["content"] == BIG
+
+        listing = client.get("/api/blog", headers=auth_headers()).json()
+        assert [p["slug"] for p in listing["posts"]] == ["big"]
+
+    def test_small_posts_stay_inline(self, client: TestClient):
+        client.post("/api/blog", json={**POST, "content": "tiny"}, headers=auth_headers())
+        assert _stored_post()["content"] == "tiny"
+
+    def test_update_replaces_the_offloaded_body(self, client: TestClient):
+        client.post("/api/blog", json=POST, headers=auth_headers())
+        [old_key] = offloaded_keys(_stored_post())
+
+        client.put("/api/blog/big", json={"content": BIG + "Edited.\n"}, headers=auth_headers())
+        [new_key] = offloaded_keys(_stored_post())
+        drain()
+        assert list_s3_keys("content/blog/big/") == [new_key] != [old_key]
+        r = client.get("/api/blog/big", headers=auth_headers())
+        assert r.json()["content"] == BIG + "Edited.\n"
+
+    def test_reverting_content_before_the_drain_keeps_the_body(self, client: TestClient):
+        client.post("/api/blog", json=POST, headers=auth_headers())
+        client.put("/api/blog/big", json={"content": BIG + "Edited.\n"}, headers=auth_headers())
+        client.put("/api/blog/big", json={"content": BIG}, headers=auth_headers())
+        drain()
+        r = client.get("/api/blog/big", headers=auth_headers())
+        assert r.status_code == 200
+        assert r.json()["content"] == BIG
+        assert list_s3_keys("content/blog/big/") == offloaded_keys(_stored_post())
+
+    def test_recreating_a_deleted_post_before_the_drain_keeps_the_body(self, client: TestClient):
+        client.post("/api/blog", json=POST, headers=auth_headers())
+        assert client.delete("/api/blog/big", headers=auth_headers()).status_code == 200
+        assert client.post("/api/blog", json=POST, headers=auth_headers()).status_code == 201
+        drain()
+        r = client.get("/api/blog/big", headers=auth_headers())
+        assert r.status_code == 200
+        assert r.json()["content"] == BIG
+
+    def test_delete_removes_offloaded_bodies(self, client: TestClient):
+        client.post("/api/blog", json=POST, headers=auth_headers())
+        time.sleep(1.1)   # the GC prefix sweep spares objects from the delete's own second
+        client.delete("/api/blog/big", headers=auth_headers())
+        drain()
+        assert list_s3_keys("content/blog/big/") == []
+
+    def test_module_and_problem_round_trip_and_delete(self, client: TestClient):
+        module = {
+            "slug": "windows", "title": "Windows", "description": "", "content": BIG,
+            "order": 1, "media": [],
+            "problems": [{"id": "3", "title": "Longest Substring", "leetcodeUrl": "https://x",
+                          "difficulty": "Medium", "pseudocode": BIG}],
+        }
+        client.post("/api/playbook", json=module, headers=auth_headers())
+        assert len(list_s3_keys("content/playbook/windows/")) == 2
+
+        body = client.get("/api/playbook/windows", headers=auth_headers()).json()
+        assert body["content"] == BIG and body["problems"][0]["pseudocode"] == BIG
+
+        time.sleep(1.1)   # the GC prefix sweep spares objects from the delete's own second
+        client.delete("/api/playbook/windows", headers=auth_headers())
+        drain()
+        assert list_s3_keys("content/playbook/windows/") == []
+
+    def test_export_resolves_pointers(self, client: TestClient):
+        client.post("/api/blog", json=POST, headers=auth_headers())
+        r = client.get("/api/export", params={"table": "blog"}, headers=auth_headers())
+        assert "A sentence of prose about sliding windows." in r.text
@@ -0,0 +1,158 @@
+"""Tests for PATCH /api/blog/{slug}, PATCH /api/playbook/{slug} and shared.patch."""
+
+import difflib
+
+import pytest
+from fastapi.testclient import TestClient
+
+import shared.codec as codec
+from shared.models import TextEdit
+from shared.patch import PatchError, apply_edits, apply_unified_diff, content_sha256
+from tests.conftest import auth_headers
+
+BASE = "# Title\n\nFirst paragraph.\n\nSecond paragraph.\n\n## Code\n\nx = 1\n"
+POST = {"slug": "p", "title": "P", "date": "2026-03-01", "excerpt": "", "tags": [],
+        "content": BASE, "media": []}
+
+
+def _diff(old: str, new: str) -> str:
+    return "".join(difflib.unified_diff(
+        old.splitlines(keepends=True), new.splitlines(keepends=True), "a", "b"
+    ))
+
+
+class TestApplyEdits:
+    def test_replace_insert_delete(self):
+        edits = [TextEdit(start=0, end=1, text="##"), TextEdit(start=7, end=7, text="!"),
+                 TextEdit(start=9, end=25, text="")]
+        assert apply_edits(BASE, edits) == "## Title!\n\n\n\nSecond paragraph.\n\n## Code\n\nx = 1\n"
+
+    def test_offsets_refer_to_the_base_regardless_of_order(self):
+        edits = [TextEdit(start=9, end=14, text="1st"), TextEdit(start=2, end=7, text="Heading")]
+        assert apply_edits(BASE, edits).startswith("# Heading\n\n1st paragraph.")
+
+    @pytest.mark.parametrize("edits", [
+        [TextEdit(start=5, end=500)],
+        [TextEdit(start=-1, end=2)],
+        [TextEdit(start=0, end=5), TextEdit(start=3, end=8)],
+    ])
+    def test_rejects_bad_ranges(self, edits):
+        with pytest.raises(PatchError):
+            apply_edits(BASE, edits)
+
+
+class TestApplyUnifiedDiff:
+    @pytest.mark.parametrize("new", [
+        BASE.replace("Second", "2nd"),
+        "Preface\n" + BASE,
+        BASE + "y = 2\n",
+        BASE.replace("\n## Code\n\nx = 1\n", ""),
+        BASE.rstrip("\n"),            # "\ No newline at end of file"
+        "",
+    ])
+    def test_round_trips_difflib_output(self, new):
+        assert apply_unified_diff(BASE, _diff(BASE, new)) == new
+
+    def test_multiple_hunks(self):
+        old = "".join(f"line {i}\n" for i in range(40))
+        new = old.replace("line 2\n", "line two\n").replace("line 35\n", "")
+        assert apply_unified_diff(old, _diff(old, new)) == new
+
+    def test_context_mismatch_is_rejected(self):
+        diff = _diff(BASE, BASE.replace("Second", "2nd"))
+        with pytest.raises(PatchError):
+            apply_unified_diff(BASE.replace("Second", "Other"), diff)
+
+    def test_no_hunks_is_rejected(self):
+        with pytest.raises(PatchError):
+            apply_unified_diff(BASE, "not a diff")
+
+
+class TestPatchPost:
+    def _patch(self, client: TestClient, body: dict, slug: str = "p"):
+        return client.patch(f"/api/blog/{slug}", json=body, headers=auth_headers())
+
+    def test_applies_diff(self, client: TestClient):
+        client.post("/api/blog", json=POST, headers=auth_headers())
+        new = BASE.replace("x = 1", "x = 2")
+        r = self._patch(client, {"baseSha256": content_sha256(BASE), "diff": _diff(BASE, new)})
+        assert r.status_code == 200
+        assert r.json()["sha256"] == content_sha256(new)
+        assert client.get("/api/blog/p", headers=auth_headers()).json()["content"] == new
+
+    def test_applies_range_edits_and_chains(self, client: TestClient):
+        client.post("/api/blog", json=POST, headers=auth_headers())
+        r = self._patch(client, {"baseSha256": content_sha256(BASE),
+                                 "edits": [{"start": 2, "end": 7, "text": "Heading"}]})
+        r = self._patch(client, {"baseSha256": r.json()["sha256"],
+                                 "edits": [{"start": 0, "end": 0, "text": "---\n"}]})
+        assert r.status_code == 200
+        content = client.get("/api/blog/p", headers=auth_headers()).json()["content"]
+        assert content.startswith("---\n# Heading\n")
+
+    def test_stale_base_returns_412(self, client: TestClient):
+        client.post("/api/blog", json=POST, headers=auth_headers())
+        r = self._patch(client, {"baseSha256": content_sha256("old"), "edits": []})
+        assert r.status_code == 412
+        assert content_sha256(BASE) in r.json()["detail"]
+
+    def test_unappliable_diff_returns_422(self, client: TestClient):
+        client.post("/api/blog", json=POST, headers=auth_headers())
+        diff = _diff("something\nelse\n", "something\nnew\n")
+        r = self._patch(client, {"baseSha256": content_sha256(BASE), "diff": diff})
+        assert r.status_code == 422
+        assert client.get("/api/blog/p", headers=auth_headers()).json()["content"] == BASE
+
+    def test_requires_exactly_one_format(self, client: TestClient):
+        client.post("/api/blog", json=POST, headers=auth_headers())
+        assert self._patch(client, {"baseSha256": content_sha256(BASE)}).status_code == 422
+        both = {"baseSha256": content_sha256(BASE), "edits": [], "diff": ""}
+        assert self._patch(client, both).status_code == 422
+
+    def test_missing_post_returns_404(self, client: TestClient):
+        r = self._patch(client, {"baseSha256": content_sha256(""), "edits": []}, slug="nope")
+        assert r.status_code == 404
+
+    def test_compressed_content(self, client: TestClient, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(codec, "CONTENT_COMPRESSION", "gzip")
+        monkeypatch.setattr(codec, "CONTENT_COMPRESSION_MIN_BYTES", 0)
+        big = BASE * 50
+        client.post("/api/blog", json={**POST, "content": big}, headers=auth_headers())
+        new = big.replace("x = 1", "x = 3", 1)
+        r = self._patch(client, {"baseSha256": content_sha256(big), "diff": _diff(big, new)})
+        assert r.status_code == 200
+        assert client.get("/api/blog/p", headers=auth_headers()).json()["content"] == new
+
+
+class TestPatchModule:
+    MODULE = {
+        "slug": "m", "title": "M", "description": "", "content": BASE, "order": 1, "media": [],
+        "problems": [{"id": "1", "title": "Two Sum", "leetcodeUrl": "https://x",
+                      "difficulty": "Easy", "pseudocode": "for i in nums:\n    pass\n"}],
+    }
+
+    def test_patches_module_content(self, client: TestClient):
+        client.post("/api/playbook", json=self.MODULE, headers=auth_headers())
+        new = BASE.replace("First", "Opening")
+        r = client.patch("/api/playbook/m", headers=auth_headers(),
+                         json={"baseSha256": content_sha256(BASE), "diff": _diff(BASE, new)})
+        assert r.status_code == 200
+        assert client.get("/api/playbook/m", headers=auth_headers()).json()["content"] == new
+
+    def test_patches_problem_pseudocode(self, client: TestClient):
+        client.post("/api/playbook", json=self.MODULE, headers=auth_headers())
+        old = self.MODULE["problems"][0]["pseudocode"]
+        r = client.patch("/api/playbook/m", headers=auth_headers(), json={
+            "baseSha256": content_sha256(old), "problemId": "1",
+            "edits": [{"start": len(old) - 5, "end": len(old) - 1, "text": "return"}],
+        })
+        assert r.status_code == 200
+        body = client.get("/api/playbook/m", headers=auth_headers()).json()
+        assert body["problems"][0]["pseudocode"] == "for i in nums:\n    return\n"
+
+    def test_missing_problem_returns_404(self, client: TestClient):
+        client.post("/api/playbook", json=self.MODULE, headers=auth_headers())
+        r = client.patch("/api/playbook/m", headers=auth_headers(),
+                         json={"baseSha256": content_sha256(""), "problemId": "9", "edits": []})
+        assert r.status_code == 404
+        assert r.json()["detail"] == "Problem not found"
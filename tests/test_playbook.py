@@ -1,8 +1,11 @@
 """Tests for POST / PUT / DELETE /api/playbook."""
 
+import time
+
 import pytest
 from fastapi.testclient import TestClient
 
+from shared.gc import QUEUE_PK, drain
 from tests.conftest import auth_headers
 
 # ── Fixtures ────────────────────────────────────────────────────────────────────
@@ -47,6 +50,24 @@ MODULE_NO_PROBLEMS = {
 }
 
 
+def _module_items(slug: str) -> list[dict]:
+    from boto3.dynamodb.conditions import Key  # noqa: PLC0415
+
+    from shared.db import get_playbook_table  # noqa: PLC0415
+
+    return get_playbook_table().query(
+        KeyConditionExpression=Key("PK").eq(f"PLAYBOOK#{slug}")
+    )["Items"]
+
+
+def _gc_records() -> list[dict]:
+    from shared.db import get_gc_table  # noqa: PLC0415
+
+    return get_gc_table().query(
+        KeyConditionExpression="PK = :pk", ExpressionAttributeValues={":pk": QUEUE_PK}
+    )["Items"]
+
+
 # ── POST /api/playbook ──────────────────────────────────────────────────────────
 
 class TestCreateModule:
@@ -74,6 +95,22 @@ class TestCreateModule:
         r = client.post("/api/playbook", json=bad, headers=auth_headers())
         assert r.status_code == 422
 
+    def test_duplicate_slug_does_not_overwrite(self, client: TestClient):
+        client.post("/api/playbook", json=VALID_MODULE, headers=auth_headers())
+        dupe = {**VALID_MODULE, "title": "Overwritten", "problems": [PROBLEM_2]}
+        client.post("/api/playbook", json=dupe, headers=auth_headers())
+
+        items = _module_items("two-pointers")
+        assert {i["SK"] for i in items} == {"METADATA", "PROBLEM#167"}
+        assert next(i for i in items if i["SK"] == "METADATA")["title"] == "Two Pointers"
+
+    def test_create_with_more_problems_than_one_transaction(self, client: TestClient):
+        problems = [{**PROBLEM_2, "id": str(i)} for i in range(150)]
+        module = {**VALID_MODULE, "problems": problems}
+        r = client.post("/api/playbook", json=module, headers=auth_headers())
+        assert r.status_code == 201
+        assert len(_module_items("two-pointers")) == 151
+
     def test_unauthenticated_returns_401(self, client: TestClient):
         r = client.post("/api/playbook", json=VALID_MODULE)
         assert r.status_code == 401
@@ -130,6 +167,101 @@ class TestUpdateModule:
         )
         assert r.status_code == 200
 
+    def test_upsert_preserves_created_at(self, client: TestClient):
+        self._seed(client)
+        before = {i["SK"]: i for i in _module_items("two-pointers")}["PROBLEM#167"]
+        client.put(
+            "/api/playbook/two-pointers",
+            json={"upsert_problems": [{**PROBLEM_1, "status": "Review"}]},
+            headers=auth_headers(),
+        )
+        after = {i["SK"]: i for i in _module_items("two-pointers")}["PROBLEM#167"]
+        assert after["createdAt"] == before["createdAt"]
+        assert after["status"] == "Review"
+
+    def test_upsert_call_count_is_independent_of_problem_count(
+        self, client: TestClient, ddb_calls: list[str]
+    ):
+        counts = []
+        for n in (1, 20):
+            slug = f"module-{n}"
+            self._seed(client, {**VALID_MODULE, "slug": slug, "problems": []})
+            problems = [{**PROBLEM_2, "id": str(i)} for i in range(n)]
+            ddb_calls.clear()
+            r = client.put(
+                f"/api/playbook/{slug}",
+                json={"upsert_problems": problems},
+                headers=auth_headers(),
+            )
+            assert r.status_code == 200
+            counts.append(len(ddb_calls))
+            assert "GetItem" not in ddb_calls
+        assert counts[0] == counts[1]
+
+    def test_change_set_is_one_read_and_one_transaction(
+        self, client: TestClient, ddb_calls: list[str]
+    ):
+        self._seed(client)
+        ddb_calls.clear()
+        r = client.put(
+            "/api/playbook/two-pointers",
+            json={
+                "title": "Renamed",
+                "upsert_problems": [{**PROBLEM_2, "id": str(i)} for i in range(50)],
+                "delete_problem_ids": ["167"],
+            },
+            headers=auth_headers(),
+        )
+        assert r.status_code == 200
+        assert ddb_calls == ["BatchGetItem", "TransactWriteItems"]
+        assert {i["SK"] for i in _module_items("two-pointers")} == {
+            "METADATA", *(f"PROBLEM#{i}" for i in range(50))
+        }
+
+    def test_change_set_past_transaction_limit(self, client: TestClient):
+        self._seed(client)
+        r = client.put(
+            "/api/playbook/two-pointers",
+            json={
+                "title": "Renamed",
+                "upsert_problems": [{**PROBLEM_2, "id": str(i)} for i in range(150)],
+                "delete_problem_ids": ["167"],
+            },
+            headers=auth_headers(),
+        )
+        assert r.status_code == 200
+        items = {i["SK"]: i for i in _module_items("two-pointers")}
+        assert len(items) == 151
+        assert items["METADATA"]["title"] == "Renamed"
+
+    def test_upsert_and_delete_same_id_deletes(self, client: TestClient):
+        self._seed(client)
+        r = client.put(
+            "/api/playbook/two-pointers",
+            json={"upsert_problems": [PROBLEM_1], "delete_problem_ids": ["167"]},
+            headers=auth_headers(),
+        )
+        assert r.status_code == 200
+        assert {i["SK"] for i in _module_items("two-pointers")} == {"METADATA"}
+
+    def test_delete_problem_removes_its_media(self, client: TestClient):
+        import boto3  # noqa: PLC0415
+
+        key = "images/playbook/two-pointers/problems/167/diagram.png"
+        s3 = boto3.client("s3", region_name="us-west-2")
+        s3.put_object(Bucket="botthef-content-bucket", Key=key, Body=b"img")
+        problem = {**PROBLEM_1, "media": [{"key": "diagram.png", "s3Key": key, "type": "image"}]}
+        self._seed(client, {**VALID_MODULE, "problems": [problem]})
+
+        client.put(
+            "/api/playbook/two-pointers",
+            json={"delete_problem_ids": ["167"]},
+            headers=auth_headers(),
+        )
+        assert s3.list_objects_v2(Bucket="botthef-content-bucket")["KeyCount"] == 1
+        drain()
+        assert s3.list_objects_v2(Bucket="botthef-content-bucket")["KeyCount"] == 0
+
     def test_delete_problem(self, client: TestClient):
         self._seed(client)
         r = client.put(
@@ -196,7 +328,106 @@ class TestDeleteModule:
         r = client.delete("/api/playbook/two-pointers", headers=auth_headers())
         assert r.status_code == 404
 
+    def test_delete_removes_module_and_problem_media(self, client: TestClient):
+        import boto3  # noqa: PLC0415
+
+        s3 = boto3.client("s3", region_name="us-west-2")
+        keys = ["images/playbook/two-pointers/cover.jpg"] + [
+            f"images/playbook/two-pointers/problems/{i}/diagram.png" for i in range(30)
+        ]
+        for key in keys:
+            s3.put_object(Bucket="botthef-content-bucket", Key=key, Body=b"img")
+
+        def media(key: str) -> list[dict]:
+            return [{"key": key.rsplit("/", 1)[-1], "s3Key": key, "type": "image"}]
+
+        problems = [{**PROBLEM_2, "id": str(i), "media": media(k)} for i, k in enumerate(keys[1:])]
+        module = {**VALID_MODULE, "media": media(keys[0]), "problems": problems}
+        client.post("/api/playbook", json=module, headers=auth_headers())
+
+        time.sleep(1.1)   # the GC prefix sweep spares objects from the delete's own second
+        r = client.delete("/api/playbook/two-pointers", headers=auth_headers())
+        assert r.status_code == 200
+        assert _module_items("two-pointers") == []
+        [record] = _gc_records()
+        assert record["s3Prefixes"] == ["images/playbook/two-pointers/", "content/playbook/two-pointers/"]
+        drain()
+        assert s3.list_objects_v2(Bucket="botthef-content-bucket")["KeyCount"] == 0
+
     def test_delete_module_without_problems(self, client: TestClient):
         client.post("/api/playbook", json=MODULE_NO_PROBLEMS, headers=auth_headers())
         r = client.delete("/api/playbook/sliding-window", headers=auth_headers())
         assert r.status_code == 200
+
+    def test_stale_if_match_deletes_nothing(self, client: TestClient):
+        module = {**VALID_MODULE, "problems": [PROBLEM_1, PROBLEM_2]}
+        client.post("/api/playbook", json=module, headers=auth_headers())
+        client.put("/api/playbook/two-pointers", json={"title": "Edited"}, headers=auth_headers())
+        r = client.delete("/api/playbook/two-pointers", headers={**auth_headers(), "If-Match": '"1"'})
+        assert r.status_code == 412
+        assert len(_module_items("two-pointers")) == 3
+        r = client.put("/api/playbook/two-pointers", json={"title": "Still editable"}, headers=auth_headers())
+        assert r.status_code == 200
+
+    def test_interrupted_delete_can_be_retried(self, client: TestClient, monkeypatch):
+        """A delete that fails part-way leaves the module in place for a retry,
+        never orphaned problems that a re-create would resurrect."""
+        from admin.routes import playbook  # noqa: PLC0415
+
+        module = {**VALID_MODULE, "problems": [PROBLEM_1, PROBLEM_2]}
+        client.post("/api/playbook", json=module, headers=auth_headers())
+
+        def fail(table, items):
+            raise RuntimeError("throttled")
+
+        with monkeypatch.context() as m:
+            m.setattr(playbook, "_delete_items", fail)
+            with pytest.raises(RuntimeError):
+                client.delete("/api/playbook/two-pointers", headers={**auth_headers(), "If-Match": '"1"'})
+        assert client.get("/api/playbook/two-pointers", headers=auth_headers()).status_code == 200
+
+        assert _gc_records() == []
+
+        # The claimed module takes no more writes, so the retry cannot orphan any
+        r = client.put(
+            "/api/playbook/two-pointers", json={"upsert_problems": [PROBLEM_2]}, headers=auth_headers()
+        )
+        assert r.status_code == 412
+
+        r = client.delete("/api/playbook/two-pointers", headers={**auth_headers(), "If-Match": '"1"'})
+        assert r.status_code == 200
+        assert _module_items("two-pointers") == []
+
+        client.post("/api/playbook", json={**VALID_MODULE, "problems": []}, headers=auth_headers())
+        assert client.get("/api/playbook/two-pointers", headers=auth_headers()).json()["problems"] == []
+
+
+# ── GET /api/playbook/{slug} ────────────────────────────────────────────────────
+
+class TestGetModule:
+    def test_returns_module_with_problems(self, client: TestClient):
+        module = {**VALID_MODULE, "problems": [PROBLEM_1, PROBLEM_2]}
+        client.post("/api/playbook", json=module, headers=auth_headers())
+        r = client.get("/api/playbook/two-pointers", headers=auth_headers())
+        assert r.status_code == 200
+        body = r.json()
+        assert body["order"] == 1
+        assert sorted(p["id"] for p in body["problems"]) == ["15", "167"]
+
+    def test_missing_returns_404(self, client: TestClient):
+        assert client.get("/api/playbook/nope", headers=auth_headers()).status_code == 404
+
+    def test_update_invalidates_cache(self, client: TestClient, ddb_calls: list[str]):
+        client.post("/api/playbook", json=VALID_MODULE, headers=auth_headers())
+        client.get("/api/playbook/two-pointers", headers=auth_headers())
+        ddb_calls.clear()
+        client.get("/api/playbook/two-pointers", headers=auth_headers())
+        assert ddb_calls == []
+
+        client.put(
+            "/api/playbook/two-pointers",
+            json={"upsert_problems": [PROBLEM_2]},
+            headers=auth_headers(),
+        )
+        r = client.get("/api/playbook/two-pointers", headers=auth_headers())
+        assert len(r.json()["problems"]) == 2
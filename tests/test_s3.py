@@ -0,0 +1,82 @@
+"""Tests for the S3 helpers in shared.s3."""
+
+import boto3
+import pytest
+
+from shared import s3
+from shared.s3 import build_s3_key, delete_s3_objects
+
+BUCKET = "botthef-content-bucket"
+
+
+def _put(keys: list[str]) -> None:
+    client = boto3.client("s3", region_name="us-west-2")
+    for key in keys:
+        client.put_object(Bucket=BUCKET, Key=key, Body=b"x")
+
+
+def _count() -> int:
+    client = boto3.client("s3", region_name="us-west-2")
+    return sum(page["KeyCount"] for page in client.get_paginator("list_objects_v2").paginate(Bucket=BUCKET))
+
+
+class _FlakyClient:
+    """Reports the given keys as failed on the first delete_objects call only."""
+
+    def __init__(self, fail_once: set[str]):
+        self.fail_once = set(fail_once)
+        self.calls: list[list[str]] = []
+
+    def delete_objects(self, Bucket, Delete):
+        keys = [o["Key"] for o in Delete["Objects"]]
+        self.calls.append(keys)
+        errors = [{"Key": k, "Code": "InternalError"} for k in keys if k in self.fail_once]
+        self.fail_once.clear()
+        return {"Errors": errors}
+
+
+class TestDeleteS3Objects:
+    def test_empty_list_is_noop(self, aws_env):
+        result = delete_s3_objects([])
+        assert result.deleted == [] and result.failed == []
+
+    def test_deletes_past_the_1000_key_limit(self, aws_env):
+        keys = [f"images/blog/bulk/{i}.jpg" for i in range(2500)]
+        _put(keys)
+        result = delete_s3_objects(keys)
+        assert sorted(result.deleted) == sorted(keys)
+        assert result.failed == []
+        assert _count() == 0
+
+    def test_retries_only_failed_keys(self, monkeypatch: pytest.MonkeyPatch):
+        fake = _FlakyClient(fail_once={"b"})
+        monkeypatch.setattr(s3, "_s3", lambda: fake)
+        monkeypatch.setattr(s3, "_backoff", lambda attempt: 0)
+        result = delete_s3_objects(["a", "b", "c"])
+        assert fake.calls == [["a", "b", "c"], ["b"]]
+        assert sorted(result.deleted) == ["a", "b", "c"]
+
+    def test_reports_keys_that_keep_failing(self, monkeypatch: pytest.MonkeyPatch):
+        class _Broken(_FlakyClient):
+            def delete_objects(self, Bucket, Delete):
+                super().delete_objects(Bucket, Delete)
+                return {"Errors": [{"Key": "b", "Code": "AccessDenied"}]}
+
+        fake = _Broken(fail_once=set())
+        monkeypatch.setattr(s3, "_s3", lambda: fake)
+        monkeypatch.setattr(s3, "_backoff", lambda attempt: 0)
+        result = delete_s3_objects(["a", "b"], max_attempts=3)
+        assert result.failed == ["b"]
+        assert len(fake.calls) == 3
+
+
+class TestBuildS3Key:
+    def test_blog_key(self):
+        assert build_s3_key("blog", "post", "a.jpg") == "images/blog/post/a.jpg"
+
+    def test_playbook_problem_key(self):
+        assert build_s3_key("playbook", "m", "a.png", "1") == "images/playbook/m/problems/1/a.png"
+
+    def test_unknown_entity_type_raises(self):
+        with pytest.raises(ValueError):
+            build_s3_key("video", "x", "a.mp4")
@@ -0,0 +1,133 @@
+"""Tests for version attributes, ETag and If-Match on posts and modules."""
+
+from fastapi.testclient import TestClient
+
+from shared.db import get_blog_table
+from shared.patch import content_sha256
+from tests.conftest import auth_headers
+
+POST = {"slug": "v", "title": "V", "date": "2026-03-01", "excerpt": "", "tags": [],
+        "content": "# V\n", "media": []}
+MODULE = {
+    "slug": "m", "title": "M", "description": "", "content": "# M\n", "order": 1, "media": [],
+    "problems": [{"id": "1", "title": "Two Sum", "leetcodeUrl": "https://x",
+                  "difficulty": "Easy", "pseudocode": "loop\n"}],
+}
+
+
+def _headers(etag: str | None = None) -> dict[str, str]:
+    return {**auth_headers(), **({"If-Match": etag} if etag else {})}
+
+
+class TestPostVersions:
+    def test_every_write_bumps_the_etag(self, client: TestClient):
+        assert client.post("/api/blog", json=POST, headers=_headers()).headers["ETag"] == '"1"'
+        assert client.get("/api/blog/v", headers=_headers()).headers["ETag"] == '"1"'
+        r = client.put("/api/blog/v", json={"title": "W"}, headers=_headers())
+        assert r.headers["ETag"] == '"2"'
+        r = client.patch("/api/blog/v", headers=_headers(), json={
+            "baseSha256": content_sha256("# V\n"), "edits": [{"start": 2, "end": 3, "text": "W"}],
+        })
+        assert r.headers["ETag"] == '"3"'
+        assert client.get("/api/blog/v", headers=_headers()).headers["ETag"] == '"3"'
+
+    def test_update_is_a_single_write(self, client: TestClient, ddb_calls: list[str]):
+        client.post("/api/blog", json=POST, headers=_headers())
+        ddb_calls.clear()
+        client.put("/api/blog/v", json={"title": "W"}, headers=_headers('"1"'))
+        assert ddb_calls == ["UpdateItem"]
+
+    def test_stale_if_match_returns_412_and_writes_nothing(self, client: TestClient):
+        client.post("/api/blog", json=POST, headers=_headers())
+        client.put("/api/blog/v", json={"title": "W"}, headers=_headers('"1"'))
+        r = client.put("/api/blog/v", json={"title": "Lost"}, headers=_headers('"1"'))
+        assert r.status_code == 412
+        assert client.get("/api/blog/v", headers=_headers()).json()["title"] == "W"
+
+    def test_missing_post_is_404_even_with_if_match(self, client: TestClient):
+        r = client.put("/api/blog/nope", json={"title": "W"}, headers=_headers('"1"'))
+        assert r.status_code == 404
+
+    def test_weak_or_malformed_etag_never_matches(self, client: TestClient):
+        client.post("/api/blog", json=POST, headers=_headers())
+        for tag in ('W/"1"', "1", '"one"'):
+            assert client.put("/api/blog/v", json={"title": "W"}, headers=_headers(tag)).status_code == 412
+
+    def test_wildcard_only_requires_existence(self, client: TestClient):
+        client.post("/api/blog", json=POST, headers=_headers())
+        assert client.put("/api/blog/v", json={"title": "W"}, headers=_headers("*")).status_code == 200
+
+    def test_items_without_a_version_count_as_zero(self, client: TestClient):
+        get_blog_table().put_item(Item={
+            "PK": "BLOG#legacy", "SK": "METADATA", "title": "Old", "date": "2025-01-01",
+            "excerpt": "", "tags": [], "content": "", "media": [],
+        })
+        assert client.get("/api/blog/legacy", headers=_headers()).headers["ETag"] == '"0"'
+        r = client.put("/api/blog/legacy", json={"title": "New"}, headers=_headers('"0"'))
+        assert r.headers["ETag"] == '"1"'
+
+    def test_delete_honours_if_match(self, client: TestClient):
+        client.post("/api/blog", json=POST, headers=_headers())
+        assert client.delete("/api/blog/v", headers=_headers('"7"')).status_code == 412
+        assert client.get("/api/blog/v", headers=_headers()).status_code == 200
+        assert client.delete("/api/blog/v", headers=_headers('"1"')).status_code == 200
+
+
+class TestModuleVersions:
+    def test_module_field_update_is_one_call_and_returns_etag(
+        self, client: TestClient, ddb_calls: list[str]
+    ):
+        assert client.post("/api/playbook", json=MODULE, headers=_headers()).headers["ETag"] == '"1"'
+        ddb_calls.clear()
+        r = client.put("/api/playbook/m", json={"title": "N"}, headers=_headers('"1"'))
+        assert r.headers["ETag"] == '"2"'
+        assert ddb_calls == ["UpdateItem"]
+
+    def test_problem_changes_bump_the_module_version(self, client: TestClient):
+        client.post("/api/playbook", json=MODULE, headers=_headers())
+        r = client.put("/api/playbook/m", json={"delete_problem_ids": ["1"]}, headers=_headers('"1"'))
+        assert r.headers["ETag"] == '"2"'
+        r = client.patch("/api/playbook/m", headers=_headers(), json={
+            "baseSha256": content_sha256("# M\n"), "edits": [{"start": 0, "end": 0, "text": "!"}],
+        })
+        assert r.headers["ETag"] == '"3"'
+        assert client.get("/api/playbook/m", headers=_headers()).headers["ETag"] == '"3"'
+
+    def test_problem_patch_is_guarded_by_the_module_etag(self, client: TestClient):
+        client.post("/api/playbook", json=MODULE, headers=_headers())
+        body = {"baseSha256": content_sha256("loop\n"), "problemId": "1",
+                "edits": [{"start": 0, "end": 4, "text": "scan"}]}
+        assert client.patch("/api/playbook/m", json=body, headers=_headers('"5"')).status_code == 412
+        r = client.patch("/api/playbook/m", json=body, headers=_headers('"1"'))
+        assert r.status_code == 200 and r.headers["ETag"] == '"2"'
+        assert client.get("/api/playbook/m", headers=_headers()).headers["ETag"] == '"2"'
+
+    def test_stale_if_match_blocks_the_whole_change_set(self, client: TestClient):
+        client.post("/api/playbook", json=MODULE, headers=_headers())
+        client.put("/api/playbook/m", json={"title": "N"}, headers=_headers())
+        r = client.put("/api/playbook/m", headers=_headers('"1"'), json={
+            "title": "Lost", "delete_problem_ids": ["1"],
+        })
+        assert r.status_code == 412
+        body = client.get("/api/playbook/m", headers=_headers()).json()
+        assert body["title"] == "N" and len(body["problems"]) == 1
+
+    def test_update_missing_module_returns_404(self, client: TestClient):
+        r = client.put("/api/playbook/nope", json={"upsert_problems": MODULE["problems"]},
+                       headers=_headers())
+        assert r.status_code == 404
+
+    def test_empty_update_writes_nothing(self, client: TestClient, ddb_calls: list[str]):
+        client.post("/api/playbook", json=MODULE, headers=_headers())
+        ddb_calls.clear()
+        r = client.put("/api/playbook/m", json={}, headers=_headers('"1"'))
+        assert r.headers["ETag"] == '"1"'
+        assert ddb_calls == ["GetItem"]
+        assert client.put("/api/playbook/m", json={}, headers=_headers('"2"')).status_code == 412
+
+    def test_delete_honours_if_match(self, client: TestClient):
+        client.post("/api/playbook", json=MODULE, headers=_headers())
+        assert client.delete("/api/playbook/m", headers=_headers('"3"')).status_code == 412
+        assert len(client.get("/api/playbook/m", headers=_headers()).json()["problems"]) == 1
+        assert client.delete("/api/playbook/m", headers=_headers('"1"')).status_code == 200
+        assert client.get("/api/playbook/m", headers=_headers()).status_code == 404